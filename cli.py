@@ -14,7 +14,8 @@ project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
 from src.services.discount_service import fetch_discounts_for_category, fetch_all_discounts
-from src.core.manager import ScraperManager
+from src.core.manager import get_scraper_manager
+from src.services.search_index import SearchIndex
 
 
 def print_discounts_category(category: str, discounts: List[Any], show_images: bool = True):
@@ -102,11 +103,24 @@ def fetch_all(show_images: bool = True, show_summary: bool = True):
         return {}
 
 
+def search(query: str, category: str = None, show_images: bool = True, limit: int = 20):
+    """Fetch all discounts and display the best matches for a full-text query."""
+    try:
+        print(f"🔎 Searching for: {query}")
+        all_discounts = fetch_all_discounts()
+        index = SearchIndex([d.model_dump() for discounts in all_discounts.values() for d in discounts])
+        results = [discount for _, discount in index.search(query, limit, category)]
+        print_discounts_category(f"search: {query}", results, show_images)
+        return results
+    except Exception as e:
+        print(f"❌ Error searching for {query}: {e}")
+        return []
+
+
 def list_categories():
     """List all available categories."""
     try:
-        scraper_manager = ScraperManager()
-        categories = scraper_manager.load_categories()
+        categories = get_scraper_manager().categories
         print("📋 Available categories:")
         for category in categories.keys():
             print(f"   - {category}")
@@ -123,6 +137,7 @@ def main():
 Examples:
   python cli.py                    # Fetch all discounts
   python cli.py --category friends-nuts  # Fetch specific category
+  python cli.py --search "dragon cam"    # Search products across categories
   python cli.py --list-categories  # List available categories
   python cli.py --no-images        # Hide image URLs
   python cli.py --no-summary       # Hide summary
@@ -134,6 +149,11 @@ Examples:
         help='Fetch discounts for a specific category'
     )
     
+    parser.add_argument(
+        '--search', '-s',
+        help='Search products in all categories (or the one given with --category)'
+    )
+    
     parser.add_argument(
         '--list-categories', '-l',
         action='store_true',
@@ -155,12 +175,17 @@ Examples:
     args = parser.parse_args()
     
     # Handle different commands
-    if args.list_categories:
-        list_categories()
-    elif args.category:
-        fetch_by_category(args.category, not args.no_images)
-    else:
-        fetch_all(not args.no_images, not args.no_summary)
+    try:
+        if args.list_categories:
+            list_categories()
+        elif args.search:
+            search(args.search, args.category, not args.no_images)
+        elif args.category:
+            fetch_by_category(args.category, not args.no_images)
+        else:
+            fetch_all(not args.no_images, not args.no_summary)
+    finally:
+        get_scraper_manager().close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,8 @@
+"""
+pytest setup shared by tests/ and scripts/.
+Runs before any test module imports src, so no test touches the project's .cache.
+"""
+
+from tests import use_temporary_storage
+
+use_temporary_storage()
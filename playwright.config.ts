@@ -65,7 +65,7 @@ export default defineConfig({
   /* Run your local dev server before starting the tests */
   webServer: {
     command: 'python3 run_app.py',
-    url: 'http://127.0.0.1:5000',
+    url: 'http://127.0.0.1:5000/ready',
     reuseExistingServer: !process.env.CI,
   },
 }); 
\ No newline at end of file
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for scraping over the mock corpus.
+
+Every site's mock pages (tests/mocks) are parsed scoped to the scraper's selectors
+and run through its extraction, in a process of their own so memory numbers stay
+separate. Per site it reports the median parse and extract time of a pass over the
+site's pages, the allocations of one pass (Python heap peak from tracemalloc, and
+the memory blocks still allocated while the parsed pages are alive) and the peak
+RSS of the process. A last process times fetch_all_discounts end to end: the first
+call (which builds the scrapers) and the median of the following ones.
+
+With --crawl, the pages of an archived production crawl (see PageArchive) are
+benchmarked instead of the mocks, and fetch_all_discounts replays that crawl.
+
+--parser takes one or more HTML parser backends (default the configured one); every
+benchmark runs once per backend, and a summary compares the backends' total parse
+and extract time and peak RSS. Python heap peak comes from tracemalloc, which cannot
+see memory held by C parsers, so RSS is the column to compare across backends.
+
+Results can be saved as a baseline and later runs compared against it; with
+--max-regression the script exits with status 1 when a timing got slower than that.
+
+Usage:
+  python scripts/benchmark.py [--parser html.parser lxml selectolax] [--repeat 5] [--json] [--output results.json]
+                              [--save-baseline] [--baseline .cache/benchmark_baseline.json]
+                              [--max-regression 10] [--crawl latest]
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from urllib.parse import urlparse
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import config
+from src.core.html_parser import PARSER_BACKENDS
+from src.core.manager import ScraperManager, get_project_root, open_page_archive
+
+DEFAULT_BASELINE = os.path.join(get_project_root(), '.cache', 'benchmark_baseline.json')
+# Metrics compared against the baseline, all lower-is-better; timings gate --max-regression
+TIMINGS = ('parse_ms', 'extract_ms', 'first_ms', 'wall_ms')
+MEMORY = ('heap_peak_mb', 'alloc_blocks', 'peak_rss_mb')
+
+
+def site_hosts(site: str) -> set:
+    """Hosts of a site's configured production URLs."""
+    hosts = set()
+    for site_urls in config.get_categories().values():
+        urls = site_urls.get(site) or []
+        hosts.update(urlparse(url).hostname for url in (urls if isinstance(urls, list) else [urls]))
+    return hosts
+
+
+def load_pages(site: str, crawl: str = None):
+    """Return (url, raw bytes) for every mock page of a site, or for its pages archived as of a crawl."""
+    if crawl:
+        archive = open_page_archive()
+        hosts = site_hosts(site)
+        return [(url, archive.read(entry['sha256']))
+                for url, entry in sorted(archive.pages(None if crawl == 'latest' else crawl).items())
+                if urlparse(url).hostname in hosts and entry['sha256'] and entry['status'] < 400]
+    pages = []
+    for path in sorted(glob.glob(os.path.join(config.get_mock_files_dir(), f'{site}_*.html'))):
+        category = os.path.basename(path)[len(site) + 1:-len('.html')]
+        with open(path, 'rb') as f:
+            pages.append((f"{site}://{category}", f.read()))
+    return pages
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is in KiB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_site(site: str, parser: str, repeat: int, crawl: str = None) -> dict:
+    """Measure parsing and extraction of one site's pages in this process."""
+    from src.core.content_loader import MockContentLoader
+
+    logging.disable(logging.CRITICAL)
+    pages = load_pages(site, crawl)
+    loader = MockContentLoader(parser=parser)
+    scraper = ScraperManager.SCRAPER_CLASSES[site](loader)
+    scope = scraper._scope()
+
+    parse_times, extract_times = [], []
+    discounts = 0
+    for _ in range(repeat):
+        parse_time = extract_time = 0.0
+        discounts = 0
+        for url, content in pages:
+            start = time.perf_counter()
+            soup = loader.parse(content, scope)
+            parsed = time.perf_counter()
+            discounts += len(scraper.extract_discounts_from_soup(soup, url))
+            extract_time += time.perf_counter() - parsed
+            parse_time += parsed - start
+            del soup
+        parse_times.append(parse_time)
+        extract_times.append(extract_time)
+
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    alive = [(loader.parse(content, scope), url) for url, content in pages]
+    extracted = [scraper.extract_discounts_from_soup(soup, url) for soup, url in alive]
+    heap_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    alloc_blocks = sys.getallocatedblocks() - blocks_before
+    del alive, extracted
+
+    return {
+        'name': site,
+        'parser': parser,
+        'pages': len(pages),
+        'discounts': discounts,
+        'parse_ms': statistics.median(parse_times) * 1000,
+        'extract_ms': statistics.median(extract_times) * 1000,
+        'heap_peak_mb': heap_peak / 2**20,
+        'alloc_blocks': alloc_blocks,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def run_end_to_end(parser: str, repeat: int) -> dict:
+    """Time fetch_all_discounts over the mock corpus in this process."""
+    logging.disable(logging.CRITICAL)
+    config.get_scraping_settings()['parser'] = parser
+    # Parse every page on every call instead of reusing the mock corpus cache
+    config.get_scraping_settings()['mock_cache_dir'] = None
+    from src.services.discount_service import fetch_all_discounts
+
+    start = time.perf_counter()
+    discounts = sum(len(d) for d in fetch_all_discounts().values())
+    first = time.perf_counter() - start
+    walls = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fetch_all_discounts()
+        walls.append(time.perf_counter() - start)
+    return {
+        'name': 'fetch_all_discounts',
+        'parser': parser,
+        'discounts': discounts,
+        'first_ms': first * 1000,
+        'wall_ms': statistics.median(walls) * 1000,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def run_worker(kind: str, parser: str, repeat: int, crawl: str = None) -> dict:
+    """Run one benchmark in a fresh interpreter and return its result."""
+    command = [sys.executable, __file__, '--worker', kind, '--parser', parser, '--repeat', str(repeat)]
+    env = dict(os.environ)
+    if crawl:
+        command += ['--crawl', crawl]
+        # fetch_all_discounts replays the crawl through the production scrapers
+        env.update(PRODUCTION_MODE='true', REPLAY_CRAWL=crawl)
+    output = subprocess.run(command, check=True, capture_output=True, text=True, env=env).stdout
+    return json.loads(output)
+
+
+def compare(results: dict, baseline: dict) -> list:
+    """(benchmark, parser, metric, baseline value, current value, change %) for every metric both runs have."""
+    # Baselines saved before results carried their parser ran a single one
+    previous = {(r['name'], r.get('parser', baseline.get('parser'))): r for r in baseline['benchmarks']}
+    rows = []
+    for result in results['benchmarks']:
+        before = previous.get((result['name'], result['parser']), {})
+        for metric in TIMINGS + MEMORY:
+            if metric in result and before.get(metric):
+                change = (result[metric] - before[metric]) * 100 / before[metric]
+                rows.append((result['name'], result['parser'], metric, before[metric], result[metric], change))
+    return rows
+
+
+def summarize(benchmarks: list) -> list:
+    """Per parser: total parse and extract time over every site, end-to-end wall time and the highest peak RSS."""
+    summary = []
+    for parser in dict.fromkeys(r['parser'] for r in benchmarks):
+        results = [r for r in benchmarks if r['parser'] == parser]
+        sites = [r for r in results if 'parse_ms' in r]
+        summary.append({
+            'parser': parser,
+            'parse_ms': sum(r['parse_ms'] for r in sites),
+            'extract_ms': sum(r['extract_ms'] for r in sites),
+            'wall_ms': next(r['wall_ms'] for r in results if 'wall_ms' in r),
+            'peak_rss_mb': max(r['peak_rss_mb'] for r in results),
+            'discounts': sum(r['discounts'] for r in sites),
+        })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parsing, extraction and fetch_all_discounts over tests/mocks")
+    parser.add_argument('--parser', nargs='+', default=[config.get_scraping_settings().get('parser', 'html.parser')],
+                        choices=PARSER_BACKENDS, help='HTML parser backends to benchmark, each in turn')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed passes per benchmark')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+    parser.add_argument('--output', help='Also write the results to this file')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--max-regression', type=float,
+                        help='Exit with status 1 if a timing is more than this many percent slower than the baseline')
+    parser.add_argument('--crawl', help='Benchmark the pages of this archived crawl ("latest" for the newest) '
+                                        'instead of tests/mocks')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        if args.worker == 'end-to-end':
+            print(json.dumps(run_end_to_end(args.parser[0], args.repeat)))
+        else:
+            print(json.dumps(run_site(args.worker, args.parser[0], args.repeat, args.crawl)))
+        return
+
+    parsers = list(dict.fromkeys(args.parser))
+    benchmarks = []
+    for parser_backend in parsers:
+        benchmarks += [run_worker(site, parser_backend, args.repeat, args.crawl)
+                       for site in ScraperManager.SCRAPER_CLASSES]
+        benchmarks.append(run_worker('end-to-end', parser_backend, args.repeat, args.crawl))
+    results = {
+        'parsers': parsers,
+        'corpus': f"crawl {args.crawl}" if args.crawl else 'tests/mocks',
+        'repeat': args.repeat,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'timestamp': int(time.time()),
+        'benchmarks': benchmarks,
+        'summary': summarize(benchmarks),
+    }
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        results['comparison'] = [
+            {'name': name, 'parser': parser_backend, 'metric': metric, 'baseline': before, 'current': now,
+             'change_pct': change}
+            for name, parser_backend, metric, before, now, change in compare(results, baseline)
+        ]
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['corpus']}, median of {args.repeat} passes")
+        print(f"{'benchmark':<20} {'parser':<11} {'pages':>5} {'discounts':>9} {'parse ms':>9} {'extract ms':>10} "
+              f"{'first ms':>9} {'wall ms':>8} {'heap MB':>8} {'blocks':>8} {'RSS MB':>7}")
+
+        def cell(r, metric, width, fmt):
+            return f"{r[metric]:>{width}{fmt}}" if metric in r else f"{'-':>{width}}"
+
+        for r in benchmarks:
+            print(f"{r['name']:<20} {r['parser']:<11} {cell(r, 'pages', 5, '')} {r['discounts']:>9} "
+                  f"{cell(r, 'parse_ms', 9, '.1f')} {cell(r, 'extract_ms', 10, '.1f')} {cell(r, 'first_ms', 9, '.0f')} {cell(r, 'wall_ms', 8, '.0f')} "
+                  f"{cell(r, 'heap_peak_mb', 8, '.1f')} {cell(r, 'alloc_blocks', 8, '')} {r['peak_rss_mb']:>7.1f}")
+        if len(parsers) > 1:
+            print(f"\n{'parser':<11} {'parse ms':>9} {'extract ms':>10} {'total ms':>9} {'wall ms':>8} {'RSS MB':>7} "
+                  f"{'discounts':>9}")
+            for r in results['summary']:
+                print(f"{r['parser']:<11} {r['parse_ms']:>9.1f} {r['extract_ms']:>10.1f} "
+                      f"{r['parse_ms'] + r['extract_ms']:>9.1f} {r['wall_ms']:>8.0f} {r['peak_rss_mb']:>7.1f} "
+                      f"{r['discounts']:>9}")
+        if baseline is not None:
+            print(f"\nchange against {args.baseline}:")
+            for row in results['comparison']:
+                print(f"{row['name']:<20} {row['parser']:<11} {row['metric']:<13} {row['baseline']:>10.1f} -> "
+                      f"{row['current']:>10.1f} {row['change_pct']:>+7.1f}%")
+        if args.save_baseline:
+            print(f"\nbaseline saved to {args.baseline}")
+
+    if args.max_regression is not None and baseline is not None:
+        regressions = [row for row in results['comparison']
+                       if row['metric'] in TIMINGS and row['change_pct'] > args.max_regression]
+        if regressions:
+            for row in regressions:
+                print(f"{row['name']} ({row['parser']}) {row['metric']} regressed {row['change_pct']:.1f}%",
+                      file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark refresh time against the number of extraction worker processes.
+
+For each worker count (0 extracts in the fetch threads), a fresh interpreter builds
+a ScraperManager over the mock corpus with scraping.extraction.workers set, runs one
+warm-up refresh (which starts the workers) and then times ScraperManager.fetch_discounts
+for every category. The mock pages are read from disk, so the time is nearly all
+parsing and extraction; --scale runs every fetch job that many times per refresh to
+give the workers more pages. Speedups are relative to 0 workers and are bounded by
+the cores of the machine.
+
+Usage:
+  python scripts/benchmark_extraction.py [--workers 0 1 2 4] [--parser selectolax] [--scale 4] [--repeat 3] [--json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import config
+from src.core.html_parser import PARSER_BACKENDS
+
+
+def run_refresh(workers: int, parser: str, scale: int, repeat: int) -> dict:
+    """Time refreshes of the mock corpus with the given extraction workers, in this process."""
+    logging.disable(logging.CRITICAL)
+    settings = config.get_scraping_settings()
+    settings['parser'] = parser
+    settings['extraction'] = {'workers': workers}
+    settings['mock_cache_dir'] = None
+    from src.core.manager import ScraperManager
+
+    manager = ScraperManager()
+    jobs = manager.plan_jobs(manager.categories.keys()) * scale
+    try:
+        pages = manager._fetch_pages(jobs)
+        walls = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            manager._fetch_pages(jobs)
+            walls.append(time.perf_counter() - start)
+    finally:
+        manager.close()
+    return {
+        'workers': workers,
+        'pages': len(jobs),
+        'discounts': sum(len(discounts) for discounts, _ in pages),
+        'wall_ms': statistics.median(walls) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh time over tests/mocks by extraction worker count")
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4], help='Worker counts to compare')
+    parser.add_argument('--parser', default=config.get_scraping_settings().get('parser', 'html.parser'),
+                        choices=PARSER_BACKENDS, help='HTML parser backend')
+    parser.add_argument('--scale', type=int, default=4, help='Times every fetch job runs per refresh')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed refreshes per worker count')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_refresh(args.worker, args.parser, args.scale, args.repeat)))
+        return
+
+    results = []
+    for workers in args.workers:
+        output = subprocess.run(
+            [sys.executable, __file__, '--worker', str(workers), '--parser', args.parser,
+             '--scale', str(args.scale), '--repeat', str(args.repeat)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output))
+    serial = next((r['wall_ms'] for r in results if r['workers'] == 0), results[0]['wall_ms'])
+    for r in results:
+        r['speedup'] = serial / r['wall_ms']
+
+    if args.json:
+        print(json.dumps({'parser': args.parser, 'cpus': os.cpu_count(), 'results': results}, indent=2))
+        return
+    print(f"parser {args.parser}, {os.cpu_count()} CPUs, {results[0]['pages']} pages per refresh, "
+          f"median of {args.repeat} refreshes")
+    print(f"{'workers':>7} {'discounts':>9} {'wall ms':>8} {'speedup':>7}")
+    for r in results:
+        print(f"{r['workers']:>7} {r['discounts']:>9} {r['wall_ms']:>8.0f} {r['speedup']:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
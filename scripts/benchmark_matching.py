@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark cross-shop product matching over the mock corpus.
+
+The discounts extracted from tests/mocks are matched per category as they are, then
+the catalogue is scaled up by copying every product with its rare (model) tokens
+renamed ("beal karma 9.8 mm" -> "beal karmaqb 9.8 mm"), so each brand gets more,
+distinct products and the expected groups grow with the scale. The
+comparisons column counts candidate pairs actually scored; all-pairs is what comparing
+every product with every product of another shop in the same brand would cost. The
+growth exponent between scales is log(time ratio) / log(size ratio): 2 is quadratic.
+
+Usage:
+  python scripts/benchmark_matching.py [--scales 1 4 16 64] [--json]
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import string
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import config
+from src.services.discount_service import fetch_all_discounts
+from src.services.product_matcher import ProductMatcher, product_tokens
+
+
+def model_tag(copy: int) -> str:
+    """Letters-only token naming the copy, so it survives tokenization intact."""
+    tag = ""
+    while True:
+        copy, digit = divmod(copy, 26)
+        tag = string.ascii_lowercase[digit] + tag
+        if not copy:
+            return "q" + tag
+
+
+def scaled(records, scale: int):
+    """The records plus scale - 1 copies of each, with the copy's tag appended to rare tokens.
+
+    Rare tokens are mostly model names; boilerplate and sizes stay shared, so each copy
+    is a catalogue of new models. Copies shift the per-shop token weights, so pairs near
+    the threshold can match differently and group counts are only indicative.
+    """
+    tokens = [product_tokens(record['product']) for record in records]
+    document_frequency = {}
+    for product in tokens:
+        for token in set(product[1:]):
+            document_frequency[token] = document_frequency.get(token, 0) + 1
+    rare = {token for token, df in document_frequency.items() if df <= max(2, len(records) // 3) and token.isalpha()}
+    result = list(records)
+    for copy in range(1, scale):
+        tag = model_tag(copy)
+        for record, product in zip(records, tokens):
+            name = " ".join(product[:1] + [token + tag if token in rare else token for token in product[1:]])
+            result.append({**record, 'product': name})
+    return result
+
+
+def all_pairs(records) -> int:
+    """Cross-shop pairs within brand blocks, the cost of comparing without an index."""
+    blocks = {}
+    for record in records:
+        tokens = product_tokens(record['product'])
+        if tokens:
+            block = blocks.setdefault(tokens[0], {})
+            block[record['site']] = block.get(record['site'], 0) + 1
+    return sum((sum(sites.values()) ** 2 - sum(n * n for n in sites.values())) // 2 for sites in blocks.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cross-shop product matching over tests/mocks")
+    parser.add_argument('--scales', nargs='+', type=int, default=[1, 4, 16, 64], help='Catalogue size multipliers')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    catalogue = [discount.model_dump() for discounts in fetch_all_discounts().values() for discount in discounts]
+    by_category = {}
+    for record in catalogue:
+        by_category.setdefault(record['category'], []).append(record)
+
+    results = []
+    for scale in args.scales:
+        matcher = ProductMatcher(config.get_matching_settings())
+        catalogues = [scaled(records, scale) for records in by_category.values()]
+        start = time.perf_counter()
+        groups = sum(len(matcher.group_offers(records)) for records in catalogues)
+        elapsed = time.perf_counter() - start
+        products = sum(len(records) for records in catalogues)
+        pairs = sum(all_pairs(records) for records in catalogues)
+        results.append({
+            'scale': scale,
+            'products': products,
+            'groups': groups,
+            'comparisons': matcher.comparisons,
+            'all_pairs': pairs,
+            'match_ms': elapsed * 1000,
+        })
+    for previous, result in zip(results, results[1:]):
+        result['growth_exponent'] = (math.log(result['match_ms'] / previous['match_ms'])
+                                     / math.log(result['products'] / previous['products']))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'scale':>5} {'products':>9} {'groups':>7} {'comparisons':>12} {'all pairs':>11} {'match ms':>9} {'exponent':>9}")
+    for r in results:
+        exponent = f"{r['growth_exponent']:.2f}" if 'growth_exponent' in r else "-"
+        print(f"{r['scale']:>5} {r['products']:>9} {r['groups']:>7} {r['comparisons']:>12} {r['all_pairs']:>11} "
+              f"{r['match_ms']:>9.0f} {exponent:>9}")
+
+
+if __name__ == "__main__":
+    main()
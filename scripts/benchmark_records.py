@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark the pydantic Discount model against the slotted DiscountRecord.
+
+The discounts extracted from tests/mocks are built again from their dicts with each
+type, the way scrapers and the page cache build them. Per type it reports the
+construction time per item (median of the passes), the time of a refresh round
+trip per item (construct, tag category and site, model_dump as the store does) and
+the memory per item (tracemalloc, with the field values shared, so only the object
+itself counts).
+
+Usage:
+  python scripts/benchmark_records.py [--scale 20] [--repeat 5] [--json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.dto.discount import Discount
+from src.dto.discount_record import DiscountRecord
+from src.services.discount_service import fetch_all_discounts
+
+
+def construct(cls, records):
+    return [cls(**record) for record in records]
+
+
+def round_trip(cls, records):
+    dumped = []
+    for record in records:
+        discount = cls(**record)
+        discount.category = record['category']
+        discount.site = record['site']
+        dumped.append(discount.model_dump())
+    return dumped
+
+
+def median_us_per_item(function, cls, records, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(cls, records)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e6 / len(records)
+
+
+def bytes_per_item(cls, records) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = construct(cls, records)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del built
+    return size / len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Discount and DiscountRecord over the mock corpus")
+    parser.add_argument('--scale', type=int, default=20, help='Copies of the corpus built per pass')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed passes per measurement')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    corpus = [discount.model_dump() for discounts in fetch_all_discounts().values() for discount in discounts]
+    records = corpus * args.scale
+
+    results = []
+    for cls in (Discount, DiscountRecord):
+        results.append({
+            'type': cls.__name__,
+            'items': len(records),
+            'construct_us': median_us_per_item(construct, cls, records, args.repeat),
+            'round_trip_us': median_us_per_item(round_trip, cls, records, args.repeat),
+            'bytes_per_item': bytes_per_item(cls, records),
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(corpus)} discounts x {args.scale}, median of {args.repeat} passes")
+    print(f"{'type':<16} {'construct us':>12} {'round trip us':>13} {'bytes/item':>10}")
+    for r in results:
+        print(f"{r['type']:<16} {r['construct_us']:>12.2f} {r['round_trip_us']:>13.2f} {r['bytes_per_item']:>10.0f}")
+    model, record = results
+    print(f"\nDiscountRecord: {model['construct_us'] / record['construct_us']:.1f}x faster to build, "
+          f"{model['round_trip_us'] / record['round_trip_us']:.1f}x faster round trip, "
+          f"{model['bytes_per_item'] / record['bytes_per_item']:.1f}x less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Write every mock page's extraction as a pre-extracted fixture.
+
+For each tests/mocks/<site>_<category>.html, the site's scraper extracts the page
+and <site>_<category>.json is written with the discounts, the next page URL and the
+sha256 of the HTML it came from. MockCorpus serves a fixture for pages that have no
+.html file, so a fixture can stand in for a large page in tests and development.
+
+Usage:
+  python scripts/export_mock_fixtures.py [--output tests/mocks] [--parser selectolax]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config import config
+from src.core.content_loader import MockContentLoader
+from src.core.html_parser import PARSER_BACKENDS
+from src.core.manager import ScraperManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the mock pages' extractions as JSON fixtures")
+    parser.add_argument('--output', default=config.get_mock_files_dir(), help='Directory the fixtures are written to')
+    parser.add_argument('--parser', default=config.get_scraping_settings().get('parser', 'html.parser'),
+                        choices=PARSER_BACKENDS, help='HTML parser backend')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    loader = MockContentLoader(parser=args.parser)
+    os.makedirs(args.output, exist_ok=True)
+    for site, scraper_class in ScraperManager.SCRAPER_CLASSES.items():
+        scraper = scraper_class(loader)
+        for path in sorted(glob.glob(os.path.join(config.get_mock_files_dir(), f'{site}_*.html'))):
+            category = os.path.basename(path)[len(site) + 1:-len('.html')]
+            url = f"{site}://{category}"
+            with open(path, 'rb') as f:
+                content = f.read()
+            discounts, next_page, _, _ = scraper.extract_from_content(content, url)
+            fixture = {
+                'url': url,
+                'source_sha256': hashlib.sha256(content).hexdigest(),
+                'parser': loader.parser,
+                'discounts': [discount.model_dump() for discount in discounts],
+                'next_page': next_page,
+            }
+            output = os.path.join(args.output, f'{site}_{category}.json')
+            with open(output, 'w') as f:
+                json.dump(fixture, f, indent=1, ensure_ascii=False)
+            print(f"{url}: {len(discounts)} discounts -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,71 +2,62 @@
 """
 Script to fetch HTML responses for all categories from all sites
 and save them as mock files for development/testing.
+
+Runs a production refresh with the production loaders (httpx, and Playwright for
+Mountex), so every page it fetches, including further listing pages and every URL
+of a category, is recorded as one crawl in the raw-page archive (scraping.archive).
+Each site and category's first URL is then written to tests/mocks byte for byte
+as the shop served it (for Mountex, as the browser rendered it), so the mocks
+extract like production pages do. Replay the whole crawl with
+PRODUCTION_MODE=true REPLAY_CRAWL=<crawl>.
 """
 
 import os
-import time
-from urllib.parse import urlparse
+import sys
 
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
-import httpx
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Live pages are only fetched in production mode
+os.environ['PRODUCTION_MODE'] = 'true'
+os.environ.pop('REPLAY_CRAWL', None)
 
 from src.core.config import config
-
-
-MOCKS_DIR = "tests/mocks"
-
-
-def fetch_content(url, use_playwright=False):
-    """Fetch URL content and return it."""
-    try:
-        if use_playwright:
-            print(f"  Fetching {url} using Playwright...")
-            with sync_playwright() as p:
-                browser = p.chromium.launch()
-                page = browser.new_page()
-                page.goto(url)
-                content = page.content()
-                browser.close()
-                return content
-        else:
-            print(f"  Fetching {url} using httpx...")
-            response = httpx.get(url, follow_redirects=True, timeout=30)
-            response.raise_for_status()
-            return response.text
-    except Exception as e:
-        print(f"  Error fetching {url}: {e}")
-        if not use_playwright:
-            print(f"  Retrying with Playwright...")
-            return fetch_content(url, use_playwright=True)
-    return ""
+from src.core.manager import ScraperManager
 
 
 def main():
-    if not os.path.exists(MOCKS_DIR):
-        os.makedirs(MOCKS_DIR)
-
-    categories_data = config.get_categories()
-
-    for category_name, sites in categories_data.items():
+    # Unconditional requests, so every page comes back with its body
+    config.get_scraping_settings()['page_cache_dir'] = None
+    manager = ScraperManager()
+    if manager.archive is None:
+        sys.exit("scraping.archive is not configured; there is nowhere to record the pages")
+    mocks_dir = config.get_mock_files_dir()
+    os.makedirs(mocks_dir, exist_ok=True)
+    try:
+        print("Fetching all categories from all sites...")
+        discounts = manager.fetch_discounts(manager.categories.keys())
+    finally:
+        manager.close()
+
+    crawl = manager.archive.crawls()[-1]
+    entries = manager.archive.entries(crawl)
+    pages = manager.archive.pages(crawl)
+    print(f"Archived {len(entries)} responses as crawl {crawl} in {manager.archive.directory}")
+    for category_name, sites in manager.categories.items():
         print(f"Processing category: {category_name}")
         for site_name, urls in sites.items():
-            url_list = urls if isinstance(urls, list) else [urls]
-            url_to_fetch = url_list[0]  # Fetch only the first URL
-
-            file_name = f"{site_name.lower()}_{category_name}.html"
-            file_path = os.path.join(MOCKS_DIR, file_name)
-            
-            print(f"  Site: {site_name}, URL: {url_to_fetch}")
-            content = fetch_content(url_to_fetch, use_playwright=(site_name == "mountex"))
-
-            if content:
-                soup = BeautifulSoup(content, "html.parser")
-                with open(file_path, "w") as f:
-                    f.write(str(soup.prettify()))
+            url = (urls if isinstance(urls, list) else [urls])[0]
+            entry = pages.get(url)
+            found = len(discounts.get((category_name, site_name), []))
+            if entry is None or entry['sha256'] is None or entry['status'] >= 400:
+                print(f"  Site: {site_name}, URL: {url}: no page archived, keeping the current mock")
+                continue
+            file_path = os.path.join(mocks_dir, f"{site_name.lower()}_{category_name}.html")
+            with open(file_path, "wb") as f:
+                f.write(manager.archive.read(entry['sha256']))
+            print(f"  Site: {site_name}, URL: {url}: {entry['size']} bytes, {found} discounts over all pages")
     print("Done.")
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -1,10 +1,21 @@
 import atexit
+import multiprocessing
 import os
+import threading
+import time
 
-from flask import Flask, render_template, abort, jsonify
+from flask import Flask, Response, g, render_template, abort, jsonify, request
 from flask_apscheduler import APScheduler
 
-from src.services.discount_service import fetch_all_discounts, DISCOUNTS_LOADED, ALL_DISCOUNTS, CATEGORIES, refresh_discounts_job
+from src.core.manager import get_scraper_manager
+from src.core.config import config
+from src.core.logging_config import logger
+from src.core.metrics import CONTENT_TYPE, HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+from src.services.discount_service import fetch_all_discounts, DISCOUNTS_LOADED, CATEGORIES, refresh_discounts_job, discount_store
+from src.services.discount_service import get_refresh_slices, refresh_slice_job, is_refresher, price_history
+from src.services.discount_service import render_metrics, is_refresher_process
+from src.services.refresh_schedule import RefreshSchedule
+from src.core.price_parser import parse_price
 
 # Get the project root directory (2 levels up from src/app/)
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,22 +24,80 @@ app = Flask(__name__,
            template_folder=os.path.join(project_root, 'templates'),
            static_folder=os.path.join(project_root, 'static'))
 
+# Set once this process's first refresh has finished (successfully or not)
+first_refresh_done = threading.Event()
+
 def start_scheduler():
-    refresh_discounts_job()
+    # Serve the last persisted snapshot right away; the first refresh runs in the background
+    snapshot = discount_store.snapshot
+    if snapshot.created_at is not None:
+        logger.info(f"Serving persisted snapshot {snapshot.version} from {time.time() - snapshot.created_at:.0f}s ago")
+
     scheduler = APScheduler()
     scheduler.init_app(app)  # No Flask app context needed here
     scheduler.start()
-    scheduler.add_job(
-        id='refresh_discounts',
-        func=refresh_discounts_job,
-        trigger='interval',
-        hours=12,
-        replace_existing=True
-    )
-    # Ensure scheduler shuts down cleanly
+    schedule = RefreshSchedule(config.get_refresh_settings())
+
+    def refresh_slice(category, site):
+        changes, failed = refresh_slice_job(category, site)
+        hours = schedule.record(category, site, changed=bool(changes), failed=failed)
+        scheduler.scheduler.reschedule_job(f'refresh_{category}_{site}', trigger='interval', hours=hours,
+                                           jitter=schedule.jitter_seconds)
+
+    def first_refresh():
+        try:
+            refresh_discounts_job()
+        finally:
+            first_refresh_done.set()
+
+    def start_refreshing():
+        # Build scrapers and loaders once, before the first refresh; close pools and the browser at exit
+        atexit.register(get_scraper_manager().close)
+        scheduler.add_job(id='first_refresh', func=first_refresh, trigger='date', replace_existing=True)
+        # One job per (category, site) slice, each on its own interval
+        for category, site in get_refresh_slices():
+            scheduler.add_job(
+                id=f'refresh_{category}_{site}',
+                func=refresh_slice,
+                args=[category, site],
+                trigger='interval',
+                hours=schedule.interval_hours(category, site),
+                jitter=schedule.jitter_seconds,
+                replace_existing=True
+            )
+
+    def elect_refresher():
+        # Another worker refreshes; take over if it goes away
+        if is_refresher():
+            scheduler.remove_job('elect_refresher')
+            start_refreshing()
+
+    # Only one process scrapes; the others serve the snapshot it publishes
+    if is_refresher():
+        start_refreshing()
+    else:
+        scheduler.add_job(id='elect_refresher', func=elect_refresher, trigger='interval', minutes=1,
+                          replace_existing=True)
+
+    # Ensure the scheduler shuts down cleanly
     atexit.register(lambda: scheduler.shutdown(wait=False))
 
-start_scheduler()
+# Extraction workers (see ExtractionPool) import the entry point again; only the
+# server's own processes schedule refreshes
+if multiprocessing.parent_process() is None:
+    start_scheduler()
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    # Label by route template, not path, so /discounts/<category> stays one series
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    HTTP_REQUEST_SECONDS.observe(time.perf_counter() - g.request_start, route)
+    HTTP_REQUESTS.inc(route, str(response.status_code))
+    return response
 
 @app.route("/")
 def index():
@@ -37,12 +106,135 @@ def index():
         categories=CATEGORIES,
     )
 
+def int_arg(name, default=None):
+    """Integer query parameter ?name=, default if it is absent; 400 if it is not an integer."""
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        abort(400, description=f"{name} must be an integer")
+
+QUERY_PARAMS = {'sort', 'min_discount', 'site', 'max_price', 'currency', 'offset', 'limit'}
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+def query_discounts(category):
+    """Filtered, sorted page of a category, answered from the snapshot's sorted index."""
+    index = discount_store.snapshot.index(category)
+    if index is None:
+        abort(404, description="Category not found")
+    args = request.args
+    max_price = None
+    if 'max_price' in args:
+        max_price = parse_price(args['max_price'], default_currency=args.get('currency', '').upper() or None)
+        if max_price is None:
+            abort(400, description="max_price must be a price")
+    min_discount = int_arg('min_discount')
+    offset = int_arg('offset', 0)
+    limit = int_arg('limit', DEFAULT_PAGE_SIZE)
+    if offset < 0 or not 0 < limit <= MAX_PAGE_SIZE:
+        abort(400, description=f"offset must be >= 0 and limit between 1 and {MAX_PAGE_SIZE}")
+    try:
+        # One extra item tells whether another page follows
+        page = index.query(args.get('sort', 'discount'), min_discount, args.get('site'), max_price, offset, limit + 1)
+    except ValueError as e:
+        abort(400, description=str(e))
+    response = jsonify(page[:limit])
+    if len(page) > limit:
+        response.headers['X-Next-Offset'] = str(offset + limit)
+    return response
+
 @app.route('/discounts/<category>', methods=['GET'])
 def get_discounts_by_category(category):
-    discounts = ALL_DISCOUNTS.get(category)
-    if discounts is None:
+    if QUERY_PARAMS.intersection(request.args):
+        return query_discounts(category)
+    payload = discount_store.snapshot.payload(category)
+    if payload is None:
+        abort(404, description="Category not found")
+    # Serve the bytes serialized at publish time; no per-request encoding work
+    encoding = payload.negotiate(request.accept_encodings)
+    etag = payload.etag(encoding)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(payload.encoded(encoding), mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.route('/offers/<category>', methods=['GET'])
+def get_offers_by_category(category):
+    """Products of a category sold by several shops, each with its offers cheapest first."""
+    offers = discount_store.snapshot.offers(category)
+    if offers is None:
         abort(404, description="Category not found")
-    return jsonify(discounts)
+    return jsonify(list(offers))
+
+SEARCH_PAGE_SIZE = 20
+
+@app.route('/search', methods=['GET'])
+def search_discounts():
+    """Discounts best matching ?q=, optionally within ?category=, each with its relevance score."""
+    query = request.args.get('q', '').strip()
+    if not query:
+        abort(400, description="q is required")
+    limit = int_arg('limit', SEARCH_PAGE_SIZE)
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        abort(400, description=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    snapshot = discount_store.snapshot
+    category = request.args.get('category')
+    if category is not None and snapshot.get(category) is None:
+        abort(404, description="Category not found")
+    return jsonify([{**discount, 'score': round(score, 4)} for score, discount in snapshot.search(query, limit, category)])
+
+@app.route('/history', methods=['GET'])
+def get_price_history():
+    """Recorded prices of the product at ?url=, and the lowest of them, over the last ?days=N (default all)."""
+    url = request.args.get('url')
+    if not url:
+        abort(400, description="url is required")
+    if price_history is None:
+        abort(404, description="Price history is disabled")
+    days = int_arg('days')
+    lowest = price_history.lowest_price(url, days)
+    return jsonify(
+        url=url,
+        points=[point._asdict() for point in price_history.history(url, days)],
+        lowest=lowest._asdict() if lowest else None,
+    )
+
+@app.route('/changes', methods=['GET'])
+def get_changes():
+    """Per (category, site) changes published after snapshot version ?since=N."""
+    since = int_arg('since', 0)
+    return jsonify(
+        version=discount_store.snapshot.version,
+        changes=[change._asdict() for change in discount_store.changes_since(since)],
+    )
+
+@app.route('/ready', methods=['GET'])
+def get_readiness():
+    """Ready (200) once a snapshot is available to serve, with its version and age; 503 before that."""
+    snapshot = discount_store.snapshot
+    ready = snapshot.created_at is not None
+    body = jsonify(
+        ready=ready,
+        version=snapshot.version,
+        created_at=snapshot.created_at,
+        age_seconds=time.time() - snapshot.created_at if ready else None,
+        refresher=is_refresher_process(),
+        first_refresh_done=first_refresh_done.is_set(),
+    )
+    return body, 200 if ready else 503
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Request, scrape and refresh metrics in the Prometheus text format."""
+    return Response(render_metrics(), content_type=CONTENT_TYPE)
 
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
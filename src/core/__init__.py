@@ -3,12 +3,14 @@ Core package for the climbing gear discount aggregator.
 Contains the main business logic and management classes.
 """
 
-from src.core.manager import ScraperManager
-from src.core.content_loader import ContentLoader, HttpContentLoader, MockContentLoader
+from src.core.manager import ScraperManager, get_scraper_manager
+from src.core.content_loader import ContentLoader, HttpContentLoader, AsyncHttpContentLoader, MockContentLoader
 
 __all__ = [
     'ScraperManager',
+    'get_scraper_manager',
     'ContentLoader',
     'HttpContentLoader',
+    'AsyncHttpContentLoader',
     'MockContentLoader',
 ] 
\ No newline at end of file
@@ -8,19 +8,36 @@ class Config:
     def __init__(self):
         self.production_mode = self._get_production_mode()
         self.mock_files_dir = self._get_mock_files_dir()
-        self.categories = self._load_categories()
+        self.settings = self._load_settings()
+        self.categories = self.settings['categories']
 
-    def _load_categories(self) -> Dict[str, Any]:
-        """Load categories from the YAML file."""
+    def _load_settings(self) -> Dict[str, Any]:
+        """Load the whole categories YAML file."""
         project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         categories_path = os.path.join(project_root, 'config', 'categories.yaml')
         with open(categories_path, 'r') as f:
-            return yaml.safe_load(f)['categories']
+            return yaml.safe_load(f)
 
     def get_categories(self) -> Dict[str, Any]:
         """Get the loaded categories."""
         return self.categories
 
+    def get_scraping_settings(self) -> Dict[str, Any]:
+        """Get the fetch settings (max_concurrency, max_per_host and the http client options)."""
+        return self.settings.get('scraping', {})
+
+    def get_refresh_settings(self) -> Dict[str, Any]:
+        """Get the refresh schedule settings (intervals, jitter, back-off)."""
+        return self.settings.get('refresh', {})
+
+    def get_storage_settings(self) -> Dict[str, Any]:
+        """Get the shared snapshot storage settings."""
+        return self.settings.get('storage', {})
+
+    def get_matching_settings(self) -> Dict[str, Any]:
+        """Get the cross-shop product matching settings."""
+        return self.settings.get('matching', {})
+
     def _get_production_mode(self) -> bool:
         """Get production mode from environment variable."""
         return os.getenv('PRODUCTION_MODE', 'false').lower() == 'true'
@@ -33,7 +50,16 @@ class Config:
     def is_production(self) -> bool:
         """Check if the application is running in production mode."""
         return self.production_mode
+
+    def get_replay_crawl(self) -> str:
+        """Archived crawl replayed instead of fetching live pages in production mode ("latest" or a crawl name), "" for none."""
+        return os.getenv('REPLAY_CRAWL', '')
     
+    def get_data_path(self, path: str) -> str:
+        """Absolute path of a configured storage or cache path, relative to DATA_DIR (default the project root)."""
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return os.path.join(os.getenv('DATA_DIR') or project_root, path)
+
     def get_mock_files_dir(self) -> str:
         """Get the directory path for mock files."""
         return self.mock_files_dir
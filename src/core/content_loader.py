@@ -1,40 +1,325 @@
+import asyncio
+import importlib.util
+import threading
+import time
 from abc import ABC, abstractmethod
-from bs4 import BeautifulSoup
+from typing import Callable, Optional
+from urllib.parse import urlparse
 import httpx
 
 from src.core.config import config
+from src.core.html_parser import PARSER_BACKENDS, HtmlNode, parse_html
+from src.core.logging_config import logger
+from src.core.metrics import FETCH_BYTES, FETCH_SECONDS
+from src.core.mock_corpus import MockCorpus
+from src.core.page_archive import PageArchive, PageNotArchived
+from src.core.page_cache import PageCache, PageNotModified
 
 
 class ContentLoader(ABC):
+    # Loaders with a page cache raise PageNotModified from fetch when a page is unchanged
+    page_cache = None
+    # Live loaders with an archive record every response they receive in it
+    archive = None
+
+    def __init__(self, parser: str = "html.parser"):
+        """
+        Args:
+            parser: HTML parser backend used by parse, one of PARSER_BACKENDS
+        """
+        if parser not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend {parser!r}, expected one of {PARSER_BACKENDS}")
+        if importlib.util.find_spec(parser) is None:
+            logger.warning(f"Parser backend {parser} is not installed, falling back to html.parser")
+            parser = "html.parser"
+        self.parser = parser
+
     @abstractmethod
-    def get_content(self, url: str) -> BeautifulSoup:
+    def fetch(self, url: str) -> bytes:
+        """Return the raw page body for url."""
+        pass
+
+    async def fetch_async(self, url: str) -> bytes:
+        """Return the raw page body for url without blocking the running event loop."""
+        return await asyncio.to_thread(self.fetch, url)
+
+    def fetch_measured(self, url: str) -> bytes:
+        """fetch, recording the latency and page size per host (mock URLs count under their site)."""
+        parsed = urlparse(url)
+        host = parsed.hostname if parsed.scheme in ("http", "https") else parsed.scheme
+        start = time.perf_counter()
+        try:
+            content = self.fetch(url)
+        except PageNotModified:
+            FETCH_SECONDS.observe(time.perf_counter() - start, host)
+            raise
+        FETCH_SECONDS.observe(time.perf_counter() - start, host)
+        FETCH_BYTES.observe(len(content), host)
+        return content
+
+    def parse(self, content, scope: Optional[str] = None) -> HtmlNode:
+        """Parse a page; with a scope selector, only the matching containers may be built."""
+        return parse_html(content, self.parser, scope)
+
+    def get_content(self, url: str, scope: Optional[str] = None) -> HtmlNode:
+        return self.parse(self.fetch_measured(url), scope)
+
+    def close(self):
+        """Release long-lived resources such as connections or browsers."""
         pass
 
 
 class HttpContentLoader(ContentLoader):
-    def get_content(self, url: str) -> BeautifulSoup:
-        response = httpx.get(url, follow_redirects=True)
-        response.raise_for_status()
-        return BeautifulSoup(response.content, "html.parser")
+    def __init__(self, timeout: float = 30.0, parser: str = "html.parser", page_cache: Optional[PageCache] = None):
+        super().__init__(parser)
+        self.timeout = timeout
+        self.page_cache = page_cache
+
+    def _request_headers(self, url: str) -> dict:
+        return self.page_cache.request_headers(url) if self.page_cache is not None else {}
+
+    def _archive_response(self, url: str, response: httpx.Response):
+        if self.archive is not None:
+            content = response.content if response.status_code != 304 else None
+            self.archive.record(url, response.status_code, response.headers, content, str(response.url))
+
+    def _read_response(self, url: str, response: httpx.Response) -> bytes:
+        if response.status_code != 304:
+            response.raise_for_status()
+        if self.page_cache is not None:
+            self.page_cache.check_response(url, response.status_code, response.content, response.headers)
+        return response.content
+
+    def fetch(self, url: str) -> bytes:
+        response = httpx.get(url, headers=self._request_headers(url), follow_redirects=True, timeout=self.timeout)
+        self._archive_response(url, response)
+        return self._read_response(url, response)
+
+
+# Background event loop shared by the async loaders, so synchronous callers on any thread
+# reuse the same connections.
+_event_loop = None
+_event_loop_lock = threading.Lock()
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None:
+            _event_loop = asyncio.new_event_loop()
+            threading.Thread(target=_event_loop.run_forever, name="content-loader-loop", daemon=True).start()
+    return _event_loop
+
+
+class EventLoopContentLoader(ContentLoader):
+    """Base for loaders whose I/O runs as coroutines on the shared background loop."""
+
+    def __init__(self, parser: str = "html.parser"):
+        super().__init__(parser)
+        self._loop = _get_event_loop()
+
+    @abstractmethod
+    async def _fetch(self, url: str) -> bytes:
+        pass
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def fetch(self, url: str) -> bytes:
+        return self._run(self._fetch(url))
+
+    async def fetch_async(self, url: str) -> bytes:
+        # Connections and browsers belong to the background loop, so hop over to it
+        if asyncio.get_running_loop() is self._loop:
+            return await self._fetch(url)
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._fetch(url), self._loop))
+
+
+class AsyncHttpContentLoader(EventLoopContentLoader, HttpContentLoader):
+    """Fetches pages through one shared httpx.AsyncClient with keep-alive pooling and optional HTTP/2."""
+
+    def __init__(self, timeout: float = 30.0, max_connections: int = 16,
+                 max_keepalive_connections: int = 8, http2: bool = False, parser: str = "html.parser",
+                 page_cache: Optional[PageCache] = None):
+        EventLoopContentLoader.__init__(self, parser)
+        self.timeout = timeout
+        self.page_cache = page_cache
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the h2 package is not installed, falling back to HTTP/1.1")
+            http2 = False
+        self._client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections),
+            http2=http2,
+        )
+
+    async def _fetch(self, url: str) -> bytes:
+        response = await self._client.get(url, headers=self._request_headers(url))
+        if self.archive is not None:
+            # Compressing and writing the body stays off the shared event loop
+            await asyncio.to_thread(self._archive_response, url, response)
+        return self._read_response(url, response)
+
+    def close(self):
+        self._run(self._client.aclose())
 
 
 class MockContentLoader(ContentLoader):
-    def get_content(self, url: str) -> BeautifulSoup:
+    def __init__(self, parser: str = "html.parser", corpus: Optional[MockCorpus] = None):
+        """
+        Args:
+            parser: HTML parser backend used by parse, one of PARSER_BACKENDS
+            corpus: Serves the pages and caches their extractions; without one, every fetch reads the file
+        """
+        super().__init__(parser)
+        self.page_cache = corpus
+
+    def fetch(self, url: str) -> bytes:
+        if self.page_cache is not None:
+            return self.page_cache.fetch(url)
         site_name, category = url.split("://")
-        with open(config.get_mock_file_path(site_name, category), "r") as f:
-            return BeautifulSoup(f.read(), "html.parser")
+        with open(config.get_mock_file_path(site_name, category), "rb") as f:
+            return f.read()
+
+
+class ReplayContentLoader(ContentLoader):
+    """Serves the responses of an archived crawl (see PageArchive) at full speed, without network access.
+
+    Every URL gets its body as of the crawl (default the latest one); archived error
+    responses raise httpx.HTTPStatusError like the live loaders, and URLs that were
+    never fetched raise PageNotArchived.
+    """
+
+    def __init__(self, source: PageArchive, crawl: Optional[str] = None, parser: str = "html.parser"):
+        super().__init__(parser)
+        self.source = source
+        self.crawl = crawl or (source.crawls() or [None])[-1]
+        self.pages = source.pages(self.crawl) if self.crawl else {}
 
+    def fetch(self, url: str) -> bytes:
+        entry = self.pages.get(url)
+        if entry is None or entry["sha256"] is None:
+            raise PageNotArchived(f"{url} is not archived as of crawl {self.crawl}")
+        if entry["status"] >= 400:
+            request = httpx.Request("GET", url)
+            raise httpx.HTTPStatusError(f"Archived response for {url} has status {entry['status']}",
+                                        request=request, response=httpx.Response(entry["status"], request=request))
+        return self.source.read(entry["sha256"])
 
-class PlaywrightContentLoader(ContentLoader):
-    def get_content(self, url: str) -> BeautifulSoup:
-        from playwright.sync_api import sync_playwright
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
+
+class PlaywrightContentLoader(EventLoopContentLoader):
+    """Renders pages in one long-lived Chromium process with a bounded pool of reusable pages.
+
+    The browser starts on first use. Images, fonts, stylesheets and media are never
+    downloaded, since only the rendered product markup is needed. A page on which
+    wait_selector never appears fails the fetch, unless later_page says its URL is a
+    listing page after the first: that is a page past the end of the listing, read
+    as a page without products.
+    """
+    BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+
+    def __init__(self, pool_size: int = 2, wait_selector: str = "div.bg-white.rounded-16", timeout_ms: int = 10000,
+                 parser: str = "html.parser", later_page: Optional[Callable[[str], bool]] = None):
+        super().__init__(parser)
+        self.pool_size = pool_size
+        self.wait_selector = wait_selector
+        self.timeout_ms = timeout_ms
+        self.later_page = later_page
+        self._playwright = None
+        self._browser = None
+        self._pages = None
+        self._starting = None
+
+    async def _start(self):
+        from playwright.async_api import async_playwright
+        self._playwright = await async_playwright().start()
+        try:
+            self._browser = await self._playwright.chromium.launch()
+            pages = asyncio.Queue()
+            for _ in range(self.pool_size):
+                pages.put_nowait(await self._new_page())
+        except BaseException:
+            # Don't leave a half-started browser behind; the next fetch starts afresh
+            await self._stop()
+            raise
+        self._pages = pages
+        logger.info(f"Started Chromium with {self.pool_size} pooled pages")
+
+    async def _new_page(self):
+        context = await self._browser.new_context()
+        await context.route("**/*", self._block_assets)
+        return await context.new_page()
+
+    async def _block_assets(self, route):
+        if route.request.resource_type in self.BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _fetch(self, url: str) -> bytes:
+        # Every coroutine runs on the same loop, so only the first caller starts the browser
+        if self._starting is None:
+            self._starting = asyncio.ensure_future(self._start())
+        starting = self._starting
+        try:
+            # Shielded, so a caller that times out doesn't cancel the startup other callers share
+            await asyncio.shield(starting)
+        except BaseException:
+            # A failed (or itself cancelled) startup is retried by the next fetch
+            failed = starting.done() and (starting.cancelled() or starting.exception() is not None)
+            if failed and self._starting is starting:
+                self._starting = None
+            raise
+        page = await self._pages.get()
+        if page is None:
+            # The slot's previous page was lost; open its replacement now
+            try:
+                page = await self._new_page()
+            except BaseException:
+                self._pages.put_nowait(None)
+                raise
+        try:
+            from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+            response = await page.goto(url)
             try:
-                page.goto(url)
-                page.wait_for_selector("div.bg-white.rounded-16", timeout=10000)
-                content = page.content()
-            finally:
-                browser.close()
-            return BeautifulSoup(content, "html.parser")
\ No newline at end of file
+                await page.wait_for_selector(self.wait_selector, timeout=self.timeout_ms)
+            except PlaywrightTimeoutError:
+                # A first page without products is broken or blocked, but past its last page
+                # a listing renders none: that is an empty page, not a failed fetch
+                if self.later_page is None or not self.later_page(url):
+                    raise
+                logger.info(f"No {self.wait_selector} on {url} after {self.timeout_ms} ms, reading it without products")
+            content = (await page.content()).encode("utf-8")
+            if self.archive is not None:
+                # The rendered page, which is what the scraper extracts from
+                await asyncio.to_thread(self.archive.record, url, response.status if response else 200,
+                                        response.headers if response else {}, content, page.url)
+            return content
+        finally:
+            if page.is_closed():
+                # Free the slot before awaiting anything; the next fetch reopens its page
+                self._pages.put_nowait(None)
+                await self._close_context(page)
+            else:
+                self._pages.put_nowait(page)
+
+    async def _close_context(self, page):
+        try:
+            await page.context.close()
+        except Exception as e:
+            logger.warning(f"Could not close the context of a closed page: {e}")
+
+    async def _stop(self):
+        browser, self._browser = self._browser, None
+        playwright, self._playwright = self._playwright, None
+        try:
+            if browser is not None:
+                await browser.close()
+        finally:
+            if playwright is not None:
+                await playwright.stop()
+
+    def close(self):
+        if self._playwright is not None:
+            self._run(self._stop())
+        self._starting = None
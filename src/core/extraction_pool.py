@@ -0,0 +1,87 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from src.core.content_loader import ContentLoader
+from src.core.logging_config import logger
+from src.dto.discount_record import DiscountRecord
+
+# Workers fork from a fork server, a single-threaded process started with the pool,
+# never from the app itself: its fetch, event loop and scheduler threads may hold locks
+# that a forked child would inherit held. The server preloads this module only, not the
+# app's entry point, whose module-level setup (the refresh scheduler) must not run again.
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+
+
+class _ParseOnlyLoader(ContentLoader):
+    """The content loader of scrapers in a worker: parses what the parent process fetched."""
+
+    def fetch(self, url: str) -> bytes:
+        raise RuntimeError(f"Extraction workers don't fetch ({url}); pages are fetched by the parent process")
+
+
+# Per worker process: site name -> scraper
+_worker_scrapers = {}
+
+
+def _init_worker(scraper_classes: Dict[str, type], parser: str):
+    loader = _ParseOnlyLoader(parser)
+    _worker_scrapers.update((site, scraper_class(loader)) for site, scraper_class in scraper_classes.items())
+
+
+def _extract(site: str, content: bytes, url: str):
+    """Run in a worker: the page's discounts as field tuples, its next page URL and the parse and extract seconds."""
+    discounts, next_url, parse_seconds, extract_seconds = _worker_scrapers[site].extract_from_content(content, url)
+    return [discount.astuple() for discount in discounts], next_url, parse_seconds, extract_seconds
+
+
+class ExtractionPool:
+    """Parses and extracts fetched pages in worker processes, so extraction runs on every core.
+
+    BeautifulSoup parsing and selector matching are pure Python and hold the GIL, so
+    fetch threads extracting side by side take turns. With a pool, fetch threads keep
+    doing the I/O (and the page cache) and hand each page body to a worker, which runs
+    the site's scraper on it and sends the discounts back as plain tuples. Workers
+    start on the first page. If one dies, the page fails (and falls back to its last
+    good extraction) and the next page starts a new pool.
+    """
+
+    def __init__(self, scraper_classes: Dict[str, type], workers: int, parser: str = "html.parser"):
+        self.scraper_classes = dict(scraper_classes)
+        self.workers = workers
+        self.parser = parser
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = None
+                if START_METHOD:
+                    context = multiprocessing.get_context(START_METHOD)
+                    context.set_forkserver_preload([__name__])
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                                     initargs=(self.scraper_classes, self.parser))
+            return self._executor
+
+    def extract(self, site: str, content: bytes, url: str) -> Tuple[List[DiscountRecord], Optional[str], float, float]:
+        """Like DiscountScraper.extract_from_content, for the scraper of site, in a worker process."""
+        executor = self._get_executor()
+        try:
+            rows, next_url, parse_seconds, extract_seconds = executor.submit(_extract, site, content, url).result()
+        except BrokenProcessPool:
+            logger.error(f"Extraction worker died while extracting {url}; restarting the pool")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            raise
+        return [DiscountRecord(*row) for row in rows], next_url, parse_seconds, extract_seconds
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
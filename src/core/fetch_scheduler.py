@@ -0,0 +1,66 @@
+import concurrent.futures
+import threading
+from collections import deque
+from typing import Any, Callable, List, NamedTuple
+from urllib.parse import urlparse
+
+from src.core.logging_config import logger
+
+
+class FetchJob(NamedTuple):
+    """A single page to scrape: one URL of one site for one category."""
+    site: str
+    category: str
+    url: str
+
+    @property
+    def host(self) -> str:
+        """Host the job talks to; mock URLs fall back to the site name."""
+        parsed = urlparse(self.url)
+        return parsed.hostname if parsed.scheme in ("http", "https") else self.site
+
+
+class FetchScheduler:
+    """Runs fetch jobs on one shared worker pool with a global and a per-host concurrency cap.
+
+    Jobs are grouped into one queue per host. Each host gets at most ``max_per_host``
+    lanes draining its queue, and at most ``max_concurrency`` lanes run at once, so a
+    full refresh takes about as long as the slowest host's queue. The per-host cap also
+    holds across runs that overlap, such as two slice refreshes firing together.
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_per_host: int = 2):
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._host_slots_lock:
+            return self._host_slots.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+
+    def run(self, jobs: List[FetchJob], func: Callable[[FetchJob], Any]) -> List[Any]:
+        """Run func for every job and return the results in job order (None for failed jobs)."""
+        results = [None] * len(jobs)
+        queues = {}
+        for index, job in enumerate(jobs):
+            queues.setdefault(job.host, deque()).append((index, job))
+
+        def drain(queue):
+            while True:
+                try:
+                    index, job = queue.popleft()
+                except IndexError:
+                    return
+                try:
+                    with self._host_slot(job.host):
+                        results[index] = func(job)
+                except Exception as e:
+                    logger.error(f"Error running fetch job {job.site}/{job.category} {job.url}: {e}")
+
+        # Start lanes round-robin so every host gets a worker before any host gets a second one
+        lanes = [queue for slot in range(self.max_per_host) for queue in queues.values() if slot < len(queue)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(lanes)))) as executor:
+            for queue in lanes:
+                executor.submit(drain, queue)
+        return results
@@ -0,0 +1,118 @@
+"""
+HTML parser backends.
+
+Every backend returns a node supporting the small selector API the scrapers use:
+select(css), select_one(css), get_text(separator, strip), get(attr), has_attr(attr)
+and node[attr]. BeautifulSoup provides it natively, selectolax trees are wrapped.
+
+A parse can be scoped to the product containers (a compound selector such as
+"li.product-item.product-fallback", or several separated by commas). BeautifulSoup
+backends then only build those subtrees. selectolax ignores the scope: lexbor builds a whole page in C faster than
+filtering would save.
+"""
+
+import functools
+from typing import List, Optional, Protocol
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.filter import ElementFilter
+
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+
+
+class HtmlNode(Protocol):
+    """The part of the BeautifulSoup Tag API that scrapers may rely on."""
+
+    def select(self, selector: str) -> List["HtmlNode"]: ...
+
+    def select_one(self, selector: str) -> Optional["HtmlNode"]: ...
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str: ...
+
+    def get(self, name: str, default=None): ...
+
+    def has_attr(self, name: str) -> bool: ...
+
+    def __getitem__(self, name: str): ...
+
+
+class SelectolaxNode:
+    """Adapts a selectolax (lexbor) node to the HtmlNode API."""
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    def select(self, selector: str) -> List["SelectolaxNode"]:
+        return [SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional["SelectolaxNode"]:
+        node = self._node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        if not strip or not separator:
+            return self._node.text(deep=True, separator=separator, strip=strip)
+        # Like BeautifulSoup, drop strings that are empty once stripped
+        parts = (part.strip() for part in self._node.text(deep=True, separator="\x00").split("\x00"))
+        return separator.join(part for part in parts if part)
+
+    def get(self, name: str, default=None):
+        value = self._node.attributes.get(name, default)
+        return "" if value is None and name in self._node.attributes else value
+
+    def has_attr(self, name: str) -> bool:
+        return name in self._node.attributes
+
+    def __getitem__(self, name: str):
+        value = self._node.attributes[name]
+        return "" if value is None else value
+
+
+class _AnyOf(ElementFilter):
+    """Keeps the elements any of several strainers keeps."""
+
+    def __init__(self, strainers: List[SoupStrainer]):
+        super().__init__()
+        self.strainers = strainers
+
+    @property
+    def includes_everything(self) -> bool:
+        return any(strainer.includes_everything for strainer in self.strainers)
+
+    def match(self, element, _known_rules: bool = False) -> bool:
+        return any(strainer.match(element, _known_rules) for strainer in self.strainers)
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+
+    def allow_string_creation(self, string: str) -> bool:
+        return any(strainer.allow_string_creation(string) for strainer in self.strainers)
+
+
+def _compound_strainer(selector: str) -> SoupStrainer:
+    tag, *classes = selector.strip().split(".")
+    required = set(classes)
+
+    def has_classes(value):
+        values = value.split() if isinstance(value, str) else (value or [])
+        return required <= set(values)
+
+    return SoupStrainer(tag or None, attrs={"class": has_classes} if classes else {})
+
+
+@functools.lru_cache(maxsize=None)
+def _strainer(scope: str) -> ElementFilter:
+    """Build a filter keeping only elements that match a tag.class.class selector (or any of a comma-separated list)."""
+    strainers = [_compound_strainer(selector) for selector in scope.split(",")]
+    return strainers[0] if len(strainers) == 1 else _AnyOf(strainers)
+
+
+def parse_html(content, backend: str = "html.parser", scope: Optional[str] = None) -> HtmlNode:
+    """Parse a page with the given backend ("html.parser", "lxml" or "selectolax"), optionally scoped."""
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        return SelectolaxNode(LexborHTMLParser(content).root)
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend!r}, expected one of {PARSER_BACKENDS}")
+    return BeautifulSoup(content, backend, parse_only=_strainer(scope) if scope else None)
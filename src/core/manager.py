@@ -1,14 +1,24 @@
+import threading
 import yaml
 import os
-from typing import List, Dict, Any
+from urllib.parse import urlparse
+from typing import Iterable, List, Dict, Any, Optional, Tuple
 
 from src.core.config import config
+from src.core.extraction_pool import ExtractionPool
 from src.core.logging_config import logger
+from src.core.mock_corpus import MockCorpus
+from src.core.fetch_scheduler import FetchJob, FetchScheduler
+from src.core.page_archive import PageArchive
+from src.core.page_cache import PageCache
+from src.core.resilient_loader import ResilientContentLoader
 from src.scrapers.bergfreunde import BergfreundeScraper
 from src.scrapers.fourcamping import FourCampingScraper
 from src.scrapers.mountex import MountexScraper
 from src.scrapers.maszas import MaszasScraper
-from src.core.content_loader import HttpContentLoader, MockContentLoader, PlaywrightContentLoader
+from src.core.content_loader import (AsyncHttpContentLoader, ContentLoader, MockContentLoader, PlaywrightContentLoader,
+                                     ReplayContentLoader)
+from src.dto.discount_record import DiscountRecord
 from src.dto.discount_url import DiscountUrl
 
 
@@ -16,7 +26,12 @@ def get_project_root():
     return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 class ScraperManager:
-    """Manages scraper initialization and configuration."""
+    """Manages scraper initialization and configuration.
+
+    Building a manager reads the categories file once, plans every URL per site and
+    creates one content loader per loader type. Scrapers hold no per-call state, so a
+    single manager can be shared by every thread (see get_scraper_manager).
+    """
     
     SCRAPER_CLASSES = {
         'bergfreunde': BergfreundeScraper,
@@ -25,38 +40,192 @@ class ScraperManager:
         'maszas': MaszasScraper,
     }
 
-    def __init__(self, config_path='config/categories.yaml'):
+    def __init__(self, config_path=os.path.join(get_project_root(), 'config', 'categories.yaml')):
         self.config_path = config_path
         self.categories = self.load_categories()
+        self.page_cache = self._create_page_cache()
+        self.archive = open_page_archive() if config.is_production() else None
         self.scraper_map = self._initialize_scrapers()
+        self.extraction_pool = self._create_extraction_pool()
+        settings = config.get_scraping_settings()
+        self.fetch_scheduler = FetchScheduler(settings.get('max_concurrency', 8), settings.get('max_per_host', 2))
+        self.max_pages = settings.get('pagination', {}).get('max_pages', 10)
 
     def _initialize_scrapers(self) -> Dict[str, Any]:
         scraper_map = {}
         
         urls_by_site = self.create_discount_urls_by_site()
+        if config.is_production():
+            logger.info("Running in PRODUCTION mode - using real scrapers")
+        else:
+            logger.info("Running in DEVELOPMENT mode - using mock scrapers")
+        loaders = {}
 
         for site, scraper_class in self.SCRAPER_CLASSES.items():
-            content_loader = None
-            if config.is_production():
-                logger.info("Running in PRODUCTION mode - using real scrapers")
-                if site == "mountex":
-                    content_loader = PlaywrightContentLoader()
-                else:
-                    content_loader = HttpContentLoader()
+            if config.is_production() and config.get_replay_crawl():
+                loader_type = "replay"
+            elif config.is_production():
+                loader_type = "playwright" if site == "mountex" else "http"
             else:
-                logger.info("Running in DEVELOPMENT mode - using mock scrapers")
-                content_loader = MockContentLoader()
-            
-            if content_loader:
-                scraper_map[site] = scraper_class(content_loader, urls_by_site.get(site, []))
-                logger.info(f"Initialized {site} scraper with {len(urls_by_site.get(site, []))} URLs")
+                loader_type = "mock"
+            if loader_type not in loaders:
+                loaders[loader_type] = self._create_content_loader(loader_type, scraper_class)
+            scraper_map[site] = scraper_class(loaders[loader_type], urls_by_site.get(site, []))
+            logger.info(f"Initialized {site} scraper with {len(urls_by_site.get(site, []))} URLs")
 
         return scraper_map
 
+    def _create_page_cache(self):
+        settings = config.get_scraping_settings()
+        cache_dir = settings.get('page_cache_dir')
+        if not config.is_production() or not cache_dir:
+            return None
+        return PageCache(config.get_data_path(cache_dir), settings.get('parser', 'html.parser'))
+
+    def _create_mock_corpus(self, parser: str) -> Optional[MockCorpus]:
+        cache_dir = config.get_scraping_settings().get('mock_cache_dir')
+        if not cache_dir:
+            return None
+        return MockCorpus(config.get_data_path(cache_dir), parser)
+
+    def _create_extraction_pool(self) -> Optional[ExtractionPool]:
+        settings = config.get_scraping_settings()
+        workers = settings.get('extraction', {}).get('workers', 0)
+        if not workers:
+            return None
+        pool = ExtractionPool({scraper.SITE: type(scraper) for scraper in self.scraper_map.values()}, workers,
+                              settings.get('parser', 'html.parser'))
+        for scraper in self.scraper_map.values():
+            scraper.extraction_pool = pool
+        logger.info(f"Extracting pages in {workers} worker processes")
+        return pool
+
+    def _create_content_loader(self, loader_type: str, scraper_class: Optional[type] = None) -> ContentLoader:
+        settings = config.get_scraping_settings()
+        parser = settings.get('parser', 'html.parser')
+        if loader_type == "http":
+            loader = AsyncHttpContentLoader(parser=parser, page_cache=self.page_cache, **settings.get('http', {}))
+        elif loader_type == "playwright":
+            # Only the rendering shop's later pages may legitimately show no products
+            loader = PlaywrightContentLoader(parser=parser, later_page=scraper_class.is_later_page,
+                                             **settings.get('browser', {}))
+        elif loader_type == "replay":
+            crawl = config.get_replay_crawl()
+            if self.archive is None:
+                raise ValueError("REPLAY_CRAWL is set but no scraping.archive is configured")
+            loader = ReplayContentLoader(self.archive, None if crawl == "latest" else crawl, parser=parser)
+            logger.info(f"Replaying archived crawl {loader.crawl} ({len(loader.pages)} pages)")
+            return loader
+        else:
+            return MockContentLoader(parser=parser, corpus=self._create_mock_corpus(parser))
+        loader.archive = self.archive
+        # Live shops get timeouts, retries and a circuit breaker per host
+        return ResilientContentLoader(loader, **settings.get('resilience', {}))
+
     def get_scrapers(self) -> Dict[str, Any]:
         """Get the initialized scrapers map."""
         return self.scraper_map
 
+    def close(self):
+        """Shut down the content loaders (connection pools, browser) and the extraction workers."""
+        for content_loader in {id(s.content_loader): s.content_loader for s in self.scraper_map.values()}.values():
+            try:
+                content_loader.close()
+            except Exception as e:
+                logger.error(f"Error closing {type(content_loader).__name__}: {e}")
+        if self.extraction_pool is not None:
+            self.extraction_pool.close()
+
+    def plan_jobs(self, categories: Iterable[str], sites: Optional[Iterable[str]] = None) -> List[FetchJob]:
+        """List every (site, category, URL) fetch job for the given categories, optionally only for some sites."""
+        sites = set(sites) if sites is not None else self.scraper_map.keys()
+        return [
+            FetchJob(site, category, url)
+            for category in categories
+            for site, scraper in self.scraper_map.items() if site in sites
+            for url in scraper.get_urls_for_category(category)
+        ]
+
+    def fetch_discounts(self, categories: Iterable[str], sites: Optional[Iterable[str]] = None) -> Dict[Tuple[str, str], List[DiscountRecord]]:
+        """Fetch discounts for the given categories (and sites, default all), keyed by (category, site)."""
+        jobs = self.plan_jobs(categories, sites)
+        if self.archive is not None and not config.get_replay_crawl():
+            self.archive.new_crawl()
+        cache_stats = self.page_cache.stats() if self.page_cache is not None else None
+        pages = self._fetch_pages(jobs)
+        results = [discounts for discounts, _ in pages]
+        # Mock listings are single files; only live listings continue on further pages
+        listings = [(index, job, next_url) for index, (job, (_, next_url)) in enumerate(zip(jobs, pages))
+                    if next_url and urlparse(job.url).scheme in ("http", "https")]
+        for index, discounts in self._fetch_next_pages(listings, results).items():
+            results[index].extend(discounts)
+        if cache_stats is not None:
+            now = self.page_cache.stats()
+            logger.info(f"Page cache: {now['hits'] - cache_stats['hits']} unchanged pages reused, "
+                        f"{now['misses'] - cache_stats['misses']} pages parsed")
+        discounts_by_slice = {}
+        for job, discounts in zip(jobs, results):
+            discounts_by_slice.setdefault((job.category, job.site), []).extend(discounts or [])
+        return discounts_by_slice
+
+    def _fetch_pages(self, jobs: List[FetchJob]) -> List[Tuple[List[DiscountRecord], Optional[str]]]:
+        """Fetch one listing page per job: its discounts and the next page's URL."""
+        pages = self.fetch_scheduler.run(
+            jobs, lambda job: self.scraper_map[job.site].extract_page_from_url(job.url, job.category)
+        )
+        return [page or ([], None) for page in pages]
+
+    def _fetch_next_pages(self, listings: List[Tuple[int, FetchJob, str]],
+                          first_pages: List[List[DiscountRecord]]) -> Dict[int, List[DiscountRecord]]:
+        """Follow paginated listings past their first page, up to max_pages pages each.
+
+        Pages are fetched in waves: each listing whose scraper can address pages by
+        number contributes up to max_per_host upcoming pages per wave, so pages of one
+        shop load in parallel within its host budget while all listings advance
+        together. A listing stops at its last page, or at the first page without
+        discounts it hasn't already seen (as when a shop serves its last page again
+        for page numbers past the end); pages fetched ahead of that stop are dropped.
+        first_pages holds the discounts of every listing's first page, by index.
+        """
+        discounts = {index: [] for index, _, _ in listings}
+        seen = {index: {discount.url for discount in first_pages[index]} for index, _, _ in listings}
+        # index -> (job, URL of the next page, its page number)
+        pending = {index: (job, next_url, 2) for index, job, next_url in listings}
+        while pending:
+            wave, owners = [], []
+            for index, (job, next_url, page) in pending.items():
+                scraper = self.scraper_map[job.site]
+                urls = [next_url]
+                for ahead in range(page + 1, min(page + self.fetch_scheduler.max_per_host, self.max_pages + 1)):
+                    url = scraper.page_url(job.url, ahead)
+                    if url is None:
+                        break
+                    urls.append(url)
+                wave.extend(job._replace(url=url) for url in urls)
+                owners.extend([index] * len(urls))
+            if not wave:
+                break
+            pages = self._fetch_pages(wave)
+            stopped = set()
+            for index, job, (page_discounts, next_url) in zip(owners, wave, pages):
+                if index in stopped:
+                    continue
+                unseen = [discount for discount in page_discounts if discount.url not in seen[index]]
+                if not unseen:
+                    stopped.add(index)
+                    continue
+                seen[index].update(discount.url for discount in unseen)
+                discounts[index].extend(unseen)
+                if next_url is None:
+                    stopped.add(index)
+                else:
+                    pending_job, _, page = pending[index]
+                    pending[index] = (pending_job, next_url, page + 1)
+            for index in list(pending):
+                if index in stopped or pending[index][2] > self.max_pages:
+                    del pending[index]
+        return discounts
+
     def load_categories(self) -> Dict[str, Any]:
         """Load categories configuration from YAML file."""
         with open(self.config_path, 'r') as f:
@@ -66,10 +235,9 @@ class ScraperManager:
     def create_discount_urls_by_site(self) -> Dict[str, List[DiscountUrl]]:
         """Create DiscountUrl objects grouped by site from the categories configuration."""
         urls_by_site = {}
-        categories = self.load_categories()
         available_sites = self.SCRAPER_CLASSES.keys()
         
-        for category_name, site_urls in categories.items():
+        for category_name, site_urls in self.categories.items():
             for site_name in available_sites:
                 url = site_urls.get(site_name)
                 if url:
@@ -94,4 +262,26 @@ class ScraperManager:
                             urls_by_site[site_name] = []
                         urls_by_site[site_name].append(discount_url)
         
-        return urls_by_site 
\ No newline at end of file
+        return urls_by_site
+
+
+def open_page_archive() -> Optional[PageArchive]:
+    """The raw-page archive configured under scraping.archive, None if there is none."""
+    settings = config.get_scraping_settings().get('archive') or {}
+    if not settings.get('directory'):
+        return None
+    return PageArchive(config.get_data_path(settings['directory']), settings.get('compression', 'gzip'))
+
+
+# Shared instance, built on first use
+_scraper_manager = None
+_scraper_manager_lock = threading.Lock()
+
+def get_scraper_manager() -> ScraperManager:
+    """Return the process-wide ScraperManager, building it on first call."""
+    global _scraper_manager
+    if _scraper_manager is None:
+        with _scraper_manager_lock:
+            if _scraper_manager is None:
+                _scraper_manager = ScraperManager()
+    return _scraper_manager
@@ -0,0 +1,217 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms are kept per label set in plain dicts under one lock
+per metric, so recording costs a dict lookup and a few additions. A registry renders
+its metrics for a /metrics endpoint. Scrape and refresh metrics live in their own
+registry, since only the refresher process records them (see discount_service).
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds of the default histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric:
+    TYPE = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence[str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {labels}")
+        return tuple(labels)
+
+    def _samples(self) -> List[Tuple[str, str, float]]:
+        """(suffixed name, formatted labels, value) of every sample."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self._samples())
+        return "\n".join(lines) + "\n"
+
+
+class Counter(_Metric):
+    """A count that only goes up, such as requests served or bytes downloaded."""
+    TYPE = "counter"
+
+    def inc(self, *labels: str, amount: float = 1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in items]
+
+
+class Gauge(_Metric):
+    """A value that goes up and down; set it, or give a function read at render time."""
+    TYPE = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 function: Optional[Callable[[], Optional[float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def set(self, value: float, *labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self):
+        if self.function is not None:
+            value = self.function()
+            return [] if value is None else [(self.name, "", value)]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in items]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their sum and count."""
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, *labels: str):
+        key = self._key(labels)
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, then the sum
+                state = self._values[key] = [0] * len(self.buckets) + [0.0]
+            state[bucket] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str):
+        """Observe the seconds spent in the with block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return sum(state[:-1]) if state else 0
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        samples = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                samples.append((f"{self.name}_bucket", labels, cumulative))
+            labels = _format_labels(self.labelnames, key)
+            samples.append((f"{self.name}_sum", labels, state[-1]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              function: Optional[Callable[[], Optional[float]]] = None) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, function))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format."""
+        return "".join(metric.render() for metric in self._metrics.values())
+
+
+# Recorded by every process: the requests it serves
+registry = MetricsRegistry()
+# Recorded by the process that scrapes (fetch, parse, extract, refresh)
+refresh_registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "Time spent serving HTTP requests, by route", ["route"])
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests served, by route and status code", ["route", "status"])
+
+FETCH_SECONDS = refresh_registry.histogram(
+    "scraper_fetch_duration_seconds", "Page fetch latency, by host", ["host"])
+FETCH_BYTES = refresh_registry.histogram(
+    "scraper_fetch_bytes", "Size of downloaded pages in bytes, by host", ["host"],
+    buckets=(16_384, 65_536, 262_144, 524_288, 1_048_576, 2_097_152, 4_194_304, 8_388_608))
+PARSE_SECONDS = refresh_registry.histogram(
+    "scraper_parse_duration_seconds", "Time spent parsing pages, by site", ["site"])
+EXTRACT_SECONDS = refresh_registry.histogram(
+    "scraper_extract_duration_seconds", "Time spent extracting discounts from parsed pages, by site", ["site"])
+ITEMS_EXTRACTED = refresh_registry.histogram(
+    "scraper_items_extracted", "Discounts extracted per page, by site", ["site"],
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250))
+PAGES_NOT_MODIFIED = refresh_registry.counter(
+    "scraper_pages_not_modified_total", "Pages reused from the page cache, by site", ["site"])
+SCRAPE_ERRORS = refresh_registry.counter(
+    "scraper_errors_total", "Pages that could not be fetched or extracted, by site and stage", ["site", "stage"])
+REFRESH_SECONDS = refresh_registry.histogram(
+    "refresh_duration_seconds", "Duration of refresh jobs, by job", ["job"],
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600))
+FETCH_RETRIES = refresh_registry.counter(
+    "scraper_fetch_retries_total", "Fetches retried after a failure, by host", ["host"])
+CIRCUIT_OPEN = refresh_registry.counter(
+    "scraper_circuit_opened_total", "Times a host's circuit breaker opened", ["host"])
+SCRAPE_FALLBACKS = refresh_registry.counter(
+    "scraper_fallbacks_total", "Failed pages answered with their last good extraction, by site", ["site"])
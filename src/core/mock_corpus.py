@@ -0,0 +1,95 @@
+import hashlib
+import json
+import mmap
+import os
+from typing import Dict, Optional, Tuple
+
+from src.core.config import config
+from src.core.page_cache import PageCache, PageNotModified
+
+
+def _mapped(path: str):
+    """The file's bytes as a read-only memory map (bytes for an empty file)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class MockCorpus(PageCache):
+    """The mock pages (tests/mocks) with their extractions cached on disk.
+
+    A page's cached discounts are keyed by a hash of the file (and, as in any page cache,
+    by the parser backend and extraction code). The hash is taken from a memory map of the
+    file and kept per path until the file's mtime or size changes, so an unchanged
+    page costs one stat. fetch raises PageNotModified for such pages, which makes
+    scrapers reuse the stored discounts the same way as for live pages in the page
+    cache; only new or edited pages are read and parsed.
+
+    A page can also ship pre-extracted: <site>_<category>.json next to the mocks (see
+    scripts/export_mock_fixtures.py) holds its discounts and next page, and is served
+    when there is no .html file for the page.
+    """
+
+    def __init__(self, directory: str, parser: str = "html.parser", mocks_dir: Optional[str] = None):
+        super().__init__(directory, parser)
+        self.mocks_dir = mocks_dir or config.get_mock_files_dir()
+        # path -> ((mtime_ns, size), sha256 of the file)
+        self._hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+    def _page_path(self, url: str, extension: str) -> str:
+        site_name, category = url.split("://")
+        return os.path.join(self.mocks_dir, f"{site_name}_{category}.{extension}")
+
+    def file_hash(self, path: str) -> str:
+        """sha256 of a file, hashed again only when its mtime or size changed."""
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._hashes.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        content = _mapped(path)
+        try:
+            digest = hashlib.sha256(content).hexdigest()
+        finally:
+            if isinstance(content, mmap.mmap):
+                content.close()
+        with self._lock:
+            self._hashes[path] = (key, digest)
+        return digest
+
+    def fixture(self, url: str) -> Optional[Dict]:
+        """The pre-extracted fixture of url, None if there is none."""
+        try:
+            with open(self._page_path(url, "json"), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def fetch(self, url: str) -> bytes:
+        """The page's bytes; raises PageNotModified when its cached extraction or fixture still applies."""
+        path = self._page_path(url, "html")
+        if not os.path.exists(path):
+            fixture = self.fixture(url)
+            if fixture is None:
+                raise FileNotFoundError(f"No mock page or fixture for {url} in {self.mocks_dir}")
+            with self._lock:
+                self._entries[url] = {"content_hash": None, "discounts": fixture["discounts"],
+                                      "next_page": fixture.get("next_page")}
+            self._count(hit=True)
+            raise PageNotModified(url)
+
+        content_hash = self.file_hash(path)
+        entry = self._entry(url)
+        if self._reusable(entry) and entry.get("content_hash") == content_hash:
+            self._count(hit=True)
+            raise PageNotModified(url)
+        self._record_body(url, entry, {"content_hash": content_hash})
+        self._count(hit=False)
+        content = _mapped(path)
+        try:
+            return content[:]
+        finally:
+            if isinstance(content, mmap.mmap):
+                content.close()
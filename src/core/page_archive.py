@@ -0,0 +1,147 @@
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Mapping, Optional
+
+from src.core.logging_config import logger
+
+COMPRESSIONS = ("gzip", "zstd")
+_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+class PageNotArchived(LookupError):
+    """Raised when replaying a URL the archive has no response for."""
+
+
+class PageArchive:
+    """Compressed, content-addressed archive of the raw responses of every refresh.
+
+    Bodies are stored once under objects/<sha256[:2]>/<sha256>.gz (or .zst), so a page
+    that didn't change between refreshes costs no space. Each crawl is a JSON lines
+    file under crawls/, one line per response: URL, final URL, status, headers, fetch
+    time and the body's hash. A crawl starts with every refresh (new_crawl); responses
+    of refreshes that overlap land in the latest crawl.
+
+    pages(crawl) gives the archive as of a crawl: every URL's latest response up to
+    and including it, so a slice refresh's crawl still replays the whole site, and a
+    304 (which has no body) resolves to the body recorded before it.
+    """
+
+    def __init__(self, directory: str, compression: str = "gzip"):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown archive compression {compression!r}, expected one of {COMPRESSIONS}")
+        if compression == "zstd" and importlib.util.find_spec("zstandard") is None:
+            logger.warning("zstd archive compression requested but zstandard is not installed, using gzip")
+            compression = "gzip"
+        self.directory = directory
+        self.compression = compression
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "crawls"), exist_ok=True)
+        self._crawl = None
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest: str, compression: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest + _EXTENSIONS[compression])
+
+    def _crawl_path(self, crawl: str) -> str:
+        return os.path.join(self.directory, "crawls", crawl + ".jsonl")
+
+    def new_crawl(self) -> str:
+        """Start a crawl, named after the current UTC time; later records go to it."""
+        with self._lock:
+            return self._start_crawl()
+
+    def _start_crawl(self) -> str:
+        stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        crawl, suffix = stamp, 1
+        while os.path.exists(self._crawl_path(crawl)) or crawl == self._crawl:
+            suffix += 1
+            crawl = f"{stamp}-{suffix:03d}"
+        self._crawl = crawl
+        return crawl
+
+    def crawls(self) -> List[str]:
+        """Recorded crawls, oldest first."""
+        names = [name[:-len(".jsonl")] for name in os.listdir(os.path.join(self.directory, "crawls"))
+                 if name.endswith(".jsonl")]
+        return sorted(names)
+
+    def _compress(self, content: bytes) -> bytes:
+        if self.compression == "zstd":
+            import zstandard
+            return zstandard.ZstdCompressor(level=10).compress(content)
+        return gzip.compress(content, compresslevel=6, mtime=0)
+
+    def store(self, content: bytes) -> str:
+        """Store a body (once) and return its sha256."""
+        digest = hashlib.sha256(content).hexdigest()
+        if any(os.path.exists(self._object_path(digest, compression)) for compression in COMPRESSIONS):
+            return digest
+        path = self._object_path(digest, self.compression)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(self._compress(content))
+        os.replace(temporary, path)
+        return digest
+
+    def read(self, digest: str) -> bytes:
+        """The body with the given sha256."""
+        for compression in COMPRESSIONS:
+            path = self._object_path(digest, compression)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    data = f.read()
+                if compression == "zstd":
+                    import zstandard
+                    return zstandard.ZstdDecompressor().decompress(data)
+                return gzip.decompress(data)
+        raise PageNotArchived(f"No archived body {digest} in {self.directory}")
+
+    def record(self, url: str, status: int, headers: Mapping[str, str], content: Optional[bytes],
+               final_url: Optional[str] = None):
+        """Archive one response; content is None for responses without a body, such as a 304."""
+        try:
+            entry = {
+                "url": url,
+                "final_url": final_url or url,
+                "status": status,
+                "headers": {key.lower(): value for key, value in headers.items()},
+                "fetched_at": time.time(),
+                "sha256": self.store(content) if content is not None else None,
+                "size": len(content) if content is not None else 0,
+            }
+            with self._lock:
+                if self._crawl is None:
+                    self._start_crawl()
+                with open(self._crawl_path(self._crawl), "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not archive the response for {url}: {e}")
+
+    def entries(self, crawl: str) -> List[Dict]:
+        """The responses recorded in one crawl, in the order they arrived."""
+        with open(self._crawl_path(crawl), "r") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def pages(self, crawl: Optional[str] = None) -> Dict[str, Dict]:
+        """URL -> latest response entry as of crawl (default the latest crawl)."""
+        crawls = self.crawls()
+        if crawl is not None:
+            if crawl not in crawls:
+                raise PageNotArchived(f"No crawl {crawl} in {self.directory}")
+            crawls = crawls[:crawls.index(crawl) + 1]
+        pages = {}
+        for name in crawls:
+            for entry in self.entries(name):
+                previous = pages.get(entry["url"])
+                if entry["sha256"] is None and entry["status"] == 304 and previous is not None:
+                    # Not modified: the body recorded before still applies
+                    entry = {**entry, "status": previous["status"], "sha256": previous["sha256"],
+                             "size": previous["size"]}
+                pages[entry["url"]] = entry
+        return pages
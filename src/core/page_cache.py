@@ -0,0 +1,153 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from src.core.logging_config import logger
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Code that decides what a page extracts to; editing any of it invalidates cached extractions
+EXTRACTOR_SOURCES = ("src/scrapers/*.py", "src/core/html_parser.py", "src/core/price_parser.py", "src/dto/*.py")
+
+_extractor_version = None
+_extractor_version_lock = threading.Lock()
+
+
+def extractor_version() -> str:
+    """Hash of the extraction code (EXTRACTOR_SOURCES), computed once per process."""
+    global _extractor_version
+    with _extractor_version_lock:
+        if _extractor_version is None:
+            digest = hashlib.sha256()
+            for pattern in EXTRACTOR_SOURCES:
+                for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, pattern))):
+                    digest.update(os.path.relpath(path, PROJECT_ROOT).encode("utf-8"))
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+            _extractor_version = digest.hexdigest()[:16]
+        return _extractor_version
+
+
+class PageNotModified(Exception):
+    """Raised by a content loader when a page is unchanged since its cached extraction."""
+
+
+class PageCache:
+    """Disk-backed cache of page validators and the discounts extracted from each page.
+
+    For every URL it keeps the ETag and Last-Modified validators, a hash of the body,
+    the extracted discounts (as dicts) and the next listing page's URL. Loaders send conditional requests with the
+    validators; a 304 or an identical body counts as a hit and lets the scraper reuse
+    the stored discounts without parsing. A new body's validators and hash wait in the
+    entry as pending until its discounts are stored, so a failed extraction leaves the
+    last good discounts (and the validators they belong to) in place.
+
+    Discounts are stored with the parser backend and extraction code (extractor_version)
+    that produced them, and are only reused while both are unchanged.
+    """
+
+    def __init__(self, directory: str, parser: str = "html.parser"):
+        self.directory = directory
+        self.parser = parser
+        os.makedirs(directory, exist_ok=True)
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _entry(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            if url not in self._entries:
+                try:
+                    with open(self._path(url), "r") as f:
+                        self._entries[url] = json.load(f)
+                except (OSError, ValueError):
+                    self._entries[url] = None
+            return self._entries[url]
+
+    def _save(self, url: str, entry: Dict):
+        with self._lock:
+            self._entries[url] = entry
+        path = self._path(url)
+        try:
+            with open(path + ".tmp", "w") as f:
+                json.dump(entry, f)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            logger.warning(f"Could not write page cache entry for {url}: {e}")
+
+    def _extractor(self) -> str:
+        return f"{self.parser}:{extractor_version()}"
+
+    def _reusable(self, entry: Optional[Dict]) -> bool:
+        return bool(entry) and entry.get("discounts") is not None and entry.get("extractor") == self._extractor()
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for url, empty if there is nothing to reuse."""
+        entry = self._entry(url)
+        if not self._reusable(entry):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def check_response(self, url: str, status_code: int, content: bytes, headers) -> None:
+        """Record a response; raise PageNotModified on a 304 or an unchanged body."""
+        entry = self._entry(url)
+        reusable = self._reusable(entry)
+        if status_code == 304:
+            if not reusable:
+                raise RuntimeError(f"Got 304 Not Modified for {url} without a cached extraction")
+            self._count(hit=True)
+            raise PageNotModified(url)
+        content_hash = hashlib.sha256(content).hexdigest()
+        validators = {"etag": headers.get("etag"), "last_modified": headers.get("last-modified")}
+        if reusable and entry["content_hash"] == content_hash:
+            self._save(url, {**entry, **validators})
+            self._count(hit=True)
+            raise PageNotModified(url)
+        self._record_body(url, entry, {**validators, "content_hash": content_hash})
+        self._count(hit=False)
+
+    def _record_body(self, url: str, entry: Optional[Dict], pending: Dict):
+        """Note a new or changed body, keeping the cached discounts until store_discounts replaces them."""
+        self._save(url, {**(entry or {}), "pending": pending})
+
+    def store_discounts(self, url: str, discounts: List[Dict], next_page: Optional[str] = None):
+        """Attach the discounts and next page URL extracted from the last recorded body of url."""
+        entry = self._entry(url)
+        if entry:
+            entry = dict(entry)
+            pending = entry.pop("pending", {})
+            self._save(url, {**entry, **pending, "discounts": discounts, "next_page": next_page,
+                             "extractor": self._extractor()})
+
+    def discounts(self, url: str) -> List[Dict]:
+        """The discounts extracted from the cached body of url."""
+        entry = self._entry(url)
+        return (entry or {}).get("discounts") or []
+
+    def next_page(self, url: str) -> Optional[str]:
+        """The next listing page URL extracted from the cached body of url."""
+        entry = self._entry(url)
+        return (entry or {}).get("next_page")
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Cumulative hit and miss counts."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
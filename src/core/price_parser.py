@@ -0,0 +1,69 @@
+import re
+from typing import Iterable, List, NamedTuple, Optional
+
+# Currency markers as the shops print them, matched case-insensitively
+CURRENCY_MARKERS = {
+    "ft": "HUF",
+    "huf": "HUF",
+    "€": "EUR",
+    "eur": "EUR",
+}
+# Minor units per major unit. Forint prices carry no fillér in practice, but ISO 4217
+# gives HUF two decimals, so every currency is stored in hundredths.
+MINOR_UNITS = 100
+
+_NUMBER = re.compile(r"\d(?:[\d.,'\s]*\d)?")
+_CURRENCY = re.compile("|".join(re.escape(marker) for marker in sorted(CURRENCY_MARKERS, key=len, reverse=True)),
+                       re.IGNORECASE)
+_SEPARATORS = re.compile(r"[.,'\s]")
+
+
+class Price(NamedTuple):
+    """A price as an integer number of minor units (hundredths) of its currency."""
+    amount: int
+    currency: Optional[str]
+
+
+def _parse_number(number: str) -> int:
+    """Digits with thousands and decimal separators to minor units.
+
+    The last '.' or ',' is the decimal separator when one or two digits follow it
+    ("€ 5,50", "1,234.5"); every other separator groups thousands ("10.990 Ft", "5 200Ft").
+    """
+    parts = _SEPARATORS.split(number)
+    fraction = ""
+    if len(parts) > 1 and len(parts[-1]) <= 2 and number[-len(parts[-1]) - 1] in ".,":
+        fraction = parts.pop()
+    return int("".join(parts)) * MINOR_UNITS + int(fraction.ljust(2, "0"))
+
+
+def parse_price(text: Optional[str], default_currency: Optional[str] = None) -> Optional[Price]:
+    """Parse a shop price like "10.990 Ft", "5\xa0200Ft" or "€ 5,50"; None if it has no number."""
+    if not text:
+        return None
+    number = _NUMBER.search(text)
+    if number is None:
+        return None
+    currency = _CURRENCY.search(text)
+    return Price(_parse_number(number.group()),
+                 CURRENCY_MARKERS[currency.group().lower()] if currency else default_currency)
+
+
+def parse_prices(texts: Iterable[Optional[str]], default_currency: Optional[str] = None) -> List[Optional[Price]]:
+    """parse_price over a batch of price strings."""
+    return [parse_price(text, default_currency) for text in texts]
+
+
+def parse_percent(text: Optional[str]) -> Optional[int]:
+    """Size of a discount label like "-15%", "to -15 %" or "15" as a whole number; None if it has no number."""
+    if not text:
+        return None
+    number = re.search(r"\d+", text)
+    return int(number.group()) if number else None
+
+
+def percent_off(old: Optional[Price], new: Optional[Price]) -> Optional[int]:
+    """Whole percent saved going from old to new, rounded down; None unless both are comparable."""
+    if old is None or new is None or old.currency != new.currency or old.amount <= 0:
+        return None
+    return abs(old.amount - new.amount) * 100 // old.amount
@@ -0,0 +1,217 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from src.core.content_loader import ContentLoader, EventLoopContentLoader
+from src.core.logging_config import logger
+from src.core.metrics import CIRCUIT_OPEN, FETCH_RETRIES
+from src.core.page_cache import PageNotModified
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of fetching while a host's circuit breaker is open."""
+
+
+class FetchTimeoutError(TimeoutError):
+    """Raised when a fetch takes longer than its host's timeout."""
+
+
+class CircuitBreaker:
+    """Stops calls to a host after repeated failures, then lets one trial call through.
+
+    After failure_threshold failed fetches in a row the circuit opens and calls fail
+    at once for reset_timeout seconds. The first call after that is a trial: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._trial_running or self.clock() - self.opened_at < self.reset_timeout:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> bool:
+        """Count a failed call; True if this opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            reopened = self._trial_running
+            self._trial_running = False
+            if reopened or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = self.clock()
+                return True
+            return False
+
+
+def _retryable(error: BaseException) -> bool:
+    """Timeouts, connection errors, 5xx and 429 may pass; other HTTP errors will not."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return True
+
+
+class ResilientContentLoader(ContentLoader):
+    """Wraps any ContentLoader with per-host timeouts, retries and a circuit breaker per host.
+
+    A fetch that fails or times out is retried up to `retries` times, after an
+    exponential backoff (backoff * 2**attempt, capped at max_backoff) with full
+    jitter. Hosts whose fetches keep failing are skipped by their circuit breaker
+    until it lets a trial fetch through. PageNotModified and client errors (4xx other
+    than 429) count as successes for the breaker: the host answered.
+    """
+
+    def __init__(self, loader: ContentLoader, timeout: float = 30.0, host_timeouts: Optional[Dict[str, float]] = None,
+                 retries: int = 2, backoff: float = 0.5, max_backoff: float = 8.0, failure_threshold: int = 3,
+                 reset_timeout: float = 300.0, sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        # Parsing and the page cache stay the wrapped loader's
+        self.loader = loader
+        self.parser = loader.parser
+        self.page_cache = loader.page_cache
+        self.timeout = timeout
+        self.host_timeouts = host_timeouts or {}
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.sleep = sleep
+        self.clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        parsed = urlparse(url)
+        return parsed.hostname if parsed.scheme in ("http", "https") else parsed.scheme
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._breakers_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout, self.clock)
+            return self._breakers[host]
+
+    def timeout_for(self, host: str) -> float:
+        return self.host_timeouts.get(host, self.timeout)
+
+    def _delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _fetch_once(self, url: str, timeout: float) -> bytes:
+        if isinstance(self.loader, EventLoopContentLoader):
+            # Cancel the coroutine on the loader's loop, releasing its connection or browser page
+            try:
+                return self.loader._run(asyncio.wait_for(self.loader._fetch(url), timeout))
+            except asyncio.TimeoutError:
+                raise FetchTimeoutError(f"Fetching {url} took longer than {timeout}s") from None
+        # Blocking loaders can't be interrupted; stop waiting and leave the thread to finish
+        outcome = {}
+
+        def run():
+            try:
+                outcome["content"] = self.loader.fetch(url)
+            except BaseException as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=run, name="resilient-fetch", daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            raise FetchTimeoutError(f"Fetching {url} took longer than {timeout}s")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["content"]
+
+    def _check_circuit(self, host: str, breaker: CircuitBreaker, url: str):
+        if not breaker.allow():
+            raise CircuitOpenError(f"Skipping {url}: circuit open for {host} after repeated failures")
+
+    def _record_error(self, host: str, breaker: CircuitBreaker, error: BaseException):
+        if not _retryable(error):
+            # The host answered (e.g. 404): the page is at fault, not the host
+            breaker.record_success()
+        elif breaker.record_failure():
+            CIRCUIT_OPEN.inc(host)
+            logger.warning(f"Opening circuit for {host} for {self.reset_timeout:.0f}s: {error}")
+
+    def fetch(self, url: str) -> bytes:
+        host = self._host(url)
+        breaker = self.breaker(host)
+        self._check_circuit(host, breaker, url)
+        attempt = 0
+        while True:
+            try:
+                content = self._fetch_once(url, self.timeout_for(host))
+            except PageNotModified:
+                breaker.record_success()
+                raise
+            except Exception as e:
+                if attempt >= self.retries or not _retryable(e):
+                    self._record_error(host, breaker, e)
+                    raise
+                delay = self._delay(attempt)
+                attempt += 1
+                FETCH_RETRIES.inc(host)
+                logger.warning(f"Fetching {url} failed ({e}), retry {attempt}/{self.retries} in {delay:.1f}s")
+                self.sleep(delay)
+                continue
+            breaker.record_success()
+            return content
+
+    async def fetch_async(self, url: str) -> bytes:
+        host = self._host(url)
+        breaker = self.breaker(host)
+        self._check_circuit(host, breaker, url)
+        attempt = 0
+        while True:
+            try:
+                content = await asyncio.wait_for(self.loader.fetch_async(url), self.timeout_for(host))
+            except PageNotModified:
+                breaker.record_success()
+                raise
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    e = FetchTimeoutError(f"Fetching {url} took longer than {self.timeout_for(host)}s")
+                if attempt >= self.retries or not _retryable(e):
+                    self._record_error(host, breaker, e)
+                    raise e
+                delay = self._delay(attempt)
+                attempt += 1
+                FETCH_RETRIES.inc(host)
+                logger.warning(f"Fetching {url} failed ({e}), retry {attempt}/{self.retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            breaker.record_success()
+            return content
+
+    def close(self):
+        self.loader.close()
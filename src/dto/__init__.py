@@ -1,8 +1,10 @@
 # src/dto/__init__.py
 from .discount import Discount
+from .discount_record import DiscountRecord
 from .discount_url import DiscountUrl
 
 __all__ = [
     'Discount',
+    'DiscountRecord',
     'DiscountUrl'
 ] 
\ No newline at end of file
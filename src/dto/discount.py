@@ -11,3 +11,8 @@ class Discount(BaseModel):
     category: Optional[str] = None
     site: Optional[str] = None
     discount_percent: Optional[str] = None
+    # Normalized once per refresh from the strings above (see normalize_discounts)
+    currency: Optional[str] = None
+    old_price_minor: Optional[int] = None
+    new_price_minor: Optional[int] = None
+    percent_off: Optional[int] = None
@@ -0,0 +1,70 @@
+import sys
+from operator import attrgetter
+from typing import Optional
+
+from src.dto.discount import Discount
+
+# Same fields, in the same order, as the Discount model
+FIELDS = tuple(Discount.model_fields)
+_values = attrgetter(*FIELDS)
+
+
+def intern(value: Optional[str]) -> Optional[str]:
+    """The interned copy of a string, None stays None."""
+    return sys.intern(value) if value is not None else None
+
+
+class DiscountRecord:
+    """The internal form of a Discount: a plain slotted object, without validation.
+
+    Scrapers, the page cache and the refresh path handle thousands of these per
+    refresh; pydantic's validation and per-instance dict cost more than the scraping
+    around them. The field names and model_dump() match Discount, and to_model()
+    gives the pydantic model at the API boundary. Category, site and currency are
+    interned, so records loaded from the page cache share those strings too.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, product: str, url: str, image_url: Optional[str], old_price: str, new_price: str,
+                 category: Optional[str] = None, site: Optional[str] = None, discount_percent: Optional[str] = None,
+                 currency: Optional[str] = None, old_price_minor: Optional[int] = None,
+                 new_price_minor: Optional[int] = None, percent_off: Optional[int] = None):
+        self.product = product
+        self.url = url
+        self.image_url = image_url
+        self.old_price = old_price
+        self.new_price = new_price
+        self.category = intern(category)
+        self.site = intern(site)
+        self.discount_percent = discount_percent
+        self.currency = intern(currency)
+        self.old_price_minor = old_price_minor
+        self.new_price_minor = new_price_minor
+        self.percent_off = percent_off
+
+    @classmethod
+    def from_model(cls, discount: Discount) -> "DiscountRecord":
+        return cls(**discount.model_dump())
+
+    def model_dump(self) -> dict:
+        """The fields as a dict, like Discount.model_dump()."""
+        return dict(zip(FIELDS, _values(self)))
+
+    def astuple(self) -> tuple:
+        """The field values in FIELDS order; DiscountRecord(*values) builds the record again."""
+        return _values(self)
+
+    def to_model(self) -> Discount:
+        """The validated pydantic Discount, for callers outside the scraping pipeline."""
+        return Discount(**self.model_dump())
+
+    def __eq__(self, other):
+        if not isinstance(other, DiscountRecord):
+            return NotImplemented
+        return _values(self) == _values(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"DiscountRecord({', '.join(f'{field}={value!r}' for field, value in zip(FIELDS, _values(self)))})"
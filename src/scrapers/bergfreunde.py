@@ -1,38 +1,45 @@
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin, urlsplit
 
 from src.core.logging_config import logger
 from src.core.content_loader import ContentLoader
+from src.core.html_parser import HtmlNode
 from src.scrapers.discount_scraper import DiscountScraper
-from src.dto.discount import Discount
+from src.dto.discount_record import DiscountRecord
 
 class BergfreundeScraper(DiscountScraper):
     BASE_URL = "https://www.bergfreunde.eu"
+    SITE = "bergfreunde"
+    PRODUCT_SELECTOR = "li.product-item.product-fallback"
+    PAGINATION_SELECTOR = "link"
     
     def __init__(self, content_loader: ContentLoader, discount_urls=None):
         super().__init__(content_loader, discount_urls)
 
-    def extract_discounts_from_soup(self, soup: BeautifulSoup, url: str):
+    def next_page(self, soup: HtmlNode, url: str):
+        link = soup.select_one('link[rel="next"]')
+        return urljoin(url, link["href"]) if link and link.get("href") else None
+
+    def page_url(self, url: str, page: int):
+        # Listing pages are path segments: /climbing-ropes/ -> /climbing-ropes/2/
+        parts = urlsplit(url)
+        return parts._replace(path=f"{parts.path.rstrip('/')}/{page}/").geturl()
+
+    def extract_discounts_from_soup(self, soup: HtmlNode, url: str):
         discounts = []
 
         # Get product items
-        product_items = soup.select("li.product-item.product-fallback")
+        product_items = soup.select(self.PRODUCT_SELECTOR)
 
         for product in product_items:
+            # Label like "to -15%", normalized by normalize_discounts
             discount_tag = product.select_one("span.js-special-discount-percent")
-            if discount_tag:
-                raw_discount = discount_tag.get_text(strip=True).replace("to", "").replace("from", "").replace("%", "").strip()
-                # Remove any leading minus signs, then add one
-                raw_discount = raw_discount.lstrip('-')
-                discount_percent = f"-{raw_discount}" if raw_discount else ""
-            else:
-                discount_percent = ""
+            discount_percent = discount_tag.get_text(strip=True) if discount_tag else ""
 
             brand_tag = product.select_one("div.manufacturer-title")
             brand = brand_tag.get_text(strip=True) if brand_tag else ""
 
             name_tag = product.select_one("div.product-title")
-            product_name = " ".join(name_tag.stripped_strings) if name_tag else "Unknown Product"
+            product_name = name_tag.get_text(" ", strip=True) if name_tag else "Unknown Product"
 
             if brand and not product_name.lower().startswith(brand.lower()):
                 full_product_name = f"{brand} {product_name}"
@@ -51,7 +58,7 @@ class BergfreundeScraper(DiscountScraper):
             image_url = img_tag['src'] if img_tag and img_tag.has_attr('src') else None
 
             if orig_price and disc_price and product_url:
-                discounts.append(Discount(
+                discounts.append(DiscountRecord(
                     product=full_product_name,
                     url=product_url,
                     image_url=image_url,
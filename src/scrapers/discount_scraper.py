@@ -1,12 +1,61 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import List
-from bs4 import BeautifulSoup
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from src.core.config import config
+from src.core.logging_config import logger
 from src.core.content_loader import ContentLoader, HttpContentLoader, MockContentLoader
+from src.core.html_parser import HtmlNode
+from src.core.metrics import (EXTRACT_SECONDS, ITEMS_EXTRACTED, PAGES_NOT_MODIFIED, PARSE_SECONDS, SCRAPE_ERRORS,
+                              SCRAPE_FALLBACKS)
+from src.core.page_cache import PageNotModified
+from src.core.price_parser import parse_percent, parse_prices, percent_off
+from src.dto.discount_record import DiscountRecord, intern
 from src.dto.discount_url import DiscountUrl
 
 
+def normalize_discounts(discounts: List[DiscountRecord]) -> List[DiscountRecord]:
+    """Fill in the numeric price fields and the canonical "-N" discount_percent.
+
+    The discount label the shop printed wins; without one, the percent is computed
+    from the two prices.
+    """
+    old_prices = parse_prices(discount.old_price for discount in discounts)
+    new_prices = parse_prices(discount.new_price for discount in discounts)
+    for discount, old, new in zip(discounts, old_prices, new_prices):
+        percent = parse_percent(discount.discount_percent)
+        if percent is None:
+            percent = percent_off(old, new)
+        discount.currency = (new or old).currency if (new or old) else None
+        discount.old_price_minor = old.amount if old else None
+        discount.new_price_minor = new.amount if new else None
+        discount.percent_off = percent
+        discount.discount_percent = f"-{percent}" if percent is not None else ""
+    return discounts
+
+
+def query_param(url: str, name: str) -> Optional[str]:
+    """Value of a query string parameter of url, None if it is not set."""
+    return dict(parse_qsl(urlsplit(url).query)).get(name)
+
+
+def with_query_param(url: str, name: str, value) -> str:
+    """url with one query string parameter set, keeping the others."""
+    parts = urlsplit(url)
+    query = [(key, v) for key, v in parse_qsl(parts.query, keep_blank_values=True) if key != name]
+    return urlunsplit(parts._replace(query=urlencode(query + [(name, str(value))])))
+
+
 class DiscountScraper(ABC):
+    # Site name used as the metrics label
+    SITE = None
+    # Compound selector (tag.class.class) of one product container. Pages are parsed
+    # scoped to it, so extract_discounts_from_soup must only look inside these containers.
+    PRODUCT_SELECTOR = None
+    # Compound selector of the elements next_page reads, kept in scoped parses too
+    PAGINATION_SELECTOR = None
+
     def __init__(self, content_loader: ContentLoader, discount_urls: List[DiscountUrl] = None):
         """
         Initialize scraper with a content loader and category-specific URLs.
@@ -18,6 +67,10 @@ class DiscountScraper(ABC):
         self.content_loader = content_loader
         self.discount_urls = discount_urls or []
         self._urls_by_category = self._group_urls_by_category()
+        # url -> (discount dicts, next page URL) of the last page extracted without error
+        self._last_good = {}
+        # Set by the manager to parse and extract in worker processes (see ExtractionPool)
+        self.extraction_pool = None
 
     def _group_urls_by_category(self):
         urls_by_category = {}
@@ -30,10 +83,131 @@ class DiscountScraper(ABC):
         return self._urls_by_category.get(category, [])
 
     @abstractmethod
-    def extract_discounts_from_soup(self, soup: BeautifulSoup, url: str):
-        """Extract discounts from a given BeautifulSoup object."""
+    def extract_discounts_from_soup(self, soup: HtmlNode, url: str):
+        """Extract discounts from a parsed page (see src.core.html_parser for the node API)."""
         pass
 
+    def next_page(self, soup: HtmlNode, url: str) -> Optional[str]:
+        """URL of the listing page after the parsed page at url, None on the last page.
+
+        The default scrapes a single page; shops with paginated listings override it
+        (and usually page_url, so further pages can be fetched ahead).
+        """
+        return None
+
+    @classmethod
+    def is_later_page(cls, url: str) -> bool:
+        """Whether url is a listing page after the first (which may lie past the listing's end)."""
+        return False
+
+    def page_url(self, url: str, page: int) -> Optional[str]:
+        """URL of page number `page` (1-based) of the listing starting at url, None if pages can't be addressed."""
+        return None
+
+    def _scope(self) -> str:
+        if self.PAGINATION_SELECTOR is None:
+            return self.PRODUCT_SELECTOR
+        return f"{self.PRODUCT_SELECTOR}, {self.PAGINATION_SELECTOR}"
+
+    def extract_from_content(self, content, url: str) -> Tuple[List[DiscountRecord], Optional[str], float, float]:
+        """Parse a page body into its normalized discounts and next page URL, plus the parse and extract seconds."""
+        start = time.perf_counter()
+        soup = self.content_loader.parse(content, self._scope())
+        parsed = time.perf_counter()
+        discounts = normalize_discounts(self.extract_discounts_from_soup(soup, url))
+        next_url = self.next_page(soup, url)
+        return discounts, next_url, parsed - start, time.perf_counter() - parsed
+
+    def _fallback(self, url: str) -> Optional[Tuple[List, Optional[str]]]:
+        """The last good extraction of url, from this process or else the page cache; None if there is none."""
+        if url in self._last_good:
+            records, next_url = self._last_good[url]
+        elif self.content_loader.page_cache is not None and self.content_loader.page_cache.discounts(url):
+            records, next_url = self.content_loader.page_cache.discounts(url), self.content_loader.page_cache.next_page(url)
+        else:
+            return None
+        return normalize_discounts([DiscountRecord(**d) for d in records]), next_url
+
+    def _extract_page(self, content, url: str, category: str) -> Tuple[List, Optional[str]]:
+        """Turn a fetch result (page body, or the exception fetch raised) into discounts tagged with the category.
+
+        Also returns the URL of the next listing page, if there is one. When the page
+        can't be fetched or extracted, the last good extraction of the URL is used.
+        """
+        page_cache = self.content_loader.page_cache
+        site = self.SITE or type(self).__name__
+        try:
+            if isinstance(content, PageNotModified):
+                # Unchanged page: reuse the discounts extracted last time, without parsing
+                PAGES_NOT_MODIFIED.inc(site)
+                discounts = normalize_discounts([DiscountRecord(**d) for d in page_cache.discounts(url)])
+                next_url = page_cache.next_page(url)
+            elif isinstance(content, BaseException):
+                raise content
+            else:
+                if self.extraction_pool is not None:
+                    extracted = self.extraction_pool.extract(self.SITE, content, url)
+                else:
+                    extracted = self.extract_from_content(content, url)
+                discounts, next_url, parse_seconds, extract_seconds = extracted
+                PARSE_SECONDS.observe(parse_seconds, site)
+                EXTRACT_SECONDS.observe(extract_seconds, site)
+                ITEMS_EXTRACTED.observe(len(discounts), site)
+                if page_cache is not None:
+                    page_cache.store_discounts(url, [discount.model_dump() for discount in discounts], next_url)
+            self._last_good[url] = ([discount.model_dump() for discount in discounts], next_url)
+        except Exception as e:
+            # Log error but let the caller continue with other URLs
+            SCRAPE_ERRORS.inc(site, "fetch" if e is content else "extract")
+            fallback = self._fallback(url)
+            if fallback is None:
+                logger.error(f"Error extracting discounts from {url} for category {category}: {e}")
+                return [], None
+            SCRAPE_FALLBACKS.inc(site)
+            discounts, next_url = fallback
+            logger.warning(f"Error extracting discounts from {url} for category {category}: {e}; "
+                           f"serving its last good extraction ({len(discounts)} discounts)")
+        # Add category information to each discount
+        category = intern(category)
+        for discount in discounts:
+            discount.category = category
+        return discounts, next_url
+
+    def _extract_discounts(self, content, url: str, category: str) -> List:
+        """Turn a fetch result (page body, or the exception fetch raised) into discounts tagged with the category."""
+        return self._extract_page(content, url, category)[0]
+
+    def extract_page_from_url(self, url: str, category: str) -> Tuple[List, Optional[str]]:
+        """
+        Extract discounts from a single listing page.
+
+        Args:
+            url: The page to load
+            category: The category the page belongs to
+
+        Returns:
+            The page's DiscountRecord objects (empty if it could not be scraped) and the
+            URL of the next listing page (None on the last page)
+        """
+        try:
+            content = self.content_loader.fetch_measured(url)
+        except Exception as e:
+            content = e
+        return self._extract_page(content, url, category)
+
+    def extract_discounts_from_url(self, url: str, category: str) -> List:
+        """
+        Extract discounts from a single configured URL.
+        
+        Args:
+            url: The page to load
+            category: The category the page belongs to
+            
+        Returns:
+            List of DiscountRecord objects, empty if the page could not be scraped
+        """
+        return self.extract_page_from_url(url, category)[0]
+
     def extract_discounts_by_category(self, category: str) -> List:
         """
         Extract discounts for a specific category using configured URLs.
@@ -42,22 +216,28 @@ class DiscountScraper(ABC):
             category: The category name to fetch discounts for
             
         Returns:
-            List of Discount objects
+            List of DiscountRecord objects
         """
-        urls = self.get_urls_for_category(category)
         all_discounts = []
+        for url in self.get_urls_for_category(category):
+            all_discounts.extend(self.extract_discounts_from_url(url, category))
+        return all_discounts
+
+    async def extract_discounts_by_category_async(self, category: str) -> List:
+        """
+        Like extract_discounts_by_category, but fetches all URLs of the category concurrently.
         
-        for url in urls:
-            try:
-                soup = self.content_loader.get_content(url)
-                discounts = self.extract_discounts_from_soup(soup, url)
-                # Add category information to each discount
-                for discount in discounts:
-                    discount.category = category
-                all_discounts.extend(discounts)
-            except Exception as e:
-                # Log error but continue with other URLs
-                from src.core.logging_config import logger
-                logger.error(f"Error extracting discounts from {url} for category {category}: {e}")
-                
-        return all_discounts
\ No newline at end of file
+        Args:
+            category: The category name to fetch discounts for
+            
+        Returns:
+            List of DiscountRecord objects
+        """
+        urls = self.get_urls_for_category(category)
+        contents = await asyncio.gather(
+            *(self.content_loader.fetch_async(url) for url in urls), return_exceptions=True
+        )
+        all_discounts = []
+        for url, content in zip(urls, contents):
+            all_discounts.extend(self._extract_discounts(content, url, category))
+        return all_discounts
@@ -1,21 +1,31 @@
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin
 
 from src.core.logging_config import logger
 from src.core.content_loader import ContentLoader
-from src.scrapers.discount_scraper import DiscountScraper
-from src.dto.discount import Discount
-import re
+from src.core.html_parser import HtmlNode
+from src.scrapers.discount_scraper import DiscountScraper, with_query_param
+from src.dto.discount_record import DiscountRecord
 
 class FourCampingScraper(DiscountScraper):
     BASE_URL = "https://www.4camping.hu"
+    SITE = "4camping"
+    PRODUCT_SELECTOR = ".product-card__inner"
+    PAGINATION_SELECTOR = "link"
     
     def __init__(self, content_loader: ContentLoader, discount_urls=None):
         super().__init__(content_loader, discount_urls)
 
-    def extract_discounts_from_soup(self, soup: BeautifulSoup, url: str):
+    def next_page(self, soup: HtmlNode, url: str):
+        link = soup.select_one('link[rel="next"]')
+        return urljoin(url, link["href"]) if link and link.get("href") else None
+
+    def page_url(self, url: str, page: int):
+        return with_query_param(url, "p", page)
+
+    def extract_discounts_from_soup(self, soup: HtmlNode, url: str):
         discounts = []
 
-        for card in soup.select(".product-card__inner"):
+        for card in soup.select(self.PRODUCT_SELECTOR):
             old_price_tag = card.select_one(".card-price__discount del")
             if not old_price_tag:
                 continue
@@ -46,29 +56,11 @@ class FourCampingScraper(DiscountScraper):
             new_price_tag = card.select_one(".card-price__full strong")
             new_price = new_price_tag.get_text(strip=True) if new_price_tag else ""
 
-            # Extract discount percentage
+            # Discount label, normalized by normalize_discounts (which falls back to the prices)
             discount_tag = card.select_one(".card-price__discount .card-price__discount-percent")
-            if discount_tag:
-                raw_discount = discount_tag.get_text(strip=True).replace("%", "").strip()
-                raw_discount = raw_discount.lstrip('-')
-                discount_percent = f"-{raw_discount}" if raw_discount else ""
-            else:
-                discount_percent = ""
-            
-            # If no discount percent tag found, try to calculate from prices
-            if not discount_percent and old_price and new_price:
-                try:
-                    # Extract numbers from price strings (remove currency symbols and spaces)
-                    old_num = float(re.sub(r'[^\d,.]', '', old_price).replace(',', '.'))
-                    new_num = float(re.sub(r'[^\d,.]', '', new_price).replace(',', '.'))
-                    if old_num > 0:
-                        calc_discount = str(int(((old_num - new_num) / old_num) * 100))
-                        calc_discount = calc_discount.lstrip('-')
-                        discount_percent = f"-{calc_discount}" if calc_discount else ""
-                except (ValueError, ZeroDivisionError):
-                    discount_percent = ""
+            discount_percent = discount_tag.get_text(strip=True) if discount_tag else ""
 
-            discount = Discount(
+            discount = DiscountRecord(
                 product=full_name,
                 url=product_url,
                 image_url=image_url,
@@ -1,20 +1,34 @@
+import re
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
 
 from src.core.logging_config import logger
 from src.core.content_loader import ContentLoader
-from src.scrapers.discount_scraper import DiscountScraper
-from src.dto.discount import Discount
-import re
+from src.core.html_parser import HtmlNode
+from src.scrapers.discount_scraper import DiscountScraper, query_param, with_query_param
+from src.dto.discount_record import DiscountRecord
 
 class MaszasScraper(DiscountScraper):
     BASE_URL = "https://www.maszas.hu"
+    SITE = "maszas"
+    PRODUCT_SELECTOR = "div.product-snapshot.list_div_item"
+    PAGINATION_SELECTOR = "div.pagination"
 
     def __init__(self, content_loader: ContentLoader, discount_urls=None):
         super().__init__(content_loader, discount_urls)
 
-    def extract_discounts_from_soup(self, soup: BeautifulSoup, url: str):
-        products = soup.select("div.product-snapshot.list_div_item")
+    def next_page(self, soup: HtmlNode, url: str):
+        # The results line reads "26 - 50 / 73 termék"; more follow unless it ends at the total
+        results = soup.select_one("div.pagination div.results")
+        shown = re.search(r"(\d+)\s*-\s*(\d+)\s*/\s*(\d+)", results.get_text(" ", strip=True)) if results else None
+        if not shown or int(shown.group(2)) >= int(shown.group(3)):
+            return None
+        return self.page_url(url, int(query_param(url, "page") or 1) + 1)
+
+    def page_url(self, url: str, page: int):
+        return with_query_param(url, "page", page)
+
+    def extract_discounts_from_soup(self, soup: HtmlNode, url: str):
+        products = soup.select(self.PRODUCT_SELECTOR)
         discounts = []
 
         for product in products:
@@ -40,31 +54,18 @@ class MaszasScraper(DiscountScraper):
                 if image_src:
                     image_url = urljoin(self.BASE_URL, image_src)
 
-            discount_percent = ""
-            if original_price and discounted_price:
-                try:
-                    old_num = float(re.sub(r'[^0-9,.]', '', original_price).replace(',', '.'))
-                    new_num = float(re.sub(r'[^0-9,.]', '', discounted_price).replace(',', '.'))
-                    if old_num > 0:
-                        calc_discount = str(int(((old_num - new_num) / old_num) * 100))
-                        calc_discount = calc_discount.lstrip('-')
-                        discount_percent = f"-{calc_discount}" if calc_discount else ""
-                except (ValueError, ZeroDivisionError):
-                    discount_percent = ""
-            
             if not all([name, original_price, discounted_price, product_url]):
                 logger.warning(f"Could not extract all details for a product on {url}")
                 continue
 
             discounts.append(
-                Discount(
+                DiscountRecord(
                     product=name,
                     url=product_url,
                     image_url=image_url,
                     old_price=original_price,
                     new_price=discounted_price,
-                    category=None,
-                    discount_percent=discount_percent
+                    category=None,  # discount_percent is computed from the prices by normalize_discounts
                 )
             )
         logger.info(f"[MaszasScraper] Found {len(discounts)} discounts.")
@@ -1,40 +1,53 @@
 import time
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
 
 from src.core.config import config
 from src.core.logging_config import logger
 from src.core.content_loader import ContentLoader
-from src.scrapers.discount_scraper import DiscountScraper
-from src.dto.discount import Discount
+from src.core.html_parser import HtmlNode
+from src.scrapers.discount_scraper import DiscountScraper, query_param, with_query_param
+from src.dto.discount_record import DiscountRecord
 
 class MountexScraper(DiscountScraper):
     BASE_URL = "https://www.mountex.hu"
+    SITE = "mountex"
+    PRODUCT_SELECTOR = "div.bg-white.rounded-16"
     
     def __init__(self, content_loader: ContentLoader, discount_urls=None):
         super().__init__(content_loader, discount_urls)
 
-    def extract_discounts_from_soup(self, soup: BeautifulSoup, url: str):
+    def next_page(self, soup: HtmlNode, url: str):
+        # The rendered listing carries no pagination markup: keep paging while pages
+        # show products, and let the crawl stop at the first page that adds no
+        # discounts it hasn't seen (past the last page, Mountex renders no products;
+        # see is_later_page)
+        if not soup.select_one(self.PRODUCT_SELECTOR):
+            return None
+        return self.page_url(url, int(query_param(url, "page") or 1) + 1)
+
+    @classmethod
+    def is_later_page(cls, url: str) -> bool:
+        return int(query_param(url, "page") or 1) > 1
+
+    def page_url(self, url: str, page: int):
+        return with_query_param(url, "page", page)
+
+    def extract_discounts_from_soup(self, soup: HtmlNode, url: str):
         discounts = []
         
         # Get product items
-        products = soup.select("div.bg-white.rounded-16")
+        products = soup.select(self.PRODUCT_SELECTOR)
         
         for product in products:
             discount_tag = product.select_one("span.bg-brand-highlight")
-            if discount_tag:
-                raw_discount = discount_tag.get_text(strip=True).replace("%", "").strip()
-                raw_discount = raw_discount.lstrip('-')
-                discount_percent = f"-{raw_discount}" if raw_discount else ""
-            else:
-                discount_percent = ""
+            discount_percent = discount_tag.get_text(strip=True) if discount_tag else ""
             name_link = product.select_one("a.text-black.unstyled")
             brand = ""
             product_name = ""
             if name_link:
                 brand_tag = name_link.select_one("div.font-bold.font-lora")
                 brand = brand_tag.get_text(strip=True) if brand_tag else ""
-                name_divs = name_link.find_all("div")
+                name_divs = name_link.select("div")
                 if len(name_divs) > 1:
                     product_name = name_divs[1].get_text(strip=True)
                 else:
@@ -51,7 +64,7 @@ class MountexScraper(DiscountScraper):
             product_url = urljoin("https://mountex.hu", name_link["href"]) if name_link and name_link.has_attr("href") else None
 
             if orig_price and disc_price and product_url:
-                discounts.append(Discount(
+                discounts.append(DiscountRecord(
                     product=f"{brand} {product_name}".strip(),
                     url=product_url,
                     image_url=image_url,
@@ -3,10 +3,22 @@ Services package for the climbing gear discount aggregator.
 Contains the service layer logic for fetching and managing discounts.
 """
 
-from .discount_service import fetch_discounts_for_category, fetch_all_discounts, refresh_discounts_job
+from .discount_service import fetch_discounts_for_category, fetch_all_discounts, refresh_discounts_job, refresh_slice_job, get_refresh_slices, discount_store, is_refresher
+from .refresh_schedule import RefreshSchedule
+from .discount_store import DiscountStore, DiscountSnapshot, DiscountChange
+from .product_matcher import ProductMatcher
 
 __all__ = [
     'fetch_discounts_for_category',
     'fetch_all_discounts',
     'refresh_discounts_job',
+    'refresh_slice_job',
+    'get_refresh_slices',
+    'RefreshSchedule',
+    'discount_store',
+    'is_refresher',
+    'DiscountStore',
+    'DiscountSnapshot',
+    'DiscountChange',
+    'ProductMatcher',
 ] 
\ No newline at end of file
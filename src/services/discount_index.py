@@ -0,0 +1,90 @@
+from bisect import bisect_right
+from itertools import chain, islice
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.core.price_parser import Price
+
+SORTS = ("discount", "price", "site")
+
+
+def _discount_key(record: dict) -> int:
+    return record.get('percent_off') or 0
+
+
+class _Sorted:
+    """Records in one order, with the ascending keys a range filter bisects on."""
+
+    def __init__(self, records: Sequence[dict], key):
+        self.records = tuple(sorted(records, key=key))
+        self.keys = [key(record) for record in self.records]
+
+    def up_to(self, bound) -> Tuple[dict, ...]:
+        """Prefix of the records whose key is <= bound."""
+        return self.records[:bisect_right(self.keys, bound)]
+
+
+class CategoryIndex:
+    """Sorted arrays over one category's discounts, built once per snapshot.
+
+    A query picks the array of the requested order, bisects it on the filter that
+    order is keyed by, and checks any other filter only while walking to the
+    requested page.
+    """
+
+    def __init__(self, records: Sequence[dict], by_site: bool = True):
+        # Best discount first; keys negated to keep them ascending for bisect
+        self._by_discount = _Sorted(records, key=lambda d: -_discount_key(d))
+        # Cheapest first, one array per currency (prices in different currencies don't compare)
+        by_currency = {}
+        for record in records:
+            by_currency.setdefault(record.get('currency'), []).append(record)
+        self._by_price = {
+            currency: _Sorted(currency_records, key=lambda d: d.get('new_price_minor') or 0)
+            for currency, currency_records in sorted(by_currency.items(), key=lambda item: item[0] or "")
+        }
+        self._by_site_order = tuple(sorted(self._by_discount.records, key=lambda d: (d.get('site') or "").lower()))
+        self._sites: Dict[str, CategoryIndex] = {}
+        if by_site:
+            sites = {}
+            for record in self._by_discount.records:
+                sites.setdefault((record.get('site') or "").lower(), []).append(record)
+            self._sites = {site: CategoryIndex(site_records, by_site=False) for site, site_records in sites.items()}
+
+    def query(self, sort: str = "discount", min_discount: Optional[int] = None, site: Optional[str] = None,
+              max_price: Optional[Price] = None, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        """One page of discounts matching all given filters, in the given order.
+
+        max_price applies to prices in its currency; without a currency it bounds the
+        amount in every currency.
+        """
+        if sort not in SORTS:
+            raise ValueError(f"Unknown sort {sort!r}, expected one of {', '.join(SORTS)}")
+        if site is not None:
+            index = self._sites.get(site.lower())
+            if index is None:
+                return []
+            return index.query(sort, min_discount, None, max_price, offset, limit)
+
+        candidates: Iterable[dict]
+        if sort == "discount":
+            candidates = self._by_discount.up_to(-min_discount) if min_discount is not None else self._by_discount.records
+            min_discount = None
+        elif sort == "price":
+            views = list(self._by_price.values())
+            if max_price is not None:
+                if max_price.currency is not None:
+                    views = [self._by_price[max_price.currency]] if max_price.currency in self._by_price else []
+                bound, max_price = max_price.amount, None
+                candidates = chain.from_iterable(view.up_to(bound) for view in views)
+            else:
+                candidates = chain.from_iterable(view.records for view in views)
+        else:
+            candidates = self._by_site_order
+
+        if min_discount is not None:
+            candidates = (d for d in candidates if _discount_key(d) >= min_discount)
+        if max_price is not None:
+            candidates = (d for d in candidates
+                          if d.get('new_price_minor') is not None and d['new_price_minor'] <= max_price.amount
+                          and max_price.currency in (None, d.get('currency')))
+        return list(islice(candidates, offset, None if limit is None else offset + limit))
@@ -1,71 +1,147 @@
-import concurrent.futures
-from typing import List, Dict, Any
+import sqlite3
+import time
+from typing import List, Dict, Any, Tuple, Optional
 
 from src.core.config import config
 from src.core.logging_config import logger
+from src.core.metrics import REFRESH_SECONDS, SCRAPE_ERRORS, refresh_registry, registry
 from src.dto.discount import Discount
+from src.dto.discount_record import DiscountRecord, intern
+from src.services.discount_store import DiscountChange, DiscountStore
+from src.services.price_history import PriceHistory
+from src.services.product_matcher import ProductMatcher
+from src.services.shared_snapshot import RefresherLock, SnapshotStorage
+
+# Load categories at module level
+CATEGORIES = config.get_categories()
+
+def _storage_path(key: str) -> Optional[str]:
+    """Absolute path of a storage setting, or None if it is not configured."""
+    path = config.get_storage_settings().get(key)
+    if not path:
+        return None
+    return config.get_data_path(path)
 
 # Global instances
-ALL_DISCOUNTS = {}
 DISCOUNTS_LOADED = False
+# Without a snapshot_path, snapshots stay in-process; without a history_dir, no history is kept
+SNAPSHOT_PATH = _storage_path('snapshot_path')
+HISTORY_DIR = _storage_path('history_dir')
+snapshot_storage = SnapshotStorage(SNAPSHOT_PATH) if SNAPSHOT_PATH else None
+discount_store = DiscountStore(CATEGORIES.keys(), storage=snapshot_storage,
+                               matcher=ProductMatcher(config.get_matching_settings()))
+refresher_lock = RefresherLock(f"{SNAPSHOT_PATH}.lock") if SNAPSHOT_PATH else None
+price_history = PriceHistory(HISTORY_DIR) if HISTORY_DIR else None
 
-# Load categories at module level
-CATEGORIES = config.get_categories()
+def is_refresher() -> bool:
+    """Whether this process refreshes discounts; tries to take over if no process does."""
+    return refresher_lock is None or refresher_lock.try_acquire()
 
-# Public API methods
-def fetch_discounts_for_category(category: str) -> List[Discount]:
-    """Fetch discounts for a specific category from all scrapers."""
-    from src.core.manager import ScraperManager
-    scraper_manager = ScraperManager()
-    scrapers = scraper_manager.get_scrapers()
-    
-    all_discounts = []
-    
-    for site_name, scraper in scrapers.items():
+def is_refresher_process() -> bool:
+    """Whether this process is the refresher, without trying to become it."""
+    return refresher_lock is None or refresher_lock.held
+
+def _snapshot_age() -> Optional[float]:
+    created_at = discount_store.snapshot.created_at
+    return time.time() - created_at if created_at is not None else None
+
+registry.gauge("discounts_snapshot_age_seconds", "Seconds since the served snapshot was published",
+               function=_snapshot_age)
+registry.gauge("discounts_snapshot_version", "Version of the served snapshot",
+               function=lambda: discount_store.snapshot.version)
+
+def _share_metrics():
+    """Store the refresh metrics next to the snapshot, for the processes that don't refresh."""
+    if snapshot_storage is not None:
         try:
-            discounts = scraper.extract_discounts_by_category(category)
-            # Add site information to each discount
-            for discount in discounts:
-                discount.site = site_name.capitalize()
-            all_discounts.extend(discounts)
-        except Exception as e:
-            logger.error(f"Error fetching discounts from {site_name} for category {category}: {e}")
-    
-    all_discounts.sort(key=lambda d: d.discount_percent, reverse=True)
+            snapshot_storage.set_meta("metrics", refresh_registry.render())
+        except sqlite3.Error as e:
+            logger.error(f"Error sharing refresh metrics: {e}")
+
+def render_metrics() -> str:
+    """Prometheus text of this process's metrics and the refresher's scrape and refresh metrics."""
+    if is_refresher_process():
+        return registry.render() + refresh_registry.render()
+    try:
+        shared = snapshot_storage.get_meta("metrics") or ""
+    except sqlite3.Error as e:
+        logger.error(f"Error reading refresh metrics: {e}")
+        shared = ""
+    return registry.render() + shared
+
+def _fetch_slices(categories, sites=None) -> Dict[Tuple[str, str], List[DiscountRecord]]:
+    """Fetch discounts keyed by (category, site), with site information added to each discount."""
+    from src.core.manager import get_scraper_manager
+    discounts_by_slice = get_scraper_manager().fetch_discounts(categories, sites)
+    for (_, site_name), discounts in discounts_by_slice.items():
+        site = intern(site_name.capitalize())
+        for discount in discounts:
+            discount.site = site
+    return discounts_by_slice
+
+def _group_by_category(discounts_by_slice: Dict[Tuple[str, str], List[DiscountRecord]], categories) -> Dict[str, List[DiscountRecord]]:
+    """Merge (category, site) slices into per-category lists sorted by discount."""
+    all_discounts = {cat: [] for cat in categories}
+    for (category, _), discounts in discounts_by_slice.items():
+        all_discounts[category].extend(discounts)
+    for discounts in all_discounts.values():
+        discounts.sort(key=lambda d: d.percent_off or 0, reverse=True)
     return all_discounts
 
+# Public API methods: scraping works on DiscountRecords, callers get validated Discount models
+def fetch_discounts_for_category(category: str) -> List[Discount]:
+    """Fetch discounts for a specific category from all scrapers."""
+    discounts = _group_by_category(_fetch_slices([category]), [category])[category]
+    return [discount.to_model() for discount in discounts]
+
 def fetch_all_discounts() -> Dict[str, List[Discount]]:
-    """Fetch all discounts using the new category-based architecture."""
+    """Fetch all discounts, scheduling every site, category and URL as one batch of jobs."""
     categories = config.get_categories()
-    all_discounts = {cat: [] for cat in categories.keys()}
-
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        future_to_category = {
-            executor.submit(fetch_discounts_for_category, category): category
-            for category in categories.keys()
-        }
-
-        for future in concurrent.futures.as_completed(future_to_category):
-            category = future_to_category[future]
-            try:
-                discounts = future.result()
-                all_discounts[category].extend(discounts)
-            except Exception as e:
-                logger.error(f"Error processing category {category}: {e}")
-    
-    return all_discounts
+    all_discounts = _group_by_category(_fetch_slices(categories.keys()), categories.keys())
+    return {category: [discount.to_model() for discount in discounts] for category, discounts in all_discounts.items()}
+
+def _publish(discounts_by_slice: Dict[Tuple[str, str], List[DiscountRecord]]) -> List[DiscountChange]:
+    """Publish refreshed slices to the global cache and record their prices in the history."""
+    changes = discount_store.publish(discounts_by_slice)
+    if price_history is not None:
+        try:
+            price_history.append(discount for discounts in discounts_by_slice.values() for discount in discounts)
+        except OSError as e:
+            logger.error(f"Error recording price history: {e}")
+    return changes
 
 def refresh_discounts_job():
-    """Refresh all discounts and update the global cache."""
-    global ALL_DISCOUNTS
-    discounts = fetch_all_discounts()
-    
-    # Convert Discount objects to dictionaries for the cache
-    discounts_dict = {}
-    for category, discount_list in discounts.items():
-        discounts_dict[category] = [discount.model_dump() for discount in discount_list]
-    
-    ALL_DISCOUNTS.clear()
-    ALL_DISCOUNTS.update(discounts_dict)
-    
-    logger.info(f"Discounts refreshed for {len(discounts)} categories.")
\ No newline at end of file
+    """Refresh all discounts and publish them as a new snapshot of the global cache."""
+    with REFRESH_SECONDS.time("all"):
+        changes = _publish(_fetch_slices(CATEGORIES.keys()))
+    _share_metrics()
+    added = sum(len(change.added) for change in changes)
+    removed = sum(len(change.removed) for change in changes)
+    changed = sum(len(change.changed) for change in changes)
+    logger.info(f"Discounts refreshed for {len(CATEGORIES)} categories "
+                f"(snapshot {discount_store.snapshot.version}: {added} added, {removed} removed, {changed} changed).")
+
+def get_refresh_slices() -> List[Tuple[str, str]]:
+    """Every (category, site) pair that has URLs configured."""
+    from src.core.manager import get_scraper_manager
+    jobs = get_scraper_manager().plan_jobs(CATEGORIES.keys())
+    return list(dict.fromkeys((job.category, job.site) for job in jobs))
+
+def _scrape_errors(site: str) -> float:
+    return sum(SCRAPE_ERRORS.value(site, stage) for stage in ("fetch", "extract"))
+
+def refresh_slice_job(category: str, site: str) -> Tuple[List[DiscountChange], bool]:
+    """Refresh one (category, site) slice of the global cache.
+
+    Returns what changed, and whether any of the slice's pages failed (and so was
+    left out or served from its last good extraction).
+    """
+    errors = _scrape_errors(site)
+    with REFRESH_SECONDS.time("slice"):
+        changes = _publish(_fetch_slices([category], [site]))
+    # Counted per site, so a failure in a concurrent refresh of the site's other slices counts here too
+    failed = _scrape_errors(site) > errors
+    _share_metrics()
+    logger.info(f"Refreshed {site} {category} (snapshot {discount_store.snapshot.version}: "
+                f"{'changed' if changes else 'unchanged'}{', with errors' if failed else ''}).")
+    return changes, failed
@@ -0,0 +1,234 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.core.logging_config import logger
+from src.dto.discount_record import DiscountRecord
+from src.services.discount_index import CategoryIndex
+from src.services.json_payload import JsonPayload
+from src.services.product_matcher import ProductMatcher
+from src.services.search_index import SearchIndex
+from src.services.shared_snapshot import SnapshotStorage
+
+
+class DiscountChange(NamedTuple):
+    """What one publish changed in one (category, site) slice, by product URL."""
+    version: int
+    category: str
+    site: str
+    added: Tuple[str, ...]
+    removed: Tuple[str, ...]
+    changed: Tuple[str, ...]
+
+
+class DiscountSnapshot:
+    """Immutable view of the published discounts.
+
+    Discounts are held as dicts, one tuple per (category, site) slice, plus a merged
+    list per category sorted by discount, a CategoryIndex for filtered queries, the
+    offers of products sold by several shops and a full-text SearchIndex over all of
+    them. A snapshot is never modified after it is built, so readers can keep using
+    one while a newer one is published. Each
+    category's JSON payload is serialized at most once per snapshot, and carried over
+    from the previous snapshot when the category did not change.
+    """
+
+    def __init__(self, slices: Dict[Tuple[str, str], Tuple[dict, ...]], categories: Iterable[str],
+                 version: int = 0, created_at: Optional[float] = None, previous: "DiscountSnapshot" = None,
+                 matcher: Optional[ProductMatcher] = None):
+        self.slices = MappingProxyType(slices)
+        self.version = version
+        self.created_at = created_at
+        by_category = {category: [] for category in categories}
+        for (category, _), discounts in slices.items():
+            by_category.setdefault(category, []).extend(discounts)
+        for discounts in by_category.values():
+            discounts.sort(key=lambda d: d.get('percent_off') or 0, reverse=True)
+        self._by_category = MappingProxyType({category: tuple(d) for category, d in by_category.items()})
+        self._payloads = {}
+        self._indexes = {}
+        self._offers = {}
+        matcher = matcher or ProductMatcher()
+        for category, discounts in self._by_category.items():
+            if previous is not None and previous.get(category) == discounts:
+                self._indexes[category] = previous._indexes[category]
+                self._offers[category] = previous._offers[category]
+                if category in previous._payloads:
+                    self._payloads[category] = previous._payloads[category]
+            else:
+                self._indexes[category] = CategoryIndex(discounts)
+                self._offers[category] = matcher.group_offers(discounts)
+        if previous is not None and all(previous.get(category) == discounts
+                                        for category, discounts in self._by_category.items()):
+            self._search = previous._search
+        else:
+            self._search = SearchIndex([d for discounts in self._by_category.values() for d in discounts])
+
+    def get(self, category: str) -> Optional[Tuple[dict, ...]]:
+        """Discounts of a category, best first; None for an unknown category."""
+        return self._by_category.get(category)
+
+    def payload(self, category: str) -> Optional[JsonPayload]:
+        """Pre-serialized JSON of get(category); None for an unknown category."""
+        if category not in self._by_category:
+            return None
+        if category not in self._payloads:
+            # Racing readers may both serialize; either result is equivalent
+            self._payloads[category] = JsonPayload(self._by_category[category])
+        return self._payloads[category]
+
+    def index(self, category: str) -> Optional[CategoryIndex]:
+        """Sorted arrays for filtered and paginated queries; None for an unknown category."""
+        return self._indexes.get(category)
+
+    def search(self, query: str, limit: int = 20, category: Optional[str] = None) -> List[Tuple[float, dict]]:
+        """Best (score, discount) pairs for a full-text query over every category, or one."""
+        return self._search.search(query, limit, category)
+
+    def offers(self, category: str) -> Optional[Tuple[dict, ...]]:
+        """Products sold by several shops, each as {'product', 'offers'} with the cheapest offer first."""
+        return self._offers.get(category)
+
+    def categories(self) -> List[str]:
+        return list(self._by_category)
+
+
+class DiscountStore:
+    """Holds the current DiscountSnapshot and publishes new ones by diffing slices.
+
+    publish replaces only the slices it is given and swaps in the new snapshot with a
+    single reference assignment, so readers never see a partially built or empty cache.
+
+    With a SnapshotStorage, every publish is also written to the shared file, and the
+    store adopts snapshots published by other processes. A background thread, started
+    by the first read in each process, checks the stored version every sync_interval
+    seconds and builds the new snapshot (indexes included), so requests only ever read
+    the current reference. A publish that could not be written stays current in memory
+    and is written again on the next sync, rather than being replaced by the older
+    stored snapshot.
+    """
+
+    def __init__(self, categories: Iterable[str], change_log_size: int = 1000,
+                 storage: Optional[SnapshotStorage] = None, sync_interval: float = 1.0,
+                 matcher: Optional[ProductMatcher] = None):
+        self._matcher = matcher or ProductMatcher()
+        self._snapshot = DiscountSnapshot({}, categories, matcher=self._matcher)
+        self._changes = deque(maxlen=change_log_size)
+        self._lock = threading.Lock()
+        self._storage = storage
+        self._sync_interval = sync_interval
+        # Process whose sync thread is running (a forked worker starts its own)
+        self._sync_pid = None
+        self._closed = threading.Event()
+        # Slices and changes published here but not yet written to the storage
+        self._unsaved_slices = set()
+        self._unsaved_changes = []
+
+    @property
+    def snapshot(self) -> DiscountSnapshot:
+        if self._storage is not None and self._sync_pid != os.getpid():
+            self._start_syncing()
+        return self._snapshot
+
+    def _start_syncing(self):
+        with self._lock:
+            if self._sync_pid == os.getpid():
+                return
+            self._sync_pid = os.getpid()
+            # Serve the stored snapshot from the first read on
+            self._sync()
+        threading.Thread(target=self._sync_loop, name="snapshot-sync", daemon=True).start()
+
+    def _sync_loop(self):
+        while not self._closed.wait(self._sync_interval):
+            self.sync()
+
+    def sync(self):
+        """Adopt a newer snapshot from the shared storage, or write our unwritten publish to it."""
+        if self._storage is not None:
+            with self._lock:
+                self._sync()
+
+    def close(self):
+        """Stop the background sync."""
+        self._closed.set()
+
+    def _sync(self):
+        """Adopt a newer snapshot from the shared storage; the caller holds the lock."""
+        try:
+            stored_version = self._storage.version()
+            if stored_version == self._snapshot.version:
+                return
+            if self._unsaved_changes or self._unsaved_slices:
+                if stored_version < self._snapshot.version:
+                    self._save()
+                    return
+                logger.warning(f"Shared snapshot {self._storage.path} moved on to version {stored_version}, "
+                               f"dropping unwritten version {self._snapshot.version}")
+            version, created_at, slices = self._storage.load()
+        except sqlite3.Error as e:
+            logger.error(f"Error syncing shared snapshot {self._storage.path}: {e}")
+            return
+        self._unsaved_slices.clear()
+        self._unsaved_changes.clear()
+        self._snapshot = DiscountSnapshot(slices, self._snapshot.categories(), version, created_at,
+                                          previous=self._snapshot, matcher=self._matcher)
+
+    def publish(self, discounts_by_slice: Dict[Tuple[str, str], List[DiscountRecord]]) -> List[DiscountChange]:
+        """Publish fresh discounts for the given (category, site) slices and return what changed."""
+        with self._lock:
+            if self._storage is not None:
+                # Diff against the latest published snapshot, whichever process wrote it
+                self._sync()
+            old = self._snapshot
+            version = old.version + 1
+            slices = dict(old.slices)
+            changes = []
+            for (category, site), discounts in discounts_by_slice.items():
+                previous_by_url = {d['url']: d for d in old.slices.get((category, site), ())}
+                records, added, changed = [], [], []
+                for discount in discounts:
+                    record = discount.model_dump()
+                    previous = previous_by_url.get(record['url'])
+                    if previous is None:
+                        added.append(record['url'])
+                    elif previous != record:
+                        changed.append(record['url'])
+                    else:
+                        # Unchanged: keep sharing the already published dict
+                        record = previous
+                    records.append(record)
+                removed = previous_by_url.keys() - {record['url'] for record in records}
+                slices[(category, site)] = tuple(records)
+                if added or removed or changed:
+                    changes.append(DiscountChange(version, category, site, tuple(added), tuple(sorted(removed)), tuple(changed)))
+            self._snapshot = DiscountSnapshot(slices, old.categories(), version, time.time(), previous=old,
+                                              matcher=self._matcher)
+            self._changes.extend(changes)
+            if self._storage is not None:
+                self._unsaved_slices.update(discounts_by_slice)
+                self._unsaved_changes.extend(changes)
+                try:
+                    self._save()
+                except sqlite3.Error as e:
+                    logger.error(f"Error writing shared snapshot {self._storage.path}, "
+                                 f"will retry version {version}: {e}")
+        return changes
+
+    def _save(self):
+        """Write the current snapshot's unwritten slices and changes; the caller holds the lock."""
+        snapshot = self._snapshot
+        slices = {key: snapshot.slices[key] for key in self._unsaved_slices}
+        self._storage.save(snapshot.version, snapshot.created_at, slices, self._unsaved_changes)
+        self._unsaved_slices.clear()
+        self._unsaved_changes.clear()
+
+    def changes_since(self, version: int) -> List[DiscountChange]:
+        """Changes published after the given snapshot version (bounded by the change log size)."""
+        if self._storage is not None:
+            return [DiscountChange(*row) for row in self._storage.changes_since(version)]
+        return [change for change in list(self._changes) if change.version > version]
@@ -0,0 +1,50 @@
+import gzip
+import hashlib
+import importlib.util
+import json
+from typing import Optional, Sequence
+
+# Optional faster encoder and brotli support; fall back to the standard library
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+
+    def _dumps(data) -> bytes:
+        return orjson.dumps(data)
+else:
+    def _dumps(data) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+if importlib.util.find_spec("brotli") is not None:
+    import brotli
+else:
+    brotli = None
+
+
+class JsonPayload:
+    """A JSON response body serialized once, with pre-compressed variants and ETags.
+
+    Each encoding gets its own strong ETag, derived from the hash of the JSON body.
+    """
+    ENCODINGS = ("br", "gzip")
+
+    def __init__(self, data: Sequence):
+        self.body = _dumps(list(data))
+        self._digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self._encoded = {"gzip": gzip.compress(self.body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self._encoded["br"] = brotli.compress(self.body)
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        """The body in the given content encoding (None for identity)."""
+        return self._encoded[encoding] if encoding else self.body
+
+    def etag(self, encoding: Optional[str]) -> str:
+        """Strong ETag (unquoted) of the body in the given encoding."""
+        return f"{self._digest}-{encoding}" if encoding else self._digest
+
+    def negotiate(self, accept_encodings) -> Optional[str]:
+        """Best available encoding for a werkzeug Accept-Encoding header, None for identity."""
+        for encoding in self.ENCODINGS:
+            if encoding in self._encoded and accept_encodings[encoding]:
+                return encoding
+        return None
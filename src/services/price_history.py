@@ -0,0 +1,204 @@
+import os
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.dto.discount_record import DiscountRecord
+
+# (name, array typecode) of each column file; rows are aligned across columns
+COLUMNS = (
+    ("timestamp", "I"),
+    ("product_id", "I"),
+    ("new_price_minor", "q"),
+    ("old_price_minor", "q"),
+    ("percent_off", "h"),
+    ("currency", "B"),
+)
+# Stands for a missing price or percent in the integer columns
+MISSING = -1
+# Currency column codes; unknown currencies are stored as 0
+CURRENCIES = (None, "HUF", "EUR")
+DAY = 86400
+
+
+class PricePoint(NamedTuple):
+    """A product's prices as seen by one refresh."""
+    timestamp: int
+    new_price_minor: Optional[int]
+    old_price_minor: Optional[int]
+    currency: Optional[str]
+    percent_off: Optional[int]
+
+
+def _day(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+
+
+class _Partition:
+    """One day of rows, loaded column by column, with each product's row numbers."""
+
+    def __init__(self, directory: str):
+        self.sizes = _column_sizes(directory)
+        columns = {}
+        for name, typecode in COLUMNS:
+            column = array(typecode)
+            path = os.path.join(directory, name)
+            data = b""
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    data = f.read()
+            column.frombytes(data[:len(data) - len(data) % column.itemsize])
+            columns[name] = column
+        # A refresh interrupted mid-append leaves some columns longer; ignore the ragged tail
+        self.rows = min(len(column) for column in columns.values())
+        self.columns = columns
+        self.rows_by_product: Dict[int, List[int]] = {}
+        product_ids = columns["product_id"]
+        for row in range(self.rows):
+            self.rows_by_product.setdefault(product_ids[row], []).append(row)
+
+    def point(self, row: int) -> PricePoint:
+        c = self.columns
+        new, old, percent = c["new_price_minor"][row], c["old_price_minor"][row], c["percent_off"][row]
+        return PricePoint(c["timestamp"][row], None if new == MISSING else new, None if old == MISSING else old,
+                          CURRENCIES[c["currency"][row]], None if percent == MISSING else percent)
+
+
+def _column_sizes(directory: str) -> Tuple[int, ...]:
+    paths = (os.path.join(directory, name) for name, _ in COLUMNS)
+    return tuple(os.path.getsize(path) if os.path.exists(path) else 0 for path in paths)
+
+
+def _align_columns(directory: str):
+    """Cut every column back to the rows all columns hold, dropping the ragged tail of an interrupted append."""
+    itemsizes = [array(typecode).itemsize for _, typecode in COLUMNS]
+    sizes = _column_sizes(directory)
+    rows = min(size // itemsize for size, itemsize in zip(sizes, itemsizes))
+    for (name, _), size, itemsize in zip(COLUMNS, sizes, itemsizes):
+        if size != rows * itemsize:
+            os.truncate(os.path.join(directory, name), rows * itemsize)
+
+
+def _truncate_to_last_line(path: str):
+    """Drop a partial last line (an interrupted append), so the next line starts on its own."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - 4096)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            f.truncate(position)
+
+
+class PriceHistory:
+    """Append-only price history on disk, one directory of column files per UTC day.
+
+    Products are dictionary-encoded: products.txt holds one URL per line and rows
+    store the line number. Each refresh appends one row per discount to the day's
+    columns (about 30 bytes a row). Loaded days are kept in memory with a per-product
+    row index, and reloaded only when their files grow, so past days are read once.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._products_path = os.path.join(directory, "products.txt")
+        self._product_ids: Dict[str, int] = {}
+        self._products_read = 0
+        self._partitions: Dict[str, _Partition] = {}
+        self._lock = threading.Lock()
+
+    def _sync_products(self):
+        """Read product URLs appended since the last call (possibly by another process)."""
+        if not os.path.exists(self._products_path):
+            return
+        with open(self._products_path, "rb") as f:
+            f.seek(self._products_read)
+            data = f.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        for url in complete.decode("utf-8").splitlines():
+            self._product_ids[url] = len(self._product_ids)
+        self._products_read += len(complete)
+
+    def append(self, discounts: Iterable[DiscountRecord], timestamp: Optional[float] = None):
+        """Record the normalized prices of one refresh."""
+        timestamp = int(time.time() if timestamp is None else timestamp)
+        directory = os.path.join(self.directory, _day(timestamp))
+        with self._lock:
+            # Appends go after the last complete line and row; an interrupted append must not shift the rest
+            _truncate_to_last_line(self._products_path)
+            self._sync_products()
+            columns = {name: array(typecode) for name, typecode in COLUMNS}
+            new_urls = []
+            for discount in discounts:
+                product_id = self._product_ids.get(discount.url)
+                if product_id is None:
+                    product_id = self._product_ids[discount.url] = len(self._product_ids)
+                    new_urls.append(discount.url)
+                columns["timestamp"].append(timestamp)
+                columns["product_id"].append(product_id)
+                columns["new_price_minor"].append(MISSING if discount.new_price_minor is None else discount.new_price_minor)
+                columns["old_price_minor"].append(MISSING if discount.old_price_minor is None else discount.old_price_minor)
+                columns["percent_off"].append(MISSING if discount.percent_off is None else discount.percent_off)
+                columns["currency"].append(CURRENCIES.index(discount.currency) if discount.currency in CURRENCIES else 0)
+            if new_urls:
+                data = "".join(f"{url}\n" for url in new_urls).encode("utf-8")
+                try:
+                    with open(self._products_path, "ab") as f:
+                        f.write(data)
+                except BaseException:
+                    # The ids were never written; they are handed out again next time
+                    for url in new_urls:
+                        del self._product_ids[url]
+                    raise
+                self._products_read += len(data)
+            os.makedirs(directory, exist_ok=True)
+            _align_columns(directory)
+            for name, column in columns.items():
+                with open(os.path.join(directory, name), "ab") as f:
+                    column.tofile(f)
+
+    def _partition(self, day: str) -> Optional[_Partition]:
+        directory = os.path.join(self.directory, day)
+        if not os.path.isdir(directory):
+            return None
+        partition = self._partitions.get(day)
+        if partition is None or partition.sizes != _column_sizes(directory):
+            partition = self._partitions[day] = _Partition(directory)
+        return partition
+
+    def history(self, url: str, days: Optional[int] = None, now: Optional[float] = None) -> List[PricePoint]:
+        """Prices recorded for a product, oldest first; only the last N days if given."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._sync_products()
+            product_id = self._product_ids.get(url)
+            if product_id is None:
+                return []
+            if days is None:
+                day_names = sorted(name for name in os.listdir(self.directory)
+                                   if os.path.isdir(os.path.join(self.directory, name)))
+                since = 0
+            else:
+                since = now - days * DAY
+                day_names = [_day(since + offset * DAY) for offset in range(days + 1)]
+            points = []
+            for day in day_names:
+                partition = self._partition(day)
+                if partition is not None:
+                    points.extend(partition.point(row) for row in partition.rows_by_product.get(product_id, ()))
+        return [point for point in points if since <= point.timestamp <= now]
+
+    def lowest_price(self, url: str, days: Optional[int] = 30, now: Optional[float] = None) -> Optional[PricePoint]:
+        """The cheapest price recorded for a product in the last N days (ever, for None); None if it has none."""
+        priced = [point for point in self.history(url, days, now) if point.new_price_minor is not None]
+        return min(priced, key=lambda point: point.new_price_minor) if priced else None
@@ -0,0 +1,123 @@
+import math
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_DOTTED = re.compile(r"(?<=[a-z])\.(?=[a-z])")
+_TOKEN = re.compile(r"\d+(?:[.,]\d+)?|[a-z]+")
+
+
+def product_tokens(name: str) -> List[str]:
+    """Lowercase, diacritic-free tokens of a product name; the first one is taken as the brand.
+
+    "C.A.M.P." becomes "camp" and decimal commas become points, so "9,8" and "9.8"
+    are the same token.
+    """
+    folded = unicodedata.normalize("NFKD", name.lower())
+    folded = "".join(char for char in folded if not unicodedata.combining(char))
+    return [token.replace(",", ".") for token in _TOKEN.findall(_DOTTED.sub("", folded))]
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: int, b: int):
+        self.parent[self.find(a)] = self.find(b)
+
+
+class ProductMatcher:
+    """Groups the same product offered by different shops.
+
+    Products are blocked by brand, then compared only with products of other shops
+    that share one of their rare tokens (found through an inverted index), so the work
+    grows with the number of plausible pairs rather than quadratically. Tokens are
+    weighted by their IDF within the product's own shop, so a shop's boilerplate
+    ("Hegymászó kötél", "Single rope") weighs little. Two products match when the share
+    of each name's weight found in the other name averages at least the threshold;
+    matches are merged transitively.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = settings or {}
+        self.threshold = settings.get('threshold', 0.6)
+        # Tokens in more than this share of a brand's products are too common to pair on
+        self.max_token_share = settings.get('max_token_share', 0.8)
+        self.max_postings = settings.get('max_postings', 50)
+        # Price of one unit of each currency in a common unit, to order offers across shops
+        self.rates = {'HUF': 1, 'EUR': 400, **settings.get('rates', {})}
+        # Candidate pairs scored so far (see scripts/benchmark_matching.py)
+        self.comparisons = 0
+
+    def match(self, names: Sequence[str], sites: Sequence[str]) -> List[List[int]]:
+        """Indices of the products grouped as one, for groups spanning at least two shops."""
+        tokens = [product_tokens(name) for name in names]
+        blocks: Dict[str, List[int]] = {}
+        for i, product in enumerate(tokens):
+            if product:
+                blocks.setdefault(product[0], []).append(i)
+
+        # IDF within each shop's own products, so a shop's boilerplate words weigh little
+        site_products: Dict[str, List[int]] = {}
+        for i, site in enumerate(sites):
+            site_products.setdefault(site, []).append(i)
+        token_sets = [set(product[1:]) for product in tokens]
+        token_weights: List[Dict[str, float]] = [{} for _ in names]
+        for members in site_products.values():
+            document_frequency: Dict[str, int] = {}
+            for i in members:
+                for token in token_sets[i]:
+                    document_frequency[token] = document_frequency.get(token, 0) + 1
+            for i in members:
+                token_weights[i] = {token: math.log((len(members) + 1) / document_frequency[token])
+                                    for token in token_sets[i]}
+        totals = [sum(weights.values()) for weights in token_weights]
+
+        groups = _UnionFind(len(names))
+        for members in blocks.values():
+            postings: Dict[str, List[int]] = {}
+            for i in members:
+                for token in token_sets[i]:
+                    postings.setdefault(token, []).append(i)
+            max_postings = max(2, min(int(len(members) * self.max_token_share), self.max_postings))
+            candidates = set()
+            for posting in postings.values():
+                if len(posting) <= max_postings:
+                    candidates.update((a, b) for n, a in enumerate(posting) for b in posting[n + 1:]
+                                      if sites[a] != sites[b])
+            for a, b in candidates:
+                self.comparisons += 1
+                shared = token_sets[a] & token_sets[b]
+                coverage = [sum(token_weights[i][token] for token in shared) / (totals[i] or 1) for i in (a, b)]
+                if sum(coverage) / 2 >= self.threshold:
+                    groups.union(a, b)
+
+        grouped: Dict[int, List[int]] = {}
+        for i in range(len(names)):
+            grouped.setdefault(groups.find(i), []).append(i)
+        return [members for members in grouped.values() if len({sites[i] for i in members}) > 1]
+
+    def price(self, record: dict) -> float:
+        """New price in the common unit; unknown prices and currencies sort last."""
+        rate = self.rates.get(record.get('currency'))
+        if rate is None or record.get('new_price_minor') is None:
+            return math.inf
+        return record['new_price_minor'] * rate
+
+    def group_offers(self, records: Sequence[dict]) -> Tuple[dict, ...]:
+        """Offers of each product sold by several shops, cheapest offer first.
+
+        Groups are ordered by their cheapest offer's discount, best first.
+        """
+        groups = []
+        for members in self.match([d['product'] for d in records], [d.get('site') for d in records]):
+            offers = sorted((records[i] for i in members), key=self.price)
+            groups.append({'product': offers[0]['product'], 'offers': offers})
+        groups.sort(key=lambda group: group['offers'][0].get('percent_off') or 0, reverse=True)
+        return tuple(groups)
@@ -0,0 +1,43 @@
+import threading
+from typing import Any, Dict, Optional
+
+
+class RefreshSchedule:
+    """Refresh interval of every (category, site) slice, with adaptive back-off.
+
+    A slice uses the interval configured for its site or its category (the shorter one
+    if both are set), otherwise the default. Every refresh that changes nothing doubles
+    the slice's interval, up to max_backoff times the configured one; a change resets it.
+    A refresh that failed on some page keeps the interval, since its pages may have
+    changed without the refresh seeing it.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = settings or {}
+        self.default_hours = settings.get('interval_hours', 12)
+        self.jitter_seconds = int(settings.get('jitter_minutes', 0) * 60)
+        self.max_backoff = settings.get('max_backoff', 1)
+        self.site_hours = {site: o['interval_hours'] for site, o in (settings.get('sites') or {}).items()}
+        self.category_hours = {category: o['interval_hours'] for category, o in (settings.get('categories') or {}).items()}
+        self._backoff = {}
+        self._lock = threading.Lock()
+
+    def base_interval_hours(self, category: str, site: str) -> float:
+        """Configured interval of a slice, before back-off."""
+        overrides = [h for h in (self.site_hours.get(site), self.category_hours.get(category)) if h is not None]
+        return min(overrides) if overrides else self.default_hours
+
+    def interval_hours(self, category: str, site: str) -> float:
+        """Current interval of a slice, including back-off."""
+        return self.base_interval_hours(category, site) * self._backoff.get((category, site), 1)
+
+    def record(self, category: str, site: str, changed: bool, failed: bool = False) -> float:
+        """Record the outcome of a slice refresh and return the slice's next interval."""
+        with self._lock:
+            backoff = self._backoff.get((category, site), 1)
+            if changed:
+                backoff = 1
+            elif not failed:
+                backoff = min(backoff * 2, self.max_backoff)
+            self._backoff[(category, site)] = backoff
+        return self.interval_hours(category, site)
@@ -0,0 +1,93 @@
+import heapq
+import math
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.services.product_matcher import product_tokens
+
+# BM25 term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+# Extra term frequency of a product's brand (its first token)
+BRAND_BOOST = 1
+# Weight of a term matched as a prefix of the query token, relative to an exact match
+PREFIX_WEIGHT = 0.5
+# Query tokens shorter than this only match whole terms
+MIN_PREFIX_LENGTH = 2
+# At most this many terms are expanded from one prefix, most frequent first
+MAX_EXPANSIONS = 50
+
+
+def search_tokens(text: str) -> List[str]:
+    """Folded tokens of a query or product name, as product_tokens splits them."""
+    return product_tokens(text)
+
+
+class SearchIndex:
+    """Inverted index over product names, brands and sites, ranked with BM25.
+
+    Names are folded like ProductMatcher's tokens (lowercase, no diacritics, "9,8"
+    == "9.8"), so "kotel" finds "kötél". Each term keeps a posting list of
+    (record, BM25 term weight); the brand counts BRAND_BOOST extra times and the shop
+    name is indexed as part of every record. A query scores only the records in the
+    posting lists of its terms. The last query token also matches as a prefix
+    ("dra" finds "dragon") through bisection over the sorted vocabulary, as does any
+    other query token that matches no term exactly.
+    """
+
+    def __init__(self, records: Sequence[dict]):
+        self.records = tuple(records)
+        postings: Dict[str, Dict[int, int]] = {}
+        lengths = []
+        for doc, record in enumerate(self.records):
+            tokens = search_tokens(record.get('product') or "")
+            if tokens:
+                tokens += [tokens[0]] * BRAND_BOOST
+            tokens += search_tokens(record.get('site') or "")
+            lengths.append(len(tokens))
+            for token in tokens:
+                frequencies = postings.setdefault(token, {})
+                frequencies[doc] = frequencies.get(doc, 0) + 1
+        average_length = sum(lengths) / len(lengths) if lengths else 0.0
+        # Posting entries hold the BM25 term frequency part, so a query only multiplies by IDF
+        self._postings = {
+            term: tuple((doc, frequency * (K1 + 1) / (frequency + K1 * (1 - B + B * lengths[doc] / average_length)))
+                        for doc, frequency in frequencies.items())
+            for term, frequencies in postings.items()
+        }
+        self._terms = sorted(self._postings)
+        count = len(self.records)
+        self._idf = {term: math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                     for term, posting in self._postings.items()}
+
+    def _expansions(self, token: str, prefix: bool) -> List[Tuple[str, float]]:
+        """(term, weight) pairs a query token matches: itself, and as a prefix when allowed."""
+        matches = [(token, 1.0)] if token in self._postings else []
+        if (prefix or not matches) and len(token) >= MIN_PREFIX_LENGTH:
+            start = bisect_left(self._terms, token)
+            end = bisect_left(self._terms, token + "\uffff", start)
+            longer = [term for term in self._terms[start:end] if term != token]
+            if len(longer) > MAX_EXPANSIONS:
+                longer = heapq.nlargest(MAX_EXPANSIONS, longer, key=lambda term: len(self._postings[term]))
+            matches.extend((term, PREFIX_WEIGHT) for term in longer)
+        return matches
+
+    def search(self, query: str, limit: int = 20, category: Optional[str] = None) -> List[Tuple[float, dict]]:
+        """Best (score, record) pairs for the query, optionally within one category."""
+        tokens = list(dict.fromkeys(search_tokens(query)))
+        scores: Dict[int, float] = {}
+        for position, token in enumerate(tokens):
+            # Per record, the best of the terms this query token matched
+            best: Dict[int, float] = {}
+            for term, weight in self._expansions(token, prefix=position == len(tokens) - 1):
+                idf = self._idf[term] * weight
+                for doc, term_weight in self._postings[term]:
+                    score = idf * term_weight
+                    if score > best.get(doc, 0.0):
+                        best[doc] = score
+            for doc, score in best.items():
+                scores[doc] = scores.get(doc, 0.0) + score
+        if category is not None:
+            scores = {doc: score for doc, score in scores.items() if self.records[doc].get('category') == category}
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(score, self.records[doc]) for doc, score in top]
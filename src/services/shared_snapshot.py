@@ -0,0 +1,124 @@
+import fcntl
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src.core.logging_config import logger
+
+
+class SnapshotStorage:
+    """SQLite file shared by every process serving discounts.
+
+    One elected refresher writes published slices and changes; all workers poll the
+    snapshot version and load the slices when it moves. The database runs in WAL mode,
+    so readers never block the writer, and reads go through a memory map of the file.
+    """
+
+    def __init__(self, path: str, change_log_size: int = 1000):
+        self.path = path
+        self.change_log_size = change_log_size
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+            conn.execute("CREATE TABLE IF NOT EXISTS slices (category TEXT, site TEXT, records BLOB, PRIMARY KEY (category, site))")
+            conn.execute("CREATE TABLE IF NOT EXISTS changes (version INTEGER, category TEXT, site TEXT, added TEXT, removed TEXT, changed TEXT)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
+        return conn
+
+    def version(self) -> int:
+        row = self._connection().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return row[0] if row else 0
+
+    def load(self) -> Tuple[int, Optional[float], Dict[Tuple[str, str], Tuple[dict, ...]]]:
+        """Read (version, created_at, slices) as one consistent snapshot."""
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            slices = {
+                (category, site): tuple(json.loads(records))
+                for category, site, records in conn.execute("SELECT category, site, records FROM slices ORDER BY rowid")
+            }
+        finally:
+            conn.execute("COMMIT")
+        return meta.get("version", 0), meta.get("created_at"), slices
+
+    def save(self, version: int, created_at: float, slices: Dict[Tuple[str, str], Tuple[dict, ...]], changes: List):
+        """Write the published slices and their changes as snapshot version."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO slices (category, site, records) VALUES (?, ?, ?) "
+                "ON CONFLICT (category, site) DO UPDATE SET records = excluded.records",
+                [(category, site, json.dumps(records)) for (category, site), records in slices.items()],
+            )
+            conn.executemany(
+                "INSERT INTO changes VALUES (?, ?, ?, ?, ?, ?)",
+                [(c.version, c.category, c.site, json.dumps(c.added), json.dumps(c.removed), json.dumps(c.changed))
+                 for c in changes],
+            )
+            conn.execute("DELETE FROM changes WHERE rowid <= (SELECT MAX(rowid) FROM changes) - ?", (self.change_log_size,))
+            conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [("version", version), ("created_at", created_at)])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_meta(self, key: str):
+        """A value stored with set_meta, None if there is none."""
+        row = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value):
+        """Store a value next to the snapshot for every process to read."""
+        self._connection().execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def changes_since(self, version: int) -> List[tuple]:
+        """Rows (version, category, site, added, removed, changed) newer than version."""
+        rows = self._connection().execute(
+            "SELECT version, category, site, added, removed, changed FROM changes WHERE version > ? ORDER BY rowid",
+            (version,),
+        )
+        return [(v, category, site, *(tuple(json.loads(urls)) for urls in lists)) for v, category, site, *lists in rows]
+
+
+class RefresherLock:
+    """Elects the one process that scrapes, via an exclusive lock on a file.
+
+    The lock is held until the process exits, so when the refresher dies another
+    process can take over on its next try_acquire.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        """Whether this process is the refresher (without trying to become it)."""
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        if self._file is not None:
+            return True
+        lock_file = open(self.path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        logger.info(f"Process {os.getpid()} is the discount refresher")
+        return True
@@ -18,7 +18,7 @@ async function renderProducts(category) {
         discounts.forEach(d => {
             const div = document.createElement('div');
             div.className = 'product';
-            div.dataset.discountPercent = d.discount_percent ? parseInt(d.discount_percent.replace(/\s+/g, '')) : 0;
+            div.dataset.percentOff = d.percent_off || 0;
             div.innerHTML = `
                 <div class="product-img">
                     <a href="${d.url}" target="_blank">
@@ -52,6 +52,6 @@ select.addEventListener('change', function() {
 
 document.getElementById('sort-by-discount').addEventListener('click', () => {
     const products = Array.from(container.getElementsByClassName('product'));
-    products.sort((a, b) => a.dataset.discountPercent - b.dataset.discountPercent);
+    products.sort((a, b) => b.dataset.percentOff - a.dataset.percentOff);
     products.forEach(p => container.appendChild(p));
 });
@@ -1,4 +1,35 @@
 """
 Test package for the climbing gear discount aggregator.
 Contains unit tests and integration tests for all components.
-""" 
\ No newline at end of file
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+PREFIX = "discounts-test-"
+_directory = None
+
+
+def use_temporary_storage() -> str:
+    """Point DATA_DIR, under which the snapshot, history and caches live, at a temporary directory.
+
+    Must run before anything from src is imported, since importing src opens the snapshot
+    and its refresher lock; tests then never touch the project's .cache or wait on a
+    running server's lock.
+    """
+    global _directory
+    if _directory is None:
+        inherited = os.environ.get("DATA_DIR", "")
+        if os.path.basename(inherited).startswith(PREFIX):
+            # A worker process of a test run: share the run's directory
+            _directory = inherited
+        else:
+            _directory = tempfile.mkdtemp(prefix=PREFIX)
+            atexit.register(shutil.rmtree, _directory, ignore_errors=True)
+            os.environ["DATA_DIR"] = _directory
+    return _directory
+
+
+use_temporary_storage()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Flask API.
+Tests the pre-serialized discount payloads, compression and conditional requests.
+"""
+
+import sys
+import os
+import gzip
+import json
+import unittest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests import use_temporary_storage
+
+# Keep the snapshot, its refresher lock and the caches out of the project's .cache (before importing src)
+use_temporary_storage()
+
+from src.app.main import app, first_refresh_done
+from src.services.discount_service import discount_store
+
+# The first refresh runs in the background; these tests look at what it published
+first_refresh_done.wait(120)
+
+
+class TestDiscountsEndpoint(unittest.TestCase):
+    """Test cases for /discounts/<category>."""
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_body_matches_snapshot(self):
+        """Test that the payload is the snapshot's category list."""
+        response = self.client.get('/discounts/ropes')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(response.get_json(), list(discount_store.snapshot.get('ropes')))
+        self.assertTrue(response.get_etag()[0])
+
+    def test_gzip_variant(self):
+        """Test that gzip is served pre-compressed with its own ETag."""
+        plain = self.client.get('/discounts/ropes')
+        compressed = self.client.get('/discounts/ropes', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(compressed.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(compressed.data)), plain.get_json())
+        self.assertNotEqual(compressed.get_etag(), plain.get_etag())
+        self.assertIn('Accept-Encoding', compressed.headers['Vary'])
+
+    def test_if_none_match_returns_304(self):
+        """Test that a matching ETag yields an empty 304."""
+        etag = self.client.get('/discounts/ropes').headers['ETag']
+        response = self.client.get('/discounts/ropes', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    def test_payload_is_serialized_once_per_snapshot(self):
+        """Test that repeated requests reuse the same serialized payload."""
+        self.client.get('/discounts/slings')
+        self.assertIs(discount_store.snapshot.payload('slings'), discount_store.snapshot.payload('slings'))
+
+    def test_unknown_category(self):
+        """Test that an unknown category is a 404."""
+        self.assertEqual(self.client.get('/discounts/unknown').status_code, 404)
+
+
+class TestDiscountQueries(unittest.TestCase):
+    """Test cases for filtered and paginated /discounts/<category> queries."""
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_pages_cover_the_category(self):
+        """Test that following X-Next-Offset walks the whole list in snapshot order."""
+        urls, offset = [], 0
+        while offset is not None:
+            response = self.client.get(f'/discounts/ropes?limit=40&offset={offset}')
+            self.assertEqual(response.status_code, 200)
+            urls.extend(d['url'] for d in response.get_json())
+            offset = response.headers.get('X-Next-Offset')
+        self.assertEqual(urls, [d['url'] for d in discount_store.snapshot.get('ropes')])
+
+    def test_filters(self):
+        discounts = self.client.get('/discounts/ropes?site=maszas&min_discount=10&sort=price').get_json()
+        self.assertTrue(discounts)
+        self.assertTrue(all(d['site'] == 'Maszas' and d['percent_off'] >= 10 for d in discounts))
+        prices = [d['new_price_minor'] for d in discounts]
+        self.assertEqual(prices, sorted(prices))
+        cheap = self.client.get('/discounts/ropes?max_price=50&currency=eur&sort=price').get_json()
+        self.assertTrue(all(d['currency'] == 'EUR' and d['new_price_minor'] <= 5000 for d in cheap))
+
+    def test_bad_parameters(self):
+        self.assertEqual(self.client.get('/discounts/ropes?sort=name').status_code, 400)
+        self.assertEqual(self.client.get('/discounts/ropes?limit=0').status_code, 400)
+        self.assertEqual(self.client.get('/discounts/ropes?max_price=cheap').status_code, 400)
+        for name in ('min_discount', 'offset', 'limit'):
+            with self.subTest(name=name):
+                self.assertEqual(self.client.get(f'/discounts/ropes?{name}=ten').status_code, 400)
+        self.assertEqual(self.client.get('/discounts/unknown?limit=5').status_code, 404)
+
+
+class TestOffersEndpoint(unittest.TestCase):
+    """Test cases for /offers/<category>."""
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_groups_span_shops(self):
+        groups = self.client.get('/offers/ropes').get_json()
+        self.assertTrue(groups)
+        for group in groups:
+            self.assertGreater(len({offer['site'] for offer in group['offers']}), 1)
+            self.assertEqual(group['product'], group['offers'][0]['product'])
+
+    def test_unknown_category(self):
+        self.assertEqual(self.client.get('/offers/unknown').status_code, 404)
+
+
+class TestHistoryEndpoint(unittest.TestCase):
+    """Test cases for /history."""
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_refreshes_are_recorded(self):
+        """Test that a product published at startup has at least one recorded price."""
+        url = discount_store.snapshot.get('ropes')[0]['url']
+        body = self.client.get('/history', query_string={'url': url, 'days': 1}).get_json()
+        self.assertTrue(body['points'])
+        self.assertEqual(body['lowest']['new_price_minor'], min(p['new_price_minor'] for p in body['points']))
+
+    def test_url_is_required(self):
+        self.assertEqual(self.client.get('/history').status_code, 400)
+
+    def test_days_must_be_an_integer(self):
+        url = discount_store.snapshot.get('ropes')[0]['url']
+        self.assertEqual(self.client.get('/history', query_string={'url': url, 'days': 'week'}).status_code, 400)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    """Test cases for /metrics."""
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_exposes_request_and_scrape_metrics(self):
+        """Test that served requests and the startup refresh show up in the Prometheus text."""
+        self.client.get('/discounts/ropes')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        body = response.get_data(as_text=True)
+        self.assertIn('http_requests_total{route="/discounts/<category>",status="200"}', body)
+        # Mock pages come from the mock corpus cache once extracted, so count fetches rather than parses
+        self.assertIn('scraper_fetch_duration_seconds_count{host="bergfreunde"}', body)
+        self.assertIn('refresh_duration_seconds_count{job="all"}', body)
+        self.assertIn('discounts_snapshot_age_seconds', body)
+
+
+class TestSearchEndpoint(unittest.TestCase):
+    """Test cases for /search."""
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_finds_products_across_categories(self):
+        """Test that results come scored, best first, and can be limited to a category."""
+        results = self.client.get('/search', query_string={'q': 'dragon cam'}).get_json()
+        self.assertTrue(results)
+        self.assertIn('dragon', results[0]['product'].lower())
+        self.assertEqual([r['score'] for r in results], sorted((r['score'] for r in results), reverse=True))
+        ropes = self.client.get('/search', query_string={'q': 'kotel', 'category': 'ropes', 'limit': 5}).get_json()
+        self.assertTrue(ropes)
+        self.assertLessEqual(len(ropes), 5)
+        self.assertTrue(all(r['category'] == 'ropes' for r in ropes))
+
+    def test_bad_parameters(self):
+        self.assertEqual(self.client.get('/search').status_code, 400)
+        self.assertEqual(self.client.get('/search', query_string={'q': 'cam', 'limit': 0}).status_code, 400)
+        self.assertEqual(self.client.get('/search', query_string={'q': 'cam', 'limit': '5.5'}).status_code, 400)
+        self.assertEqual(self.client.get('/search', query_string={'q': 'cam', 'category': 'unknown'}).status_code, 404)
+
+
+class TestReadyEndpoint(unittest.TestCase):
+    """Test cases for /ready."""
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_reports_snapshot_age(self):
+        """Test that a process with a snapshot is ready and reports its version and age."""
+        response = self.client.get('/ready')
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertTrue(body['ready'])
+        self.assertEqual(body['version'], discount_store.snapshot.version)
+        self.assertGreaterEqual(body['age_seconds'], 0)
+        self.assertTrue(body['first_refresh_done'])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
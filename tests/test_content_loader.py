@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test suite for the content loaders.
+Runs the HTTP loaders against a local stand-in shop server.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.content_loader import AsyncHttpContentLoader, HttpContentLoader
+from src.dto.discount import Discount
+from src.dto.discount_url import DiscountUrl
+from src.scrapers.discount_scraper import DiscountScraper
+
+PAGE_COUNT = 40
+PAGE_LATENCY = 0.02
+PAGE = b"<html><body><div class='item'>Rope</div><div class='item'>Cam</div></body></html>"
+
+
+class StandInShopHandler(BaseHTTPRequestHandler):
+    """Serves the same small page after a fixed latency, with keep-alive."""
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def do_GET(self):
+        StandInShopHandler.connections.add(self.client_address)
+        time.sleep(PAGE_LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+class ItemScraper(DiscountScraper):
+    def extract_discounts_from_soup(self, soup, url):
+        return [
+            Discount(product=item.get_text(strip=True), url=url, image_url=None, old_price="2", new_price="1")
+            for item in soup.select("div.item")
+        ]
+
+
+class TestHttpContentLoaders(unittest.TestCase):
+    """Compares the per-request client with the pooled async client."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInShopHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.urls = [f"http://127.0.0.1:{cls.server.server_port}/page/{i}" for i in range(PAGE_COUNT)]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StandInShopHandler.connections = set()
+
+    def test_per_request_client_opens_a_connection_per_page(self):
+        """Test the baseline: every page costs a new connection."""
+        loader = HttpContentLoader(timeout=5)
+        for url in self.urls[:5]:
+            self.assertEqual(loader.fetch(url), PAGE)
+        self.assertEqual(len(StandInShopHandler.connections), 5)
+
+    def test_async_client_reuses_pooled_connections(self):
+        """Test that threads sharing the async loader stay within the connection pool."""
+        loader = AsyncHttpContentLoader(timeout=5, max_connections=4, max_keepalive_connections=4)
+        try:
+            threads = [threading.Thread(target=lambda u=url: loader.fetch(u)) for url in self.urls]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            loader.close()
+        self.assertLessEqual(len(StandInShopHandler.connections), 4)
+
+    def test_gather_path_reuses_connections(self):
+        """Test that the gather-driven scraper path fetches every page over a bounded, reused set of connections.
+
+        Also prints both paths' throughput; the timing is only reported, since it depends on the machine's load.
+        """
+        discount_urls = [DiscountUrl(category="ropes", url=url) for url in self.urls]
+
+        start = time.perf_counter()
+        sequential = ItemScraper(HttpContentLoader(timeout=5), discount_urls).extract_discounts_by_category("ropes")
+        sequential_time = time.perf_counter() - start
+        self.assertEqual(len(sequential), 2 * PAGE_COUNT)
+        self.assertEqual(len(StandInShopHandler.connections), PAGE_COUNT)
+
+        StandInShopHandler.connections = set()
+        loader = AsyncHttpContentLoader(timeout=5, max_connections=10, max_keepalive_connections=10)
+        try:
+            start = time.perf_counter()
+            pooled = asyncio.run(ItemScraper(loader, discount_urls).extract_discounts_by_category_async("ropes"))
+            pooled_time = time.perf_counter() - start
+        finally:
+            loader.close()
+        print(f"\n{PAGE_COUNT} pages: per-request {PAGE_COUNT / sequential_time:.0f} pages/s, "
+              f"pooled async {PAGE_COUNT / pooled_time:.0f} pages/s ({sequential_time / pooled_time:.1f}x)")
+        self.assertEqual(len(pooled), 2 * PAGE_COUNT)
+        # Pages load concurrently, but over at most max_connections connections, each reused
+        self.assertGreater(len(StandInShopHandler.connections), 1)
+        self.assertLessEqual(len(StandInShopHandler.connections), 10)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
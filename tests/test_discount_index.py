@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test suite for the per-category discount index.
+Tests sorting, filtering and pagination against a brute-force scan.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.price_parser import Price
+from src.services.discount_index import CategoryIndex
+
+
+def make_record(url, site, percent_off, price, currency):
+    return {'url': url, 'site': site, 'percent_off': percent_off, 'new_price_minor': price, 'currency': currency}
+
+
+RECORDS = [
+    make_record("a", "Maszas", 9, 500000, "HUF"),
+    make_record("b", "Maszas", 50, 100000, "HUF"),
+    make_record("c", "Bergfreunde", 15, 1500, "EUR"),
+    make_record("d", "Bergfreunde", 30, 9900, "EUR"),
+    make_record("e", "4camping", 0, 300000, "HUF"),
+    make_record("f", "4camping", 30, 200000, "HUF"),
+]
+
+
+class TestCategoryIndex(unittest.TestCase):
+    """Test cases for CategoryIndex."""
+
+    def setUp(self):
+        self.index = CategoryIndex(RECORDS)
+
+    def urls(self, **query):
+        return [d['url'] for d in self.index.query(**query)]
+
+    def test_sorts(self):
+        self.assertEqual(self.urls(), ["b", "d", "f", "c", "a", "e"])
+        self.assertEqual(self.urls(sort="price"), ["c", "d", "b", "f", "e", "a"])
+        self.assertEqual(self.urls(sort="site"), ["f", "e", "d", "c", "b", "a"])
+        with self.assertRaises(ValueError):
+            self.index.query(sort="name")
+
+    def test_filters(self):
+        self.assertEqual(self.urls(min_discount=30), ["b", "d", "f"])
+        self.assertEqual(self.urls(site="bergfreunde"), ["d", "c"])
+        self.assertEqual(self.urls(site="unknown"), [])
+        self.assertEqual(self.urls(sort="price", max_price=Price(200000, "HUF")), ["b", "f"])
+        self.assertEqual(self.urls(max_price=Price(1500, None)), ["c"])
+
+    def test_filters_match_scan(self):
+        """Test every combination against filtering the records one by one."""
+        for sort, key in (("discount", lambda d: -d['percent_off']), ("price", lambda d: (d['currency'], d['new_price_minor'])),
+                          ("site", lambda d: d['site'].lower())):
+            for min_discount in (None, 10, 30):
+                for max_price in (None, Price(200000, "HUF"), Price(9900, "EUR")):
+                    expected = [d['url'] for d in sorted(sorted(RECORDS, key=lambda d: -d['percent_off']), key=key)
+                                if (min_discount is None or d['percent_off'] >= min_discount)
+                                and (max_price is None or (d['currency'] == max_price.currency
+                                                           and d['new_price_minor'] <= max_price.amount))]
+                    with self.subTest(sort=sort, min_discount=min_discount, max_price=max_price):
+                        self.assertEqual(self.urls(sort=sort, min_discount=min_discount, max_price=max_price), expected)
+
+    def test_pagination(self):
+        self.assertEqual(self.urls(offset=1, limit=2), ["d", "f"])
+        self.assertEqual(self.urls(min_discount=30, offset=2, limit=5), ["f"])
+        self.assertEqual(self.urls(offset=10, limit=5), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
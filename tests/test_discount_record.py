@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test suite for DiscountRecord.
+Tests that the slotted record matches the pydantic Discount model and interns its shared strings.
+"""
+
+import sys
+import os
+import json
+import pickle
+import unittest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dto.discount import Discount
+from src.dto.discount_record import DiscountRecord
+
+FIELDS = dict(product="Beal Karma 9.8", url="https://shop.example/karma", image_url=None, old_price="100 €",
+              new_price="80 €", category="ropes", site="Shop", discount_percent="-20", currency="EUR",
+              old_price_minor=10000, new_price_minor=8000, percent_off=20)
+
+
+class TestDiscountRecord(unittest.TestCase):
+    """Test cases for DiscountRecord."""
+
+    def test_matches_the_model(self):
+        """Test that records dump, convert and round-trip like Discount."""
+        record = DiscountRecord(**FIELDS)
+        self.assertEqual(record.model_dump(), Discount(**FIELDS).model_dump())
+        self.assertEqual(record.to_model(), Discount(**FIELDS))
+        self.assertEqual(DiscountRecord.from_model(record.to_model()), record)
+        self.assertEqual(DiscountRecord(product="x", url="u", image_url=None, old_price="", new_price="").model_dump(),
+                         Discount(product="x", url="u", image_url=None, old_price="", new_price="").model_dump())
+
+    def test_slotted(self):
+        """Test that records have no per-instance dict and pickle for other processes."""
+        record = DiscountRecord(**FIELDS)
+        self.assertFalse(hasattr(record, '__dict__'))
+        with self.assertRaises(AttributeError):
+            record.colour = "red"
+        self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+
+    def test_shared_strings_are_interned(self):
+        """Test that category, site and currency loaded from JSON share one string object."""
+        first, second = (DiscountRecord(**json.loads(json.dumps(FIELDS))) for _ in range(2))
+        for field in ('category', 'site', 'currency'):
+            self.assertIs(getattr(first, field), getattr(second, field))
+        self.assertIsNot(first.product, second.product)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
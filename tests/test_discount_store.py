@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test suite for the discount store.
+Tests slice diffing, snapshot immutability and the change log.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dto.discount import Discount
+from src.scrapers.discount_scraper import normalize_discounts
+from src.services.discount_store import DiscountStore
+
+
+def make_discount(url, new_price="10", discount_percent="-20"):
+    return normalize_discounts([Discount(product=url, url=url, image_url=None, old_price="20", new_price=new_price,
+                                         category="ropes", site="Maszas", discount_percent=discount_percent)])[0]
+
+
+class TestDiscountStore(unittest.TestCase):
+    """Test cases for DiscountStore class."""
+
+    def setUp(self):
+        self.store = DiscountStore(["ropes", "slings"])
+        self.store.publish({("ropes", "maszas"): [make_discount("a"), make_discount("b")]})
+
+    def test_publish_reports_added_removed_changed(self):
+        """Test that a publish diffs the slice by product URL."""
+        changes = self.store.publish({
+            ("ropes", "maszas"): [make_discount("a", new_price="9"), make_discount("c")],
+        })
+        self.assertEqual(len(changes), 1)
+        change = changes[0]
+        self.assertEqual((change.category, change.site, change.version), ("ropes", "maszas", 2))
+        self.assertEqual(change.added, ("c",))
+        self.assertEqual(change.removed, ("b",))
+        self.assertEqual(change.changed, ("a",))
+
+    def test_unchanged_publish_reuses_records(self):
+        """Test that an identical refresh reports nothing and keeps the published dicts."""
+        before = self.store.snapshot
+        changes = self.store.publish({("ropes", "maszas"): [make_discount("a"), make_discount("b")]})
+        self.assertEqual(changes, [])
+        self.assertIs(self.store.snapshot.get("ropes")[0], before.get("ropes")[0])
+
+    def test_old_snapshot_is_untouched(self):
+        """Test that readers holding the previous snapshot never see the new or an empty state."""
+        before = self.store.snapshot
+        self.store.publish({("ropes", "maszas"): []})
+        self.assertEqual(len(before.get("ropes")), 2)
+        self.assertEqual(self.store.snapshot.get("ropes"), ())
+
+    def test_partial_publish_keeps_other_slices(self):
+        """Test that publishing one slice leaves the other slices in place and merges by discount."""
+        self.store.publish({("ropes", "bergfreunde"): [make_discount("x", discount_percent="-30")]})
+        self.assertEqual([d["url"] for d in self.store.snapshot.get("ropes")], ["x", "a", "b"])
+        self.assertEqual(self.store.snapshot.get("slings"), ())
+        self.assertIsNone(self.store.snapshot.get("unknown"))
+
+    def test_payload_carried_over_for_unchanged_categories(self):
+        """Test that publishing one category keeps the other categories' serialized payloads."""
+        self.store.publish({("slings", "maszas"): [make_discount("s")]})
+        ropes = self.store.snapshot.payload("ropes")
+        slings = self.store.snapshot.payload("slings")
+        self.store.publish({("slings", "maszas"): [make_discount("t")]})
+        self.assertIs(self.store.snapshot.payload("ropes"), ropes)
+        self.assertIsNot(self.store.snapshot.payload("slings"), slings)
+        self.assertIn(b'"t"', self.store.snapshot.payload("slings").body)
+
+    def test_changes_since(self):
+        """Test that the change log returns only newer versions."""
+        self.store.publish({("ropes", "maszas"): [make_discount("a")]})
+        self.assertEqual([c.version for c in self.store.changes_since(0)], [1, 2])
+        self.assertEqual([c.version for c in self.store.changes_since(1)], [2])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
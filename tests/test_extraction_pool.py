@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test suite for the extraction worker pool.
+Tests that pages extracted in worker processes match extraction in the fetch threads.
+"""
+
+import sys
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import config
+from src.core.content_loader import MockContentLoader
+from src.core.extraction_pool import START_METHOD, ExtractionPool
+from src.core.manager import ScraperManager
+from src.core.metrics import SCRAPE_ERRORS
+from src.scrapers.discount_scraper import DiscountScraper
+from src.scrapers.fourcamping import FourCampingScraper
+
+
+class BrokenScraper(DiscountScraper):
+    SITE = "broken"
+    PRODUCT_SELECTOR = "li.item"
+
+    def extract_discounts_from_soup(self, soup, url):
+        raise ValueError("unexpected markup")
+
+
+class TestExtractionPool(unittest.TestCase):
+    """Test cases for ExtractionPool."""
+
+    URL = "4camping://ropes"
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ExtractionPool({"4camping": FourCampingScraper, "broken": BrokenScraper}, workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_matches_in_thread_extraction(self):
+        """Test that a worker extracts the same discounts and next page as the scraper itself."""
+        loader = MockContentLoader()
+        scraper = FourCampingScraper(loader)
+        content = loader.fetch(self.URL)
+        expected, expected_next, _, _ = scraper.extract_from_content(content, self.URL)
+        discounts, next_url, parse_seconds, extract_seconds = self.pool.extract("4camping", content, self.URL)
+        self.assertTrue(expected)
+        self.assertEqual(discounts, expected)
+        self.assertEqual(next_url, expected_next)
+        self.assertGreater(parse_seconds, 0)
+        self.assertGreater(extract_seconds, 0)
+
+    def test_scraper_hands_pages_to_the_pool(self):
+        """Test that a scraper with a pool tags and returns the worker's discounts."""
+        scraper = FourCampingScraper(MockContentLoader())
+        expected = scraper.extract_discounts_from_url(self.URL, "ropes")
+        scraper.extraction_pool = self.pool
+        with patch.object(FourCampingScraper, 'extract_from_content', side_effect=AssertionError("ran in-thread")):
+            discounts = scraper.extract_discounts_from_url(self.URL, "ropes")
+        self.assertEqual(discounts, expected)
+        self.assertTrue(all(discount.category == "ropes" for discount in discounts))
+
+    @unittest.skipUnless(START_METHOD == "forkserver", "no fork server on this platform")
+    def test_workers_are_not_forked_from_fetch_threads(self):
+        """Test that a pool first used from a fetch thread starts its workers from the fork server."""
+        pool = ExtractionPool({"4camping": FourCampingScraper}, workers=1)
+        content = MockContentLoader().fetch(self.URL)
+        results = []
+        thread = threading.Thread(target=lambda: results.append(pool.extract("4camping", content, self.URL)))
+        try:
+            thread.start()
+            thread.join()
+            self.assertTrue(results[0][0])
+            self.assertEqual(pool._executor._mp_context.get_start_method(), "forkserver")
+        finally:
+            pool.close()
+
+    def test_worker_errors_fail_the_page(self):
+        """Test that an extraction error in a worker reaches the scraper like an in-thread one."""
+        scraper = BrokenScraper(MockContentLoader())
+        scraper.extraction_pool = self.pool
+        errors = SCRAPE_ERRORS.value("broken", "extract")
+        self.assertEqual(scraper._extract_discounts(b"<li class='item'>Rope</li>", "broken://ropes", "ropes"), [])
+        self.assertEqual(SCRAPE_ERRORS.value("broken", "extract"), errors + 1)
+
+
+class TestManagerExtractionWorkers(unittest.TestCase):
+    """Test cases for refreshing with extraction workers configured."""
+
+    def test_workers_extract_the_same_discounts(self):
+        """Test that the mock corpus yields the same slices with and without workers."""
+        categories = config.get_categories().keys()
+        # Without the mock corpus cache, so every page is extracted
+        with patch.dict(config.get_scraping_settings(), {'mock_cache_dir': None}):
+            expected = ScraperManager().fetch_discounts(categories)
+        with patch.dict(config.get_scraping_settings(), {'mock_cache_dir': None, 'extraction': {'workers': 2}}):
+            manager = ScraperManager()
+        try:
+            self.assertIsNotNone(manager.extraction_pool)
+            self.assertEqual(manager.fetch_discounts(categories), expected)
+        finally:
+            manager.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
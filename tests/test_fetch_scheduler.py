@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test suite for the fetch scheduler.
+Tests per-host and global concurrency caps of the (site, category, URL) job queue.
+"""
+
+import sys
+import os
+import threading
+import time
+import unittest
+from collections import Counter
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.fetch_scheduler import FetchJob, FetchScheduler
+
+
+class TestFetchScheduler(unittest.TestCase):
+    """Test cases for FetchScheduler class."""
+
+    def setUp(self):
+        self.jobs = [
+            FetchJob(site, "ropes", f"https://{site}.example/{page}")
+            for site in ("a", "b", "c")
+            for page in range(6)
+        ]
+
+    def _run_tracking(self, scheduler):
+        lock = threading.Lock()
+        active, peaks = Counter(), Counter()
+
+        def fetch(job):
+            with lock:
+                active[job.host] += 1
+                active["all"] += 1
+                peaks[job.host] = max(peaks[job.host], active[job.host])
+                peaks["all"] = max(peaks["all"], active["all"])
+            time.sleep(0.01)
+            with lock:
+                active[job.host] -= 1
+                active["all"] -= 1
+            return job.url
+
+        return scheduler.run(self.jobs, fetch), peaks
+
+    def test_results_keep_job_order(self):
+        """Test that results come back aligned with the submitted jobs."""
+        results, _ = self._run_tracking(FetchScheduler(max_concurrency=4, max_per_host=2))
+        self.assertEqual(results, [job.url for job in self.jobs])
+
+    def test_per_host_and_global_caps(self):
+        """Test that no host and no run exceeds its concurrency cap."""
+        _, peaks = self._run_tracking(FetchScheduler(max_concurrency=4, max_per_host=2))
+        for site in ("a", "b", "c"):
+            self.assertLessEqual(peaks[f"{site}.example"], 2)
+        self.assertLessEqual(peaks["all"], 4)
+        self.assertGreater(peaks["all"], 1)
+
+    def test_failed_job_yields_none(self):
+        """Test that a failing job does not stop the others."""
+        def fetch(job):
+            if job.url.endswith("/0"):
+                raise RuntimeError("boom")
+            return job.url
+
+        results = FetchScheduler().run(self.jobs, fetch)
+        self.assertEqual(results.count(None), 3)
+        self.assertEqual(len(results), len(self.jobs))
+
+    def test_mock_urls_are_grouped_by_site(self):
+        """Test that mock URLs use the site name as host."""
+        self.assertEqual(FetchJob("maszas", "ropes", "maszas://ropes").host, "maszas")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
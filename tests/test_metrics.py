@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test suite for the metrics module.
+Tests counters, gauges and histograms and their Prometheus text rendering.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.metrics import MetricsRegistry
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for MetricsRegistry and its metric types."""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter(self):
+        """Test that counters add up per label set and render with escaped labels."""
+        counter = self.registry.counter("errors_total", "Errors", ["site"])
+        counter.inc("maszas")
+        counter.inc("maszas", amount=2)
+        counter.inc('say "hi"')
+        self.assertEqual(counter.value("maszas"), 3)
+        self.assertEqual(self.registry.render(),
+                         "# HELP errors_total Errors\n"
+                         "# TYPE errors_total counter\n"
+                         'errors_total{site="maszas"} 3\n'
+                         'errors_total{site="say \\"hi\\""} 1\n')
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that observations land in the first bucket whose bound they don't exceed."""
+        histogram = self.registry.histogram("fetch_seconds", "Fetch latency", ["host"], buckets=(0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value, "shop.example")
+        lines = self.registry.render().splitlines()
+        self.assertIn('fetch_seconds_bucket{host="shop.example",le="0.1"} 2', lines)
+        self.assertIn('fetch_seconds_bucket{host="shop.example",le="1"} 3', lines)
+        self.assertIn('fetch_seconds_bucket{host="shop.example",le="+Inf"} 4', lines)
+        self.assertIn('fetch_seconds_sum{host="shop.example"} 3.65', lines)
+        self.assertIn('fetch_seconds_count{host="shop.example"} 4', lines)
+
+    def test_histogram_timer(self):
+        """Test that time() observes the with block even when it raises."""
+        histogram = self.registry.histogram("job_seconds", "Job duration", ["job"])
+        with self.assertRaises(RuntimeError):
+            with histogram.time("all"):
+                raise RuntimeError("failed")
+        self.assertEqual(histogram.count("all"), 1)
+
+    def test_gauge_function(self):
+        """Test that a function gauge is read at render time and skipped while it has no value."""
+        value = [None]
+        self.registry.gauge("age_seconds", "Age", function=lambda: value[0])
+        self.assertNotIn("\nage_seconds ", self.registry.render())
+        value[0] = 12.5
+        self.assertIn("age_seconds 12.5\n", self.registry.render())
+
+    def test_wrong_labels_and_duplicates_are_rejected(self):
+        """Test that label count mismatches and duplicate names fail loudly."""
+        counter = self.registry.counter("requests_total", "Requests", ["route", "status"])
+        with self.assertRaises(ValueError):
+            counter.inc("/")
+        with self.assertRaises(ValueError):
+            self.registry.counter("requests_total", "Requests again")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
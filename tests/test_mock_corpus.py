@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test suite for the mock corpus.
+Tests that extractions of mock pages are reused until the page, parser or scraper code changes,
+and that pre-extracted fixtures stand in for missing pages.
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core import mock_corpus, page_cache
+from src.core.config import config
+from src.core.content_loader import MockContentLoader
+from src.core.mock_corpus import MockCorpus
+from src.core.page_cache import PageNotModified
+from src.scrapers.fourcamping import FourCampingScraper
+
+URL = "4camping://ropes"
+
+
+class TestMockCorpus(unittest.TestCase):
+    """Test cases for MockCorpus."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.mocks_dir = os.path.join(self.directory, "mocks")
+        os.makedirs(self.mocks_dir)
+        self.page = os.path.join(self.mocks_dir, "4camping_ropes.html")
+        shutil.copy(config.get_mock_file_path("4camping", "ropes"), self.page)
+        self.expected = FourCampingScraper(MockContentLoader()).extract_discounts_from_url(URL, "ropes")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def scraper(self, parser="html.parser"):
+        corpus = MockCorpus(os.path.join(self.directory, "cache"), parser, mocks_dir=self.mocks_dir)
+        return FourCampingScraper(MockContentLoader(parser=parser, corpus=corpus))
+
+    def test_unchanged_pages_are_not_parsed_again(self):
+        """Test that a second fetch, even from a new process's corpus, reuses the extraction."""
+        self.assertEqual(self.scraper().extract_discounts_from_url(URL, "ropes"), self.expected)
+        scraper = self.scraper()
+        with self.assertRaises(PageNotModified):
+            scraper.content_loader.fetch(URL)
+        with patch.object(FourCampingScraper, 'extract_discounts_from_soup', side_effect=AssertionError("parsed")):
+            self.assertEqual(scraper.extract_discounts_from_url(URL, "ropes"), self.expected)
+        self.assertEqual(scraper.content_loader.page_cache.stats(), {"hits": 2, "misses": 0})
+
+    def test_unchanged_files_are_hashed_once(self):
+        """Test that the file is only mapped and hashed again after its mtime changes."""
+        corpus = self.scraper().content_loader.page_cache
+        with patch.object(mock_corpus, '_mapped', wraps=mock_corpus._mapped) as mapped:
+            digest = corpus.file_hash(self.page)
+            self.assertEqual(corpus.file_hash(self.page), digest)
+            self.assertEqual(mapped.call_count, 1)
+            os.utime(self.page, ns=(0, 0))
+            self.assertEqual(corpus.file_hash(self.page), digest)
+            self.assertEqual(mapped.call_count, 2)
+
+    def test_edited_page_parser_or_scraper_code_invalidates(self):
+        """Test that the extraction is redone when the page, the parser or the extraction code changes."""
+        self.scraper().extract_discounts_from_url(URL, "ropes")
+        with open(self.page, "ab") as f:
+            f.write(b"<!-- edited -->")
+        self.assertIsInstance(self.scraper().content_loader.fetch(URL), bytes)
+        self.scraper().extract_discounts_from_url(URL, "ropes")
+        self.assertIsInstance(self.scraper("lxml").content_loader.fetch(URL), bytes)
+        with patch.object(page_cache, '_extractor_version', "changed"):
+            self.assertIsInstance(self.scraper().content_loader.fetch(URL), bytes)
+
+    def test_fixture_stands_in_for_a_missing_page(self):
+        """Test that a pre-extracted fixture is served when the page has no HTML file."""
+        fixture = {'url': URL, 'discounts': [d.model_dump() for d in self.expected], 'next_page': None}
+        for discount in fixture['discounts']:
+            discount['category'] = None
+        with open(os.path.join(self.mocks_dir, "4camping_ropes.json"), "w") as f:
+            json.dump(fixture, f)
+        os.remove(self.page)
+        self.assertEqual(self.scraper().extract_discounts_from_url(URL, "ropes"), self.expected)
+
+    def test_missing_page_without_fixture_fails(self):
+        """Test that a page with neither HTML nor fixture fails like a missing mock file."""
+        os.remove(self.page)
+        with self.assertRaises(FileNotFoundError):
+            self.scraper().content_loader.fetch(URL)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test suite for the raw-page archive.
+Records responses from a local stand-in shop, then replays them offline through a scraper.
+"""
+
+import sys
+import os
+import glob
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpx
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import config
+from src.core.content_loader import AsyncHttpContentLoader, MockContentLoader, ReplayContentLoader
+from src.core.manager import ScraperManager
+from src.core.page_archive import PageArchive, PageNotArchived
+from src.scrapers.fourcamping import FourCampingScraper
+
+with open(config.get_mock_file_path("4camping", "ropes"), "rb") as f:
+    ROPES = f.read()
+
+
+class StandInShopHandler(BaseHTTPRequestHandler):
+    """Serves the 4camping ropes mock at /ropes and fails everything else."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body, status = (ROPES, 200) if self.path == "/ropes" else (b"oops", 500)
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPageArchive(unittest.TestCase):
+    """Test cases for PageArchive and ReplayContentLoader."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInShopHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.archive = PageArchive(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_bodies_are_stored_once_compressed(self):
+        """Test that identical bodies share one compressed object across crawls."""
+        self.archive.record("https://shop.example/a", 200, {"ETag": '"1"'}, ROPES)
+        self.archive.new_crawl()
+        self.archive.record("https://shop.example/a", 200, {}, ROPES)
+        self.archive.record("https://shop.example/b", 200, {}, ROPES)
+        objects = glob.glob(os.path.join(self.directory, "objects", "*", "*.gz"))
+        self.assertEqual(len(objects), 1)
+        self.assertLess(os.path.getsize(objects[0]), len(ROPES) / 3)
+        self.assertEqual(len(self.archive.crawls()), 2)
+        first = self.archive.entries(self.archive.crawls()[0])[0]
+        self.assertEqual((first["status"], first["headers"], first["size"]), (200, {"etag": '"1"'}, len(ROPES)))
+
+    def test_pages_as_of_a_crawl(self):
+        """Test that a crawl replays the latest body of every URL up to it, resolving 304s."""
+        first = self.archive.new_crawl()
+        self.archive.record("https://shop.example/a", 200, {}, b"a1")
+        self.archive.record("https://shop.example/b", 200, {}, b"b1")
+        second = self.archive.new_crawl()
+        self.archive.record("https://shop.example/a", 304, {}, None)
+        self.archive.record("https://shop.example/b", 200, {}, b"b2")
+        read = lambda crawl: {url: self.archive.read(entry["sha256"]) for url, entry in self.archive.pages(crawl).items()}
+        self.assertEqual(read(first), {"https://shop.example/a": b"a1", "https://shop.example/b": b"b1"})
+        self.assertEqual(read(second), {"https://shop.example/a": b"a1", "https://shop.example/b": b"b2"})
+        self.assertEqual(read(None), read(second))
+        with self.assertRaises(PageNotArchived):
+            self.archive.pages("19700101T000000Z")
+
+    def test_recorded_refresh_replays_offline(self):
+        """Test that pages fetched by a live loader extract the same discounts when replayed."""
+        loader = AsyncHttpContentLoader()
+        loader.archive = self.archive
+        url = f"{self.base_url}/ropes"
+        self.assertEqual(loader.fetch(url), ROPES)
+        with self.assertRaises(httpx.HTTPStatusError):
+            loader.fetch(f"{self.base_url}/broken")
+        loader.close()
+
+        replay = ReplayContentLoader(self.archive)
+        self.assertEqual(replay.fetch(url), ROPES)
+        with self.assertRaises(httpx.HTTPStatusError):
+            replay.fetch(f"{self.base_url}/broken")
+        with self.assertRaises(PageNotArchived):
+            replay.fetch(f"{self.base_url}/never-fetched")
+        expected = FourCampingScraper(MockContentLoader()).extract_discounts_from_url("4camping://ropes", "ropes")
+        self.assertTrue(expected)
+        self.assertEqual(FourCampingScraper(replay).extract_discounts_from_url(url, "ropes"), expected)
+
+    @patch('src.core.config.config.is_production', return_value=True)
+    def test_manager_replays_instead_of_fetching(self, mock_is_production):
+        """Test that REPLAY_CRAWL swaps every live loader for the archive's replay loader."""
+        self.archive.record("https://shop.example/a", 200, {}, b"a")
+        settings = {'archive': {'directory': self.directory}}
+        with patch.dict(config.get_scraping_settings(), settings), patch.dict(os.environ, {'REPLAY_CRAWL': 'latest'}):
+            manager = ScraperManager()
+        for scraper in manager.get_scrapers().values():
+            self.assertIsInstance(scraper.content_loader, ReplayContentLoader)
+            self.assertEqual(scraper.content_loader.crawl, self.archive.crawls()[-1])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
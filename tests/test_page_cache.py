@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test suite for the conditional-GET page cache.
+Tests 304 and unchanged-body reuse of extracted discounts against a local server.
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core import page_cache
+from src.core.content_loader import AsyncHttpContentLoader, HttpContentLoader
+from src.core.page_cache import PageCache
+from src.dto.discount import Discount
+from src.dto.discount_url import DiscountUrl
+from src.scrapers.discount_scraper import DiscountScraper
+
+
+class ShopHandler(BaseHTTPRequestHandler):
+    """Serves /etag with an ETag and /plain without validators."""
+    body = b"<ul><li class='item'>Rope</li><li class='item'>Cam</li></ul>"
+    not_modified = 0
+
+    def do_GET(self):
+        if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            ShopHandler.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if self.path == "/etag":
+            self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ItemScraper(DiscountScraper):
+    def extract_discounts_from_soup(self, soup, url):
+        return [
+            Discount(product=item.get_text(strip=True), url=url, image_url=None, old_price="2", new_price="1")
+            for item in soup.select("li.item")
+        ]
+
+
+class TestPageCache(unittest.TestCase):
+    """Test cases for PageCache with the HTTP loaders."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ShopHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        ShopHandler.not_modified = 0
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def _scrape_twice(self, loader, url):
+        scraper = ItemScraper(loader, [DiscountUrl(category="ropes", url=url)])
+        first = scraper.extract_discounts_by_category("ropes")
+        with patch.object(loader, "parse", wraps=loader.parse) as parse:
+            second = scraper.extract_discounts_by_category("ropes")
+        return first, second, parse.call_count
+
+    def test_not_modified_reuses_discounts(self):
+        """Test that a 304 answer skips parsing and returns the previous discounts."""
+        cache = PageCache(self.cache_dir.name)
+        first, second, parses = self._scrape_twice(HttpContentLoader(timeout=5, page_cache=cache), self.base_url + "/etag")
+        self.assertEqual(parses, 0)
+        self.assertEqual(ShopHandler.not_modified, 1)
+        self.assertEqual([d.model_dump() for d in second], [d.model_dump() for d in first])
+        self.assertEqual(second[0].category, "ropes")
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_identical_body_reuses_discounts(self):
+        """Test that an unchanged body without validators is recognized by its hash."""
+        cache = PageCache(self.cache_dir.name)
+        loader = AsyncHttpContentLoader(timeout=5, page_cache=cache)
+        try:
+            first, second, parses = self._scrape_twice(loader, self.base_url + "/plain")
+        finally:
+            loader.close()
+        self.assertEqual(parses, 0)
+        self.assertEqual(len(second), 2)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_cache_survives_restart(self):
+        """Test that validators and discounts are read back from disk by a new cache."""
+        url = self.base_url + "/etag"
+        ItemScraper(HttpContentLoader(page_cache=PageCache(self.cache_dir.name)),
+                    [DiscountUrl(category="ropes", url=url)]).extract_discounts_by_category("ropes")
+        cache = PageCache(self.cache_dir.name)
+        self.assertEqual(cache.request_headers(url), {"If-None-Match": '"v1"'})
+        self.assertEqual(len(cache.discounts(url)), 2)
+
+    def test_failed_extraction_keeps_last_good_discounts(self):
+        """Test that a changed body keeps the previous discounts and validators until its own are stored."""
+        url = self.base_url + "/etag"
+        cache = PageCache(self.cache_dir.name)
+        cache.check_response(url, 200, b"v1", {"etag": '"v1"'})
+        rope = Discount(product="Rope", url=url, image_url=None, old_price="2", new_price="1").model_dump()
+        cache.store_discounts(url, [rope], None)
+        # A changed body whose extraction then fails
+        cache.check_response(url, 200, b"v2", {"etag": '"v2"'})
+        restarted = PageCache(self.cache_dir.name)
+        self.assertEqual(restarted.discounts(url), [rope])
+        self.assertEqual(restarted.request_headers(url), {"If-None-Match": '"v1"'})
+        scraper = ItemScraper(HttpContentLoader(page_cache=restarted))
+        self.assertEqual(scraper._fallback(url)[1], None)
+        self.assertEqual([d.product for d in scraper._fallback(url)[0]], ["Rope"])
+
+        restarted.check_response(url, 200, b"v2", {"etag": '"v2"'})
+        cam = Discount(product="Cam", url=url, image_url=None, old_price="2", new_price="1").model_dump()
+        restarted.store_discounts(url, [cam], None)
+        cache = PageCache(self.cache_dir.name)
+        self.assertEqual(cache.discounts(url), [cam])
+        self.assertEqual(cache.request_headers(url), {"If-None-Match": '"v2"'})
+
+    def test_other_parser_or_extraction_code_extracts_again(self):
+        """Test that discounts extracted by another parser or another version of the extraction code are not reused."""
+        url = self.base_url + "/etag"
+        cache = PageCache(self.cache_dir.name)
+        cache.check_response(url, 200, b"v1", {"etag": '"v1"'})
+        cache.store_discounts(url, [], None)
+        self.assertEqual(PageCache(self.cache_dir.name).request_headers(url), {"If-None-Match": '"v1"'})
+        self.assertEqual(PageCache(self.cache_dir.name, "lxml").request_headers(url), {})
+        with patch.object(page_cache, '_extractor_version', "changed"):
+            restarted = PageCache(self.cache_dir.name)
+            self.assertEqual(restarted.request_headers(url), {})
+            # The same body is parsed again rather than answered from the stale extraction
+            restarted.check_response(url, 200, b"v1", {"etag": '"v1"'})
+            self.assertEqual(restarted.stats(), {"hits": 0, "misses": 1})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
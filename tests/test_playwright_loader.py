@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Playwright content loader.
+Tests browser startup, the page pool, asset blocking and shutdown against a fake Playwright,
+so no Chromium is needed.
+"""
+
+import sys
+import os
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.content_loader import PlaywrightContentLoader
+from src.core.resilient_loader import FetchTimeoutError, ResilientContentLoader
+from src.scrapers.mountex import MountexScraper
+
+PAGE = "<div class='bg-white rounded-16'>Rope</div>"
+MOUNTEX_PAGE = (
+    "<div class='bg-white rounded-16'><span class='bg-brand-highlight'>-20%</span>"
+    "<a class='text-black unstyled' href='/beal-rope'><div class='font-bold font-lora'>Beal</div><div>Rope</div></a>"
+    "<div class='originalPrice'>10 000 Ft</div><div class='inActionPrice'>8 000 Ft</div></div>"
+)
+
+
+class FakePage:
+    # Whether no page renders its products (as when the shop is broken or blocks the browser)
+    unrendered = False
+
+    def __init__(self, context):
+        self.context = context
+        self.url = None
+        self.closed = False
+
+    async def goto(self, url):
+        browser = self.context.browser
+        browser.in_use += 1
+        browser.peak = max(browser.peak, browser.in_use)
+        try:
+            await asyncio.sleep(0.02)
+            if "crash" in url:
+                self.closed = True
+                raise RuntimeError("Target page crashed")
+            self.url = url
+            return None
+        finally:
+            browser.in_use -= 1
+
+    async def wait_for_selector(self, selector, timeout=None):
+        if self.unrendered or "empty" in self.url:
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded waiting for {selector}")
+
+    async def content(self):
+        return PAGE
+
+    def is_closed(self):
+        return self.closed
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.routes = []
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.closed = False
+        self.in_use = 0
+        self.peak = 0
+
+    async def new_context(self):
+        self.contexts.append(FakeContext(self))
+        return self.contexts[-1]
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePlaywright:
+    """Stands in for async_playwright(); start() takes start_delay seconds."""
+
+    def __init__(self, start_delay=0.0):
+        self.start_delay = start_delay
+        self.browsers = []
+        self.starts = 0
+        self.stopped = 0
+        self.chromium = self
+
+    def __call__(self):
+        return self
+
+    async def start(self):
+        self.starts += 1
+        await asyncio.sleep(self.start_delay)
+        return self
+
+    async def launch(self):
+        self.browsers.append(FakeBrowser())
+        return self.browsers[-1]
+
+    async def stop(self):
+        self.stopped += 1
+
+
+class TestPlaywrightContentLoader(unittest.TestCase):
+    """Test cases for PlaywrightContentLoader."""
+
+    URL = "https://shop.example/ropes/"
+
+    def setUp(self):
+        self.playwright = FakePlaywright()
+        patcher = patch('playwright.async_api.async_playwright', self.playwright)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.loader = PlaywrightContentLoader(pool_size=2)
+        self.addCleanup(self.loader.close)
+
+    def test_timeout_during_startup_does_not_break_later_fetches(self):
+        """Test that a fetch timing out while Chromium starts leaves the startup running for the next fetch."""
+        self.playwright.start_delay = 0.5
+        resilient = ResilientContentLoader(self.loader, timeout=0.1, retries=0, sleep=lambda delay: None)
+        with self.assertRaises(FetchTimeoutError):
+            resilient.fetch(self.URL)
+        self.assertEqual(self.loader.fetch(self.URL), PAGE.encode("utf-8"))
+        self.assertEqual(self.playwright.starts, 1)
+
+    def test_failed_startup_closes_the_browser_and_is_retried(self):
+        """Test that a startup failing after launch closes the browser and the next fetch starts again."""
+        with patch.object(FakeBrowser, 'new_context', side_effect=RuntimeError("no context")):
+            with self.assertRaises(RuntimeError):
+                self.loader.fetch(self.URL)
+        self.assertTrue(self.playwright.browsers[0].closed)
+        self.assertEqual(self.playwright.stopped, 1)
+        self.assertEqual(self.loader.fetch(self.URL), PAGE.encode("utf-8"))
+        self.assertEqual(self.playwright.starts, 2)
+
+    def test_pages_are_pooled(self):
+        """Test that concurrent fetches share pool_size pages, each in its own context."""
+        async def fetch_all():
+            return await asyncio.gather(*(self.loader.fetch_async(f"{self.URL}?page={i}") for i in range(6)))
+
+        self.assertEqual(asyncio.run(fetch_all()), [PAGE.encode("utf-8")] * 6)
+        browser = self.playwright.browsers[0]
+        self.assertEqual(len(browser.contexts), 2)
+        self.assertEqual(browser.peak, 2)
+        self.assertEqual([pattern for context in browser.contexts for pattern, _ in context.routes], ["**/*"] * 2)
+
+    def test_assets_are_blocked(self):
+        """Test that images, fonts, stylesheets and media are aborted and everything else continues."""
+        class Route:
+            def __init__(self, resource_type):
+                self.request = type("Request", (), {"resource_type": resource_type})()
+                self.outcome = None
+
+            async def abort(self):
+                self.outcome = "abort"
+
+            async def continue_(self):
+                self.outcome = "continue"
+
+        self.loader.fetch(self.URL)
+        _, handler = self.playwright.browsers[0].contexts[0].routes[0]
+        for resource_type, outcome in [("image", "abort"), ("font", "abort"), ("stylesheet", "abort"),
+                                       ("media", "abort"), ("document", "continue"), ("script", "continue")]:
+            route = Route(resource_type)
+            self.loader._run(handler(route))
+            self.assertEqual(route.outcome, outcome, resource_type)
+
+    def test_closed_page_is_replaced_and_its_context_closed(self):
+        """Test that a page that crashed is dropped with its context and its slot reopened."""
+        with self.assertRaises(RuntimeError):
+            self.loader.fetch(f"{self.URL}crash")
+        browser = self.playwright.browsers[0]
+        self.assertEqual([context.closed for context in browser.contexts], [True, False])
+        for _ in range(3):
+            self.loader.fetch(self.URL)
+        self.assertEqual(len(browser.contexts), 3)
+        self.assertEqual(self.loader._pages.qsize(), 2)
+
+    def test_failing_replacement_keeps_the_slot(self):
+        """Test that a slot whose new page can't be opened stays in the pool and is retried."""
+        self.loader.pool_size = 1
+        with self.assertRaises(RuntimeError):
+            self.loader.fetch(f"{self.URL}crash")
+        with patch.object(FakeBrowser, 'new_context', side_effect=RuntimeError("no context")):
+            with self.assertRaises(RuntimeError):
+                self.loader.fetch(self.URL)
+        self.assertEqual(self.loader._pages.qsize(), 1)
+        self.assertEqual(self.loader.fetch(self.URL), PAGE.encode("utf-8"))
+
+    def test_later_page_without_products_is_not_an_error(self):
+        """Test that a later listing page the product selector never appears on is read, not raised."""
+        self.loader.later_page = MountexScraper.is_later_page
+        self.assertEqual(self.loader.fetch(f"{self.URL}?page=99&empty"), PAGE.encode("utf-8"))
+        with self.assertRaises(PlaywrightTimeoutError):
+            self.loader.fetch(f"{self.URL}?empty")
+
+    def test_first_page_timeout_falls_back(self):
+        """Test that a first page whose products never render fails and serves its last good discounts."""
+        self.loader.later_page = MountexScraper.is_later_page
+        scraper = MountexScraper(ResilientContentLoader(self.loader, retries=0, sleep=lambda delay: None))
+        url = "https://mountex.hu/sziklamaszas-hegymaszas?v=109"
+        with patch.object(FakePage, 'content', return_value=MOUNTEX_PAGE):
+            discounts = scraper.extract_discounts_from_url(url, "ropes")
+            self.assertEqual([d.product for d in discounts], ["Beal Rope"])
+            with patch.object(FakePage, 'unrendered', True):
+                self.assertEqual(scraper.extract_discounts_from_url(url, "ropes"), discounts)
+
+    def test_close_stops_the_browser(self):
+        """Test that close() closes Chromium and stops Playwright, and a later fetch starts them again."""
+        self.loader.close()
+        self.assertEqual(self.playwright.starts, 0)
+        self.loader.fetch(self.URL)
+        self.loader.close()
+        self.assertTrue(self.playwright.browsers[0].closed)
+        self.assertEqual(self.playwright.stopped, 1)
+        self.loader.fetch(self.URL)
+        self.assertEqual(self.playwright.starts, 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
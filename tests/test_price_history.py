@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test suite for the price history store.
+Tests appending refreshes, per-product history, lowest-price queries and reopening from disk.
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dto.discount import Discount
+from src.services.price_history import DAY, PriceHistory, PricePoint
+
+NOW = 1760000000
+
+
+def make_discount(url, new_price_minor, percent_off=10, currency="HUF"):
+    return Discount(product=url, url=url, image_url=None, old_price="", new_price="", currency=currency,
+                    old_price_minor=new_price_minor * 2, new_price_minor=new_price_minor, percent_off=percent_off)
+
+
+class TestPriceHistory(unittest.TestCase):
+    """Test cases for PriceHistory."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.history = PriceHistory(self.tmp.name)
+        # Three refreshes over ten days; "b" disappears after the first
+        self.history.append([make_discount("a", 500), make_discount("b", 900)], timestamp=NOW - 10 * DAY)
+        self.history.append([make_discount("a", 400)], timestamp=NOW - 2 * DAY)
+        self.history.append([make_discount("a", 450, percent_off=None)], timestamp=NOW)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_history_is_ordered_and_complete(self):
+        self.assertEqual(self.history.history("a", now=NOW), [
+            PricePoint(NOW - 10 * DAY, 500, 1000, "HUF", 10),
+            PricePoint(NOW - 2 * DAY, 400, 800, "HUF", 10),
+            PricePoint(NOW, 450, 900, "HUF", None),
+        ])
+        self.assertEqual([p.new_price_minor for p in self.history.history("b", now=NOW)], [900])
+        self.assertEqual(self.history.history("unknown", now=NOW), [])
+
+    def test_window(self):
+        self.assertEqual([p.new_price_minor for p in self.history.history("a", days=5, now=NOW)], [400, 450])
+        self.assertEqual(self.history.history("b", days=5, now=NOW), [])
+
+    def test_lowest_price(self):
+        self.assertEqual(self.history.lowest_price("a", days=30, now=NOW).new_price_minor, 400)
+        self.assertEqual(self.history.lowest_price("a", days=1, now=NOW).new_price_minor, 450)
+        self.assertIsNone(self.history.lowest_price("b", days=5, now=NOW))
+
+    def test_reopen_and_new_rows_from_other_writer(self):
+        """Test that a second instance reads the same data and sees rows another instance appends."""
+        reader = PriceHistory(self.tmp.name)
+        self.assertEqual(reader.history("a", now=NOW), self.history.history("a", now=NOW))
+        self.history.append([make_discount("c", 100), make_discount("a", 300)], timestamp=NOW)
+        self.assertEqual(reader.lowest_price("a", now=NOW).new_price_minor, 300)
+        self.assertEqual(len(reader.history("c", now=NOW)), 1)
+
+    def test_interrupted_append_is_ignored(self):
+        """Test that a ragged tail left by a crash mid-append does not corrupt reads."""
+        day_dir = os.path.join(self.tmp.name, sorted(os.listdir(self.tmp.name))[-2])
+        with open(os.path.join(day_dir, "product_id"), "ab") as f:
+            f.write(b"\x00\x00")
+        self.assertEqual(len(PriceHistory(self.tmp.name).history("a", now=NOW)), 3)
+
+    def test_appends_after_an_interrupted_append_stay_aligned(self):
+        """Test that later rows and products are read correctly after a partial row and a partial URL."""
+        day_dir = os.path.join(self.tmp.name, sorted(os.listdir(self.tmp.name))[-2])
+        with open(os.path.join(day_dir, "product_id"), "ab") as f:
+            f.write(b"\x05\x00\x00\x00\x07\x00")
+        with open(os.path.join(day_dir, "timestamp"), "ab") as f:
+            f.write(b"\x01\x00")
+        with open(os.path.join(self.tmp.name, "products.txt"), "ab") as f:
+            f.write(b"https://interrupt")
+        writer = PriceHistory(self.tmp.name)
+        writer.append([make_discount("c", 100), make_discount("a", 300)], timestamp=NOW)
+        writer.append([make_discount("d", 200)], timestamp=NOW)
+        for history in (writer, PriceHistory(self.tmp.name)):
+            self.assertEqual(history.history("c", now=NOW), [PricePoint(NOW, 100, 200, "HUF", 10)])
+            self.assertEqual(history.history("d", now=NOW), [PricePoint(NOW, 200, 400, "HUF", 10)])
+            self.assertEqual([p.new_price_minor for p in history.history("a", now=NOW)], [500, 400, 450, 300])
+            self.assertEqual(history.history("https://interrupt", now=NOW), [])
+
+    def test_rows_are_compact(self):
+        """Test that a row costs a few dozen bytes, with URLs stored once."""
+        day_dirs = [os.path.join(self.tmp.name, d) for d in os.listdir(self.tmp.name) if d != "products.txt"]
+        total = sum(os.path.getsize(os.path.join(d, f)) for d in day_dirs for f in os.listdir(d))
+        self.assertLessEqual(total, 4 * 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test suite for price normalization.
+Tests parsing of the shops' price and discount formats and the numeric sort order.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests import use_temporary_storage
+
+# Keep the snapshot, its refresher lock and the caches out of the project's .cache (before importing src)
+use_temporary_storage()
+
+from src.core.price_parser import Price, parse_percent, parse_price, parse_prices, percent_off
+from src.dto.discount import Discount
+from src.scrapers.discount_scraper import normalize_discounts
+from src.services.discount_service import _group_by_category
+
+
+class TestPriceParser(unittest.TestCase):
+    """Test cases for the price parser."""
+
+    def test_shop_formats(self):
+        """Test the price formats the shops print."""
+        cases = {
+            "10.990 Ft": Price(1099000, "HUF"),
+            "5\xa0200Ft": Price(520000, "HUF"),
+            "99.999 Ft -tól": Price(9999900, "HUF"),
+            "999 Ft": Price(99900, "HUF"),
+            "€ 5,50": Price(550, "EUR"),
+            "                        € 139,36": Price(13936, "EUR"),
+            "1.234,5 EUR": Price(123450, "EUR"),
+            "1,234.56 €": Price(123456, "EUR"),
+        }
+        for text, price in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_price(text), price)
+
+    def test_unparseable(self):
+        self.assertIsNone(parse_price(""))
+        self.assertIsNone(parse_price(None))
+        self.assertIsNone(parse_price("Ingyenes"))
+        self.assertEqual(parse_price("42", default_currency="HUF"), Price(4200, "HUF"))
+        self.assertEqual(parse_prices(["1 Ft", None]), [Price(100, "HUF"), None])
+
+    def test_percent(self):
+        for text in ("-15%", "to -15%", "15 %", "from -15"):
+            with self.subTest(text=text):
+                self.assertEqual(parse_percent(text), 15)
+        self.assertIsNone(parse_percent("%"))
+
+    def test_percent_off_is_exact(self):
+        """Test that integer arithmetic avoids float truncation (2400 -> 1800 is 25%, not 24%)."""
+        self.assertEqual(percent_off(parse_price("2.400 Ft"), parse_price("1.800 Ft")), 25)
+        self.assertEqual(percent_off(parse_price("€ 10,00"), parse_price("€ 9,99")), 0)
+        self.assertIsNone(percent_off(parse_price("10 Ft"), parse_price("€ 5")))
+
+
+class TestNormalization(unittest.TestCase):
+    """Test cases for discount normalization and ordering."""
+
+    def make_discount(self, url, old_price, new_price, discount_percent=""):
+        return Discount(product=url, url=url, image_url=None, old_price=old_price, new_price=new_price,
+                        category="ropes", discount_percent=discount_percent)
+
+    def test_label_wins_over_prices(self):
+        discount, = normalize_discounts([self.make_discount("a", "€ 20,00", "€ 15,00", "to -30%")])
+        self.assertEqual((discount.percent_off, discount.discount_percent), (30, "-30"))
+        self.assertEqual((discount.old_price_minor, discount.new_price_minor, discount.currency), (2000, 1500, "EUR"))
+
+    def test_sorted_numerically(self):
+        """Test that -50 ranks above -9, unlike string order."""
+        discounts = normalize_discounts([
+            self.make_discount("nine", "100 Ft", "91 Ft"),
+            self.make_discount("fifty", "100 Ft", "50 Ft"),
+            self.make_discount("none", "", ""),
+        ])
+        ordered = _group_by_category({("ropes", "maszas"): discounts}, ["ropes"])["ropes"]
+        self.assertEqual([d.url for d in ordered], ["fifty", "nine", "none"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test suite for cross-shop product matching.
+Tests tokenization, matching across shops and the cheapest-first offer groups.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.product_matcher import ProductMatcher, product_tokens
+
+
+def make_record(product, site, price, currency="HUF", percent_off=10):
+    return {'product': product, 'url': f"{site}/{product}", 'site': site, 'new_price_minor': price,
+            'currency': currency, 'percent_off': percent_off}
+
+
+RECORDS = [
+    make_record("Beal Stinger 9.4 mm (60 m) Hegymászó kötél", "4camping", 8000000),
+    make_record("Beal Zenith 9,5 mm (60 m) Hegymászó kötél", "4camping", 5000000),
+    make_record("Beal Virus 10 mm (60 m) Hegymászó kötél", "4camping", 6000000),
+    make_record("Beal Stinger III 9.4 mm Single rope", "Bergfreunde", 17000, "EUR", 25),
+    make_record("Beal Zenith 9.5 Single rope", "Bergfreunde", 14000, "EUR"),
+    make_record("Beal Opera 8,5 mm Single rope", "Bergfreunde", 20000, "EUR"),
+    make_record("Edelrid Liner kötélzsák", "Maszas", 900000),
+    make_record("Edelrid Liner Rope bag", "Bergfreunde", 2500, "EUR"),
+    make_record("Edelrid Boa 9,8 mm-es falmászókötél", "Maszas", 5000000),
+]
+
+
+class TestProductMatcher(unittest.TestCase):
+    """Test cases for ProductMatcher."""
+
+    def test_tokens(self):
+        self.assertEqual(product_tokens("C.A.M.P. Ball Nut N.2 Ék"), ["camp", "ball", "nut", "n", "2", "ek"])
+        self.assertEqual(product_tokens("Beal Karma 9,8 mm-es"), ["beal", "karma", "9.8", "mm", "es"])
+
+    def test_groups_same_product_across_shops(self):
+        groups = ProductMatcher().match([r['product'] for r in RECORDS], [r['site'] for r in RECORDS])
+        self.assertEqual(sorted(sorted(group) for group in groups), [[0, 3], [1, 4]])
+
+    def test_same_shop_is_not_a_group(self):
+        records = [make_record("Beal Zenith 9,5 mm (50 m)", "4camping", 1), make_record("Beal Zenith 9,5 mm (60 m)", "4camping", 2)]
+        self.assertEqual(ProductMatcher().group_offers(records), ())
+
+    def test_offers_cheapest_first(self):
+        """Test that offers are ordered by price converted to a common currency."""
+        groups = ProductMatcher({'rates': {'EUR': 400}}).group_offers(RECORDS)
+        stinger = next(group for group in groups if 'Stinger' in group['product'])
+        self.assertEqual([offer['site'] for offer in stinger['offers']], ["Bergfreunde", "4camping"])
+        zenith = next(group for group in groups if 'Zenith' in group['product'])
+        self.assertEqual([offer['site'] for offer in zenith['offers']], ["4camping", "Bergfreunde"])
+        self.assertIs(groups[0], stinger)  # Best discount of the cheapest offer first
+
+    def test_candidates_come_from_shared_rare_tokens(self):
+        """Test that products sharing only common tokens are never compared."""
+        matcher = ProductMatcher()
+        matcher.match([r['product'] for r in RECORDS], [r['site'] for r in RECORDS])
+        pairs_across_shops_by_brand = 3 * 3 + 1 * 2
+        self.assertLess(matcher.comparisons, pairs_across_shops_by_brand)
+
+
+if __name__ == '__main__':
+    unittest.main()
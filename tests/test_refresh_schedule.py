@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test suite for per-slice refresh scheduling.
+Tests interval overrides, adaptive back-off and slice-only refreshes.
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests import use_temporary_storage
+
+# Keep the snapshot, its refresher lock and the caches out of the project's .cache (before importing src)
+use_temporary_storage()
+
+from src.core.content_loader import MockContentLoader
+from src.services.discount_service import discount_store, get_refresh_slices, refresh_slice_job
+from src.services.refresh_schedule import RefreshSchedule
+
+
+class TestRefreshSchedule(unittest.TestCase):
+    """Test cases for RefreshSchedule class."""
+
+    def setUp(self):
+        self.schedule = RefreshSchedule({
+            'interval_hours': 12,
+            'jitter_minutes': 5,
+            'max_backoff': 4,
+            'sites': {'mountex': {'interval_hours': 24}},
+            'categories': {'ropes': {'interval_hours': 6}},
+        })
+
+    def test_overrides(self):
+        """Test that site and category overrides apply and the shorter one wins."""
+        self.assertEqual(self.schedule.interval_hours('slings', 'maszas'), 12)
+        self.assertEqual(self.schedule.interval_hours('slings', 'mountex'), 24)
+        self.assertEqual(self.schedule.interval_hours('ropes', 'mountex'), 6)
+        self.assertEqual(self.schedule.jitter_seconds, 300)
+
+    def test_backoff_doubles_until_cap_and_resets(self):
+        """Test that unchanged refreshes back off and a change resets the interval."""
+        intervals = [self.schedule.record('slings', 'maszas', changed=False) for _ in range(4)]
+        self.assertEqual(intervals, [24, 48, 48, 48])
+        self.assertEqual(self.schedule.interval_hours('slings', 'bergfreunde'), 12)
+        self.assertEqual(self.schedule.record('slings', 'maszas', changed=True), 12)
+
+    def test_failed_refresh_does_not_back_off(self):
+        """Test that a refresh with failed pages keeps the interval, or resets it if something changed."""
+        self.schedule.record('slings', 'maszas', changed=False)
+        self.assertEqual(self.schedule.record('slings', 'maszas', changed=False, failed=True), 24)
+        self.assertEqual(self.schedule.record('slings', 'maszas', changed=True, failed=True), 12)
+        self.assertEqual(self.schedule.record('slings', 'maszas', changed=False, failed=True), 12)
+
+
+class TestSliceRefresh(unittest.TestCase):
+    """Test cases for refreshing a single (category, site) slice."""
+
+    def test_slices_cover_configured_sites(self):
+        """Test that every configured category and site pair gets a slice."""
+        slices = get_refresh_slices()
+        self.assertIn(('ropes', 'maszas'), slices)
+        self.assertIn(('carabiners-quickdraws', 'bergfreunde'), slices)
+        self.assertEqual(len(slices), len(set(slices)))
+
+    def test_refresh_slice_only_touches_its_slice(self):
+        """Test that a slice refresh publishes only that slice and reports no change on repeat."""
+        refresh_slice_job('ropes', 'maszas')
+        slices = discount_store.snapshot.slices
+        self.assertTrue(slices[('ropes', 'maszas')])
+        self.assertTrue(all(d['site'] == 'Maszas' for d in slices[('ropes', 'maszas')]))
+        self.assertEqual(refresh_slice_job('ropes', 'maszas'), ([], False))
+        self.assertEqual(discount_store.snapshot.slices.keys(), slices.keys())
+
+    def test_refresh_slice_reports_failed_pages(self):
+        """Test that a slice refresh served from its last good extraction is reported as failed."""
+        refresh_slice_job('ropes', 'maszas')
+        with patch.object(MockContentLoader, 'fetch', side_effect=OSError("mock page unreadable")):
+            self.assertEqual(refresh_slice_job('ropes', 'maszas'), ([], True))
+        self.assertEqual(refresh_slice_job('ropes', 'maszas'), ([], False))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Test suite for the resilient content loader.
+Tests timeouts, retries with backoff, the per-host circuit breaker and the last-good fallback.
+"""
+
+import sys
+import os
+import asyncio
+import time
+import unittest
+
+import httpx
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.content_loader import ContentLoader, EventLoopContentLoader
+from src.core.page_cache import PageNotModified
+from src.core.resilient_loader import CircuitOpenError, FetchTimeoutError, ResilientContentLoader
+from src.dto.discount import Discount
+from src.scrapers.discount_scraper import DiscountScraper
+
+PAGE = b"<ul><li class='item'>Rope</li><li class='item'>Cam</li></ul>"
+
+
+class FlakyLoader(ContentLoader):
+    """Raises the queued errors in turn, then serves PAGE."""
+
+    def __init__(self, *errors):
+        super().__init__()
+        self.errors = list(errors)
+        self.calls = 0
+
+    def fetch(self, url: str) -> bytes:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return PAGE
+
+
+class SlowLoader(ContentLoader):
+    def fetch(self, url: str) -> bytes:
+        time.sleep(1)
+        return PAGE
+
+
+class SlowAsyncLoader(EventLoopContentLoader):
+    async def _fetch(self, url: str) -> bytes:
+        await asyncio.sleep(1)
+        return PAGE
+
+
+class ItemScraper(DiscountScraper):
+    PRODUCT_SELECTOR = "li.item"
+
+    def extract_discounts_from_soup(self, soup, url):
+        return [
+            Discount(product=item.get_text(strip=True), url=url, image_url=None, old_price="2", new_price="1")
+            for item in soup.select("li.item")
+        ]
+
+
+def http_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://shop.example/")
+    return httpx.HTTPStatusError(f"{status}", request=request, response=httpx.Response(status, request=request))
+
+
+class TestResilientContentLoader(unittest.TestCase):
+    """Test cases for ResilientContentLoader."""
+
+    URL = "https://shop.example/ropes/"
+
+    def setUp(self):
+        self.sleeps = []
+        self.now = 0.0
+
+    def wrap(self, loader, **settings):
+        settings = {'retries': 2, 'backoff': 0.5, 'failure_threshold': 2, 'reset_timeout': 60, **settings}
+        return ResilientContentLoader(loader, sleep=self.sleeps.append, clock=lambda: self.now, **settings)
+
+    def test_retries_with_capped_jittered_backoff(self):
+        """Test that transient errors are retried after growing, jittered delays."""
+        loader = FlakyLoader(httpx.ConnectError("refused"), http_error(503))
+        self.assertEqual(self.wrap(loader).fetch(self.URL), PAGE)
+        self.assertEqual(loader.calls, 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertTrue(0 <= self.sleeps[0] <= 0.5 and 0 <= self.sleeps[1] <= 1.0)
+
+    def test_gives_up_after_retries(self):
+        """Test that the last error surfaces once the retries are used up."""
+        loader = FlakyLoader(*[http_error(502)] * 3)
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.wrap(loader).fetch(self.URL)
+        self.assertEqual(loader.calls, 3)
+
+    def test_client_errors_are_not_retried(self):
+        """Test that a 404 fails at once."""
+        loader = FlakyLoader(http_error(404))
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.wrap(loader).fetch(self.URL)
+        self.assertEqual(loader.calls, 1)
+
+    def test_client_errors_do_not_open_the_circuit(self):
+        """Test that 4xx answers count as the host working, for the blocking and async paths."""
+        loader = FlakyLoader(*[http_error(500), http_error(404)] * 2)
+        resilient = self.wrap(loader, retries=0)
+        for fetch in (resilient.fetch, lambda url: asyncio.run(resilient.fetch_async(url))):
+            for _ in range(2):
+                with self.assertRaises(httpx.HTTPStatusError):
+                    fetch(self.URL)
+            self.assertFalse(resilient.breaker('shop.example').is_open)
+        self.assertEqual(resilient.fetch(self.URL), PAGE)
+
+    def test_per_host_timeout(self):
+        """Test that a hung fetch is abandoned after its host's timeout, for blocking and async loaders."""
+        for loader in (SlowLoader(), SlowAsyncLoader()):
+            with self.subTest(loader=type(loader).__name__):
+                resilient = self.wrap(loader, retries=0, timeout=30, host_timeouts={'shop.example': 0.05})
+                start = time.perf_counter()
+                with self.assertRaises(FetchTimeoutError):
+                    resilient.fetch(self.URL)
+                self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_circuit_opens_and_recovers(self):
+        """Test that a failing host is skipped until a trial fetch after reset_timeout succeeds."""
+        loader = FlakyLoader(http_error(500), http_error(500))
+        resilient = self.wrap(loader, retries=0)
+        for _ in range(2):
+            with self.assertRaises(httpx.HTTPStatusError):
+                resilient.fetch(self.URL)
+        with self.assertRaises(CircuitOpenError):
+            resilient.fetch(self.URL)
+        self.assertEqual(loader.calls, 2)
+        # Other hosts are unaffected
+        self.assertEqual(resilient.fetch("https://other.example/"), PAGE)
+
+        self.now += 61
+        self.assertEqual(resilient.fetch(self.URL), PAGE)
+        self.assertFalse(resilient.breaker('shop.example').is_open)
+
+    def test_failed_trial_reopens_circuit(self):
+        """Test that a failing trial fetch opens the circuit again at once."""
+        loader = FlakyLoader(*[http_error(500)] * 3)
+        resilient = self.wrap(loader, retries=0)
+        for _ in range(2):
+            with self.assertRaises(httpx.HTTPStatusError):
+                resilient.fetch(self.URL)
+        self.now += 61
+        with self.assertRaises(httpx.HTTPStatusError):
+            resilient.fetch(self.URL)
+        with self.assertRaises(CircuitOpenError):
+            resilient.fetch(self.URL)
+
+    def test_not_modified_is_a_success(self):
+        """Test that PageNotModified passes through without retries or failures."""
+        loader = FlakyLoader(PageNotModified(self.URL))
+        resilient = self.wrap(loader)
+        with self.assertRaises(PageNotModified):
+            resilient.fetch(self.URL)
+        self.assertEqual(loader.calls, 1)
+        self.assertEqual(resilient.breaker('shop.example').failures, 0)
+
+    def test_fetch_async_retries(self):
+        """Test that the async path retries too."""
+        loader = FlakyLoader(httpx.ReadTimeout("slow"))
+        resilient = self.wrap(loader, backoff=0.01)
+        self.assertEqual(asyncio.run(resilient.fetch_async(self.URL)), PAGE)
+        self.assertEqual(loader.calls, 2)
+
+
+class TestLastGoodFallback(unittest.TestCase):
+    """Test cases for serving the last good extraction of a failing page."""
+
+    URL = "https://shop.example/ropes/"
+
+    def test_failed_page_serves_last_good_extraction(self):
+        """Test that a page that stops loading keeps its previous discounts."""
+        loader = FlakyLoader()
+        scraper = ItemScraper(loader)
+        first = scraper.extract_discounts_from_url(self.URL, "ropes")
+        self.assertEqual([d.product for d in first], ["Rope", "Cam"])
+        loader.errors.append(httpx.ConnectError("refused"))
+        second = scraper.extract_discounts_from_url(self.URL, "ropes")
+        self.assertEqual([d.model_dump() for d in second], [d.model_dump() for d in first])
+
+    def test_failed_page_without_history_is_empty(self):
+        """Test that a page that never loaded yields no discounts."""
+        scraper = ItemScraper(FlakyLoader(httpx.ConnectError("refused")))
+        self.assertEqual(scraper.extract_discounts_from_url(self.URL, "ropes"), [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
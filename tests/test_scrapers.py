@@ -12,10 +12,19 @@ from unittest.mock import patch
 # Add the project root to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from tests import use_temporary_storage
+
+# Keep the snapshot, its refresher lock and the caches out of the project's .cache (before importing src)
+use_temporary_storage()
+
 from src.services.discount_service import fetch_discounts_for_category, fetch_all_discounts
 from src.dto.discount_url import DiscountUrl
-from src.core.content_loader import HttpContentLoader, MockContentLoader, PlaywrightContentLoader
-from src.core.manager import ScraperManager
+from src.core.content_loader import ContentLoader, HttpContentLoader, MockContentLoader, PlaywrightContentLoader
+from src.core.manager import ScraperManager, get_scraper_manager
+from src.core.resilient_loader import ResilientContentLoader
+from src.dto.discount import Discount
+from src.scrapers.discount_scraper import DiscountScraper, with_query_param
+from src.scrapers.maszas import MaszasScraper
 
 
 class TestDiscountUrl(unittest.TestCase):
@@ -42,7 +51,9 @@ class TestScraperManager(unittest.TestCase):
         scrapers = scraper_manager.get_scrapers()
 
         for site_name, scraper in scrapers.items():
-            self.assertIsInstance(scraper.content_loader, (HttpContentLoader, PlaywrightContentLoader),
+            self.assertIsInstance(scraper.content_loader, ResilientContentLoader,
+                                  f"Scraper {site_name} has no resilience wrapper in production")
+            self.assertIsInstance(scraper.content_loader.loader, (HttpContentLoader, PlaywrightContentLoader),
                                   f"Scraper {site_name} has wrong content loader in production")
 
     @patch('src.core.config.config.is_production', return_value=False)
@@ -66,6 +77,155 @@ class TestScraperManager(unittest.TestCase):
         self.assertIn('ropes', categories)
         self.assertIn('carabiners-quickdraws', categories)
 
+    def test_shared_manager_is_reused(self):
+        """Test that the shared manager is built once and reused across calls."""
+        manager = get_scraper_manager()
+        with patch('src.core.manager.ScraperManager') as mock_manager_class:
+            fetch_discounts_for_category('ropes')
+            mock_manager_class.assert_not_called()
+        self.assertIs(get_scraper_manager(), manager)
+
+
+class TestParserBackends(unittest.TestCase):
+    """Test cases for the pluggable HTML parser backends."""
+
+    def _extract_ropes(self, parser, scoped=True):
+        loader = MockContentLoader(parser=parser)
+        return {
+            site: [d.model_dump() for d in scraper_class(loader).extract_discounts_from_soup(
+                loader.get_content(f"{site}://ropes", scraper_class.PRODUCT_SELECTOR if scoped else None),
+                f"{site}://ropes")]
+            for site, scraper_class in ScraperManager.SCRAPER_CLASSES.items()
+        }
+
+    def test_backends_extract_identical_discounts(self):
+        """Test that every backend, parsing only product containers, matches a full html.parser parse."""
+        expected = self._extract_ropes('html.parser', scoped=False)
+        self.assertTrue(any(expected.values()))
+        for parser in ('html.parser', 'lxml', 'selectolax'):
+            with self.subTest(parser=parser):
+                self.assertEqual(self._extract_ropes(parser), expected)
+
+    def test_unknown_backend_is_rejected(self):
+        """Test that a misspelled backend fails at construction time."""
+        with self.assertRaises(ValueError):
+            MockContentLoader(parser='html5')
+
+
+class PagedLoader(ContentLoader):
+    """Serves a listing of numbered pages (?p=N) from memory and records what was fetched."""
+
+    def __init__(self, pages, last_linked_page):
+        super().__init__()
+        self.pages = pages
+        self.last_linked_page = last_linked_page
+        self.fetched = []
+
+    def fetch(self, url: str) -> bytes:
+        self.fetched.append(url)
+        page = int(dict(p.split("=") for p in url.split("?")[1].split("&")).get("p", 1)) if "?" in url else 1
+        items = "".join(f'<li class="item"><a href="/{page}/{n}">Rope {page}.{n}</a></li>'
+                        for n in range(self.pages.get(page, 0)))
+        next_link = f'<link rel="next" href="?p={page + 1}">' if page < self.last_linked_page else ""
+        return f"<html><head>{next_link}</head><body><ul>{items}</ul></body></html>".encode()
+
+
+class PagedScraper(DiscountScraper):
+    PRODUCT_SELECTOR = "li.item"
+    PAGINATION_SELECTOR = "link"
+
+    def extract_discounts_from_soup(self, soup, url):
+        return [Discount(product=a.get_text(), url=a["href"], image_url=None, old_price="10 €", new_price="8 €",
+                         category=None)
+                for a in soup.select("li.item a")]
+
+    def next_page(self, soup, url):
+        link = soup.select_one('link[rel="next"]')
+        return with_query_param(url, "p", link["href"].split("=")[1]) if link else None
+
+    def page_url(self, url, page):
+        return with_query_param(url, "p", page)
+
+
+class TestPagination(unittest.TestCase):
+    """Test cases for following paginated listings."""
+
+    LISTING = "https://shop.example/ropes/"
+
+    def _crawl(self, pages, last_linked_page, max_pages=10):
+        loader = PagedLoader(pages, last_linked_page)
+        manager = ScraperManager()
+        manager.scraper_map = {'shop': PagedScraper(loader, [DiscountUrl(category="ropes", url=self.LISTING)])}
+        manager.max_pages = max_pages
+        discounts = manager.fetch_discounts(["ropes"])[("ropes", "shop")]
+        return [d.product for d in discounts], loader.fetched
+
+    def test_next_page_of_mock_listings(self):
+        """Test that every shop finds its next page in a scoped parse, with every backend."""
+        expected = {
+            '4camping': ("https://www.4camping.hu/c/maszokoetelek/", "https://www.4camping.hu/c/maszokoetelek/?p=2"),
+            'bergfreunde': ("https://www.bergfreunde.eu/climbing-ropes/", "https://www.bergfreunde.eu/climbing-ropes/2/"),
+            'maszas': ("https://www.maszas.hu/maszokotel", None),
+            'mountex': ("https://mountex.hu/sziklamaszas-hegymaszas?v=109",
+                        "https://mountex.hu/sziklamaszas-hegymaszas?v=109&page=2"),
+        }
+        for parser in ('html.parser', 'lxml', 'selectolax'):
+            loader = MockContentLoader(parser=parser)
+            for site, (url, next_url) in expected.items():
+                with self.subTest(parser=parser, site=site):
+                    scraper = ScraperManager.SCRAPER_CLASSES[site](loader)
+                    soup = loader.get_content(f"{site}://ropes", scraper._scope())
+                    self.assertEqual(scraper.next_page(soup, url), next_url)
+
+    def test_maszas_next_page_from_results_line(self):
+        """Test that Maszas pages on until the results line reaches the total."""
+        scraper = MaszasScraper(MockContentLoader())
+        page = '<div class="pagination"><div class="links"></div><div class="results"><span>{}</span></div></div>'
+        soup = scraper.content_loader.parse(page.format("26 - 50 / 73 termék"), scraper._scope())
+        self.assertEqual(scraper.next_page(soup, "https://www.maszas.hu/maszokotel?page=2"),
+                         "https://www.maszas.hu/maszokotel?page=3")
+        soup = scraper.content_loader.parse(page.format("51 - 73 / 73 termék"), scraper._scope())
+        self.assertIsNone(scraper.next_page(soup, "https://www.maszas.hu/maszokotel?page=3"))
+
+    def test_follows_pages_until_last_page(self):
+        """Test that a listing is read up to the page without a next link."""
+        products, fetched = self._crawl({1: 2, 2: 2, 3: 1}, last_linked_page=3)
+        self.assertEqual(products, ["Rope 1.0", "Rope 1.1", "Rope 2.0", "Rope 2.1", "Rope 3.0"])
+        self.assertEqual(fetched[0], self.LISTING)
+        self.assertEqual(len(fetched), len(set(fetched)))
+
+    def test_stops_at_page_without_discounts(self):
+        """Test that the first page without discounts ends the listing, dropping pages fetched ahead."""
+        products, fetched = self._crawl({1: 1, 2: 1, 4: 1, 5: 1}, last_linked_page=9)
+        self.assertEqual(products, ["Rope 1.0", "Rope 2.0"])
+        # Pages load max_per_host at a time, so at most one page past the empty one is fetched
+        self.assertLessEqual(len(fetched), 4)
+
+    def test_stops_when_pages_repeat(self):
+        """Test that a shop serving its last page again past the end stops the listing there."""
+        class RepeatingLoader(PagedLoader):
+            def fetch(self, url):
+                return PagedLoader.fetch(self, with_query_param(url, "p", 2) if "p=" in url else url)
+
+        loader = RepeatingLoader({1: 2, 2: 1}, last_linked_page=9)
+        manager = ScraperManager()
+        manager.scraper_map = {'shop': PagedScraper(loader, [DiscountUrl(category="ropes", url=self.LISTING)])}
+        products = [d.product for d in manager.fetch_discounts(["ropes"])[("ropes", "shop")]]
+        self.assertEqual(products, ["Rope 1.0", "Rope 1.1", "Rope 2.0"])
+        self.assertLessEqual(len(loader.fetched), 4)
+
+    def test_stops_at_max_pages(self):
+        """Test that no listing is read past max_pages pages."""
+        products, fetched = self._crawl({n: 1 for n in range(1, 10)}, last_linked_page=9, max_pages=3)
+        self.assertEqual(products, ["Rope 1.0", "Rope 2.0", "Rope 3.0"])
+        self.assertEqual(len(fetched), 3)
+
+    def test_mock_listings_are_not_paginated(self):
+        """Test that mock files are read as single pages even when they link a next page."""
+        manager = ScraperManager()
+        self.assertEqual(len(manager.fetch_discounts(["ropes"], ["4camping"])[("ropes", "4camping")]),
+                         len(manager.scraper_map['4camping'].extract_discounts_from_url("4camping://ropes", "ropes")))
+
 
 class TestServiceLayer(unittest.TestCase):
     """Test cases for the service layer functionality."""
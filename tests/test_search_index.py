@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test suite for the full-text search index.
+Tests diacritic folding, prefix matching, BM25 ranking and category filtering.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.search_index import SearchIndex
+
+
+def make_record(product, site, category):
+    return {'product': product, 'url': f"{site}/{product}", 'site': site, 'category': category}
+
+
+RECORDS = [
+    make_record("DMM Dragon 2 Cam", "Bergfreunde", "friends-nuts"),
+    make_record("DMM Dragonfly Micro Cams Cam", "Bergfreunde", "friends-nuts"),
+    make_record("DMM A7353A Dragon 2 size 3 Friend", "4camping", "friends-nuts"),
+    make_record("Black Diamond Camalot C4 Cam", "Bergfreunde", "friends-nuts"),
+    make_record("Beal Zenith 9,5 mm (60 m) Hegymászó kötél", "4camping", "ropes"),
+    make_record("Mammut 9.5 Crag Dry Rope Single rope", "Bergfreunde", "ropes"),
+    make_record("Edelrid Boa 9,8 mm-es falmászókötél", "Maszas", "ropes"),
+    make_record("DMM Shadow Quickdraw", "Maszas", "carabiners-quickdraws"),
+]
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test cases for SearchIndex."""
+
+    def setUp(self):
+        self.index = SearchIndex(RECORDS)
+
+    def products(self, query, **kwargs):
+        return [record['product'] for _, record in self.index.search(query, **kwargs)]
+
+    def test_ranks_best_match_first(self):
+        """Test that the record matching every query term outranks partial matches."""
+        results = self.products("Dragon cam")
+        self.assertEqual(results[0], "DMM Dragon 2 Cam")
+        self.assertIn("DMM A7353A Dragon 2 size 3 Friend", results)
+
+    def test_diacritics_and_decimal_commas_are_folded(self):
+        """Test that "kotel" finds "kötél" and "9.5" finds "9,5"."""
+        self.assertEqual(self.products("kotel"), ["Beal Zenith 9,5 mm (60 m) Hegymászó kötél"])
+        self.assertEqual(set(self.products("9.5")),
+                         {"Beal Zenith 9,5 mm (60 m) Hegymászó kötél", "Mammut 9.5 Crag Dry Rope Single rope"})
+
+    def test_last_token_matches_as_prefix(self):
+        """Test that a partly typed last word matches longer terms, below exact matches."""
+        self.assertEqual(self.products("dmm dragonf")[0], "DMM Dragonfly Micro Cams Cam")
+        self.assertEqual(self.products("camal"), ["Black Diamond Camalot C4 Cam"])
+        results = self.products("dragon")
+        self.assertEqual(results[-1], "DMM Dragonfly Micro Cams Cam")
+        # Single characters only match whole terms
+        self.assertEqual(self.products("d"), [])
+
+    def test_site_and_category_filter(self):
+        """Test that the shop name is searchable and results can be limited to a category."""
+        self.assertEqual(self.products("maszas shadow")[0], "DMM Shadow Quickdraw")
+        self.assertEqual(self.products("dmm", category="carabiners-quickdraws"), ["DMM Shadow Quickdraw"])
+
+    def test_no_match(self):
+        self.assertEqual(self.products("petzl"), [])
+        self.assertEqual(self.products(""), [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
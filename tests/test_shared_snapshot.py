@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test suite for the shared snapshot storage.
+Tests that stores in different processes see each other's publishes and refresher election.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dto.discount import Discount
+from src.services.discount_store import DiscountStore
+from src.services.shared_snapshot import RefresherLock, SnapshotStorage
+
+
+def make_discount(url, new_price="10"):
+    return Discount(product=url, url=url, image_url=None, old_price="20", new_price=new_price,
+                    category="ropes", site="Maszas", discount_percent="-20")
+
+
+class TestSharedSnapshot(unittest.TestCase):
+    """Test cases for SnapshotStorage and RefresherLock."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "discounts.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_store(self, sync_interval=60):
+        # Separate storages stand in for separate worker processes; tests sync them explicitly
+        store = DiscountStore(["ropes", "slings"], storage=SnapshotStorage(self.path), sync_interval=sync_interval)
+        self.addCleanup(store.close)
+        return store
+
+    def test_reader_sees_writer_publish(self):
+        writer, reader = self.make_store(), self.make_store()
+        writer.publish({("ropes", "maszas"): [make_discount("a"), make_discount("b")]})
+        self.assertEqual(reader.snapshot.version, 1)
+        self.assertEqual([d['url'] for d in reader.snapshot.get("ropes")], ["a", "b"])
+        self.assertEqual(reader.snapshot.payload("ropes").body, writer.snapshot.payload("ropes").body)
+
+    def test_reads_do_not_touch_the_storage(self):
+        writer, reader = self.make_store(), self.make_store(sync_interval=0.01)
+        self.assertEqual(reader.snapshot.version, 0)
+        writer.publish({("ropes", "maszas"): [make_discount("a")]})
+        with patch.object(SnapshotStorage, 'load', wraps=reader._storage.load) as load:
+            deadline = time.monotonic() + 5
+            while reader.snapshot.version != 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(reader.snapshot.version, 1)
+        # Adopted by the background sync, not by the reads
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual([d['url'] for d in reader.snapshot.get("ropes")], ["a"])
+
+    def test_changes_are_shared(self):
+        writer, reader = self.make_store(), self.make_store()
+        writer.publish({("ropes", "maszas"): [make_discount("a")]})
+        writer.publish({("ropes", "maszas"): [make_discount("a", new_price="9"), make_discount("b")]})
+        changes = reader.changes_since(1)
+        self.assertEqual(len(changes), 1)
+        self.assertEqual((changes[0].added, changes[0].changed), (("b",), ("a",)))
+
+    def test_new_refresher_continues_from_stored_snapshot(self):
+        self.make_store().publish({("ropes", "maszas"): [make_discount("a")]})
+        successor = self.make_store()
+        changes = successor.publish({("ropes", "maszas"): [make_discount("a")], ("slings", "maszas"): []})
+        self.assertEqual(successor.snapshot.version, 2)
+        self.assertEqual(changes, [])
+        self.assertEqual(len(successor.snapshot.get("ropes")), 1)
+
+    def test_failed_write_is_kept_and_retried(self):
+        writer, reader = self.make_store(), self.make_store()
+        writer.publish({("ropes", "maszas"): [make_discount("a")]})
+        with patch.object(SnapshotStorage, 'save', side_effect=sqlite3.OperationalError("database is locked")):
+            changes = writer.publish({("ropes", "maszas"): [make_discount("a"), make_discount("b")]})
+            # The stored version 1 must not replace the unwritten version 2
+            writer.sync()
+            reader.sync()
+            self.assertEqual(writer.snapshot.version, 2)
+            self.assertEqual(reader.snapshot.version, 1)
+        self.assertEqual(changes[0].added, ("b",))
+        writer.sync()
+        reader.sync()
+        self.assertEqual(writer.snapshot.version, 2)
+        self.assertEqual(reader.snapshot.version, 2)
+        self.assertEqual([d['url'] for d in reader.snapshot.get("ropes")], ["a", "b"])
+        self.assertEqual(reader.changes_since(1), changes)
+
+    def test_only_one_refresher(self):
+        first, second = RefresherLock(self.path + ".lock"), RefresherLock(self.path + ".lock")
+        self.assertTrue(first.try_acquire())
+        self.assertTrue(first.try_acquire())
+        self.assertFalse(second.try_acquire())
+        first._file.close()  # Process exit releases the lock
+        self.assertTrue(second.try_acquire())
+
+
+if __name__ == '__main__':
+    unittest.main()